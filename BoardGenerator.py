@@ -11,28 +11,40 @@ Creation Date: 9/6/2025
 
 import random
 
+from neighbors import cell_neighbors, neighbor_table
+
 # Print grid for debugging purposes
 def print_grid(grid):
     for i in grid:
         print(i)
 
 # Generate Bombs
-def generate_bombs(bombCount, safe_row=None, safe_col=None):
+# rng is anything with randint(), e.g. random.Random(seed) for a board that can be played again
+def generate_bombs(bombCount, safe_row=None, safe_col=None, width=10, height=10, topology="square", rng=random):
     
-    # Create 10 by 10 grid
-    grid = [[0 for _ in range(10)] for _ in range(10)]
+    # Create width by height grid (10 by 10 by default)
+    grid = [[0 for _ in range(width)] for _ in range(height)]
+
+    # Never ask for more bombs than there are cells outside of the safe area
+    bombCount = min(bombCount, width * height - 9)
+
+    # The safe cell and its neighbours
+    safe = set()
+    if safe_row is not None and safe_col is not None:
+        safe_index = safe_row * width + safe_col
+        safe.add(safe_index)
+        safe.update(cell_neighbors(width, height, safe_index, topology))
     
     # Place bombs at random location on grid
     i = 0
     while i < bombCount:
-        placement = random.randint(0,99)
-        row = placement//10
-        column = placement%10
+        placement = rng.randint(0, width * height - 1)
+        row = placement//width
+        column = placement%width
 
         # If a safe row and col are specified, all blocks within a one block radius should be safe from bombs
-        if safe_row and safe_col:
-            if abs(row - safe_row) <= 1 and abs(column - safe_col) <= 1:
-                continue
+        if placement in safe:
+            continue
 
         # Ensure current placement is not a bomb before placing one
         if grid[row][column] != 'b':
@@ -42,23 +54,26 @@ def generate_bombs(bombCount, safe_row=None, safe_col=None):
     return grid
 
 # Generate the numbers that appear on cells adjacent to bombs
-def generate_numbering(grid):
-    for i in range(len(grid)):
-        for j in range(len(grid[i])):
-            if grid[i][j] == 'b':
-                # Check all 8 surrounding cells
-                for di in [-1, 0, 1]:
-                    for dj in [-1, 0, 1]:
-                        # Skip the bomb cell itself
-                        if di == 0 and dj == 0:
-                            continue
-                        
-                        # Calculate adjacent cell coordinates
-                        ni, nj = i + di, j + dj
-                        
-                        # Check if coordinates are within grid bounds
-                        if 0 <= ni < len(grid) and 0 <= nj < len(grid[0]):
-                            # Only increment if the adjacent cell is not a bomb
-                            if grid[ni][nj] != 'b':
-                                grid[ni][nj] += 1
+def generate_numbering(grid, topology="square"):
+    width = len(grid[0]) if grid else 0
+    table = neighbor_table(width, len(grid), topology)
+    offsets, indexes = table.offsets, table.indexes
+
+    # Count the bombs around every cell using the precomputed neighbours (already within grid bounds)
+    counts = [0] * (width * len(grid))
+    cell = 0
+    for row in grid:
+        for val in row:
+            if val == 'b':
+                for neighbor in indexes[offsets[cell]:offsets[cell + 1]]:
+                    counts[neighbor] += 1
+            cell += 1
+
+    # Only number the cells that are not bombs
+    cell = 0
+    for row in grid:
+        for j in range(width):
+            if row[j] != 'b':
+                row[j] += counts[cell]
+            cell += 1
     return grid
@@ -12,11 +12,27 @@ Creation Date: 9/4/2025
 '''
 
 # Imports
+import functools
 import pygame
+import random
 import sys
+import time
+from collections import deque
 import BoardGenerator
-from grid import Grid
-import random
+from assets import assets
+from audio import audio
+from profiler import profiler
+from latency import latency
+from grid import Grid, SPRITES
+import ai_player
+from ai_player import BoardSnapshot
+from ai_worker import ai_worker, DEFAULT_AI_BUDGET
+from viewport import Camera
+from minimap import Minimap
+from spectate import spectators
+from snapshots import CowCells, UndoHistory
+from neighbors import neighbor_table
+from stats import stats
 
 # RGB variables
 black = (0, 0, 0)
@@ -34,10 +50,33 @@ grid_offset_y = 10
 app_width = grid_size * grid_width + border * 2
 app_height = grid_size * grid_height + border + top_border
 
+# Largest board area (in pixels) shown at once. Bigger boards are panned and zoomed with the camera
+max_view_width = 960
+max_view_height = 640
+
+# HUD icon files and size (in pixels)
+HUD_ICONS = ["Sprites/flag.png", "Sprites/retry.png", "Sprites/quit.png"]
+icon_size = 48
+
+# Game id spectators use to watch this game (python spectate.py 1)
+SPECTATE_GAME_ID = 1
+
 # Coloring for the grid and background
 bg_color = (192, 192, 192)
 grid_color = (128, 128, 128)
 
+def column_label(col):
+    '''
+    Spreadsheet style column label: 0 -> A, 25 -> Z, 26 -> AA, ...
+    '''
+
+    label = ""
+    col += 1
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        label = chr(ord('A') + rem) + label
+    return label
+
 class MineSweeper:
     def __init__(self, gameStateManager):
         '''
@@ -46,9 +85,50 @@ class MineSweeper:
         '''
         
         pygame.init()
+
+        # Board dimensions (in cells), 10x10 unless the state manager asks for another size
+        params = gameStateManager.getParams()
+        self.cols = params.get("width", grid_width)
+        self.rows = params.get("height", grid_height)
+
+        # Window only grows up to the max view size, the camera shows the rest of the board
+        view_width = min(self.cols * grid_size, max_view_width)
+        view_height = min(self.rows * grid_size, max_view_height)
+        view_width = max(view_width, grid_width * grid_size)  # Leave room for the HUD
+        self.app_width = view_width + border * 2
+        self.app_height = view_height + border + top_border
         
         # Creates main pygame window
-        self.gameDisplay = pygame.display.set_mode((app_width, app_height))
+        self.gameDisplay = pygame.display.set_mode((self.app_width, self.app_height))
+
+        # Camera over the board area, only visible cells get drawn
+        self.camera = Camera(self.cols, self.rows,
+                             (border + grid_offset_x, top_border + grid_offset_y, view_width, view_height),
+                             grid_size)
+
+        # Cells whose state changed since the last frame, filled in by the Grid objects
+        self.changes = []
+
+        # Copy-on-write record of every cell's state code for undo/redo (Ctrl+Z / Ctrl+Y).
+        # state_synced is how much of self.changes has been written into it
+        self.state = None
+        self.state_synced = 0
+        self.history = UndoHistory()
+
+        # Overview of the whole board, shown when the board doesn't fit in the window ('M' toggles it)
+        self.minimap = None
+        if Minimap.available():
+            self.minimap = Minimap(self.cols, self.rows)
+            self.minimap.place(self.camera.view)
+        self.show_minimap = self.cols * grid_size > view_width or self.rows * grid_size > view_height
+
+        # Off-screen frame buffer, reused every frame
+        self.frame_surface = pygame.Surface((self.app_width, self.app_height))
+
+        # Fonts are created once instead of every frame
+        self.hud_font = pygame.font.SysFont("Calibri", 24, True)
+        self.label_font = pygame.font.SysFont("Calibri", 20, True)
+        self.label_cache = {}  # Rendered label text by label string
         
         # Control FPS
         self.clock = pygame.time.Clock()  
@@ -68,16 +148,14 @@ class MineSweeper:
         # Track the difficulty
         self.difficulty = None
 
-        # HUD Assets
-        self.flag_icon = pygame.image.load("sprites/flag.png")
-        self.retry_icon = pygame.image.load("sprites/retry.png")
-        self.quit_icon = pygame.image.load("sprites/quit.png")
+        # Time budget (seconds) for one AI turn on the worker thread
+        self.ai_budget = params.get("aiBudget", DEFAULT_AI_BUDGET)
+        self.ai_latency = None  # Latency sample of the click waiting for the AI's moves
 
-        # Icons on HUD
-        icon_size = 48
-        self.flag_icon = pygame.transform.scale(self.flag_icon, (icon_size, icon_size))
-        self.retry_icon = pygame.transform.scale(self.retry_icon, (icon_size, icon_size))
-        self.quit_icon = pygame.transform.scale(self.quit_icon, (icon_size, icon_size))
+        # Icons on HUD (loaded and scaled once per process by the asset cache)
+        self.flag_icon = assets.scaled_image("Sprites/flag.png", (icon_size, icon_size))
+        self.retry_icon = assets.scaled_image("Sprites/retry.png", (icon_size, icon_size))
+        self.quit_icon = assets.scaled_image("Sprites/quit.png", (icon_size, icon_size))
 
         # Rects for interaction
         self.flag_rect = self.flag_icon.get_rect(topleft=(border, border-20))
@@ -87,27 +165,10 @@ class MineSweeper:
         # Track game state text
         self.game_status = "Playing"
 
-        # SFX: load 
-        self._s_click = self._try_load_sfx("audio/click.wav", 0.7)
-        self._s_flag  = self._try_load_sfx("audio/flag.wav",  0.7)
-        self._s_unflg = self._try_load_sfx("audio/unflag.wav", 0.7)  
-        self._s_win   = self._try_load_sfx("audio/win.wav",   0.8)
-        self._s_lose  = self._try_load_sfx("audio/lose.wav",  0.8)
-        
-
     # SFX helpers
-    def _try_load_sfx(self, path, vol=0.7):
-        try:
-            s = pygame.mixer.Sound(path)
-            s.set_volume(vol)
-            return s
-        except Exception:
-            return None
-
-    def _play(self, sfx):
-        if sfx:
-            try: sfx.play()
-            except Exception: pass
+    def _play(self, name):
+        # Queued, the audio manager plays it (once per frame) at the next flush
+        audio.queue(name)
     
 
     def draw_hud(self, surface):
@@ -119,14 +180,11 @@ class MineSweeper:
         # Draw flag icon + remaining flag count
         surface.blit(self.flag_icon, self.flag_rect.topleft)
 
-        # Count how many flags are currently placed on the board
-        flags_placed = sum(cell.flag for row in self.grid for cell in row)
-
-        # Calculate remaining flags available to place
-        remaining_flags = len(self.mines) - flags_placed
+        # Calculate remaining flags available to place (flags are counted after each click, not every frame)
+        remaining_flags = len(self.mines) - self.flags_placed
 
         # Draw remaining flag count
-        font = pygame.font.SysFont("Calibri", 24, True)
+        font = self.hud_font
         text = font.render(str(remaining_flags), True, black)
         surface.blit(text, (self.flag_rect.right + 15, self.flag_rect.y + 15))
 
@@ -147,7 +205,13 @@ class MineSweeper:
 
         # Draw game state (Playing, Win, Loss)
         status_text = font.render(self.game_status, True, status_color)
-        surface.blit(status_text, (app_width - status_text.get_width() - border, border - 10))
+        surface.blit(status_text, (self.app_width - status_text.get_width() - border, border - 10))
+
+        # Thinking indicator while the AI worker has a turn running
+        if ai_worker.busy:
+            dots = "." * (pygame.time.get_ticks() // 300 % 4)
+            width = self.render_label("AI thinking...").get_width()
+            surface.blit(self.render_label("AI thinking" + dots), (self.app_width - width - border, border + 15))
 
     # Utility function
     def drawText(self, txt, s, yOff=0):
@@ -162,38 +226,54 @@ class MineSweeper:
         screen_text = pygame.font.SysFont("Calibri", s, True).render(txt, True, blue)  
         # Get rectangle boundary of text
         rect = screen_text.get_rect()  
-        # Center text in the grid area with vertical offset
-        rect.center = (grid_width * grid_size / 2 + border, 
-                    grid_height * grid_size / 2 + top_border + yOff)
+        # Center text in the board view with vertical offset
+        rect.center = (self.camera.view.centerx, self.camera.view.centery + yOff)
         self.gameDisplay.blit(screen_text, rect)  # Draws text to screen
 
     def draw_labels(self, surface):
         '''
-        Draws column letters (A-J) and row numbers (1-10) around the grid
+        Draws column letters (A, B, ... Z, AA, ...) and row numbers (1, 2, ...)
+        around the visible part of the grid
         '''
         
-        font = pygame.font.SysFont("Calibri", 20, True)
         padding = 25
+        size = self.camera.tile_size
+
+        # Labels would overlap each other when zoomed far out
+        if size < 16:
+            return
+
+        x0, y0, x1, y1 = self.camera.visible_cells()
+
         # Create text for column labels
-        for col in range(grid_width):
-            # Increment the column letter decimal value by 1 
-            label = chr(ord('A') + col) 
-            text = font.render(label, True, black)
+        for col in range(x0, x1):
+            label = column_label(col)
+            text = self.render_label(label)
 
-            x = border + grid_offset_x + col * grid_size + grid_size // 2 - text.get_width() // 2
+            x = self.camera.cell_to_screen(col, 0)[0] + size // 2 - text.get_width() // 2
             # Position on top of the grid
             y = top_border + grid_offset_y - 30
             surface.blit(text, (x, y)) # Draw to screen
 
         # Create the text for row labels
-        for row in range(grid_height):
+        for row in range(y0, y1):
             label = str(row + 1)
-            text = font.render(label, True, black)
+            text = self.render_label(label)
             # Position to the left
             x = border + grid_offset_x - padding
-            y = top_border + grid_offset_y + row * grid_size + grid_size // 2 - text.get_height() // 2
+            y = self.camera.cell_to_screen(0, row)[1] + size // 2 - text.get_height() // 2
             surface.blit(text, (x, y))# Draw to screen
     
+    def render_label(self, label):
+        '''
+        Renders a grid label once and reuses it on later frames
+        '''
+
+        text = self.label_cache.get(label)
+        if text is None:
+            text = self.label_cache[label] = self.label_font.render(label, True, black)
+        return text
+
     def initialize_minesweeper(self, safe_row=None, safe_col=None):
         '''
         Takes in safe_row and safe_col (both optional) that should be garanted to be empty
@@ -207,11 +287,16 @@ class MineSweeper:
         numMine = params.get("numMine", 10)
         self.difficulty = params.get("difficulty")
 
+        # Seed of this board (the same seed and first click give the same board)
+        self.seed = params.get("seed")
+        if self.seed is None:
+            self.seed = random.getrandbits(32)
+
         # Program entry point
         #print(f"gameloop start... \nNumber of Mines = {numMine}")  # Debug print to console
 
-        # 1. Create bomb grid (10x10 with bombs randomly placed)
-        raw_grid = BoardGenerator.generate_bombs(numMine, safe_row, safe_col)
+        # 1. Create bomb grid (10x10 unless another size was requested, with bombs randomly placed)
+        raw_grid = BoardGenerator.generate_bombs(numMine, safe_row, safe_col, self.cols, self.rows, rng=random.Random(self.seed))
         # 2. Create numbering for adjacent mines
         raw_grid = BoardGenerator.generate_numbering(raw_grid)
 
@@ -220,12 +305,33 @@ class MineSweeper:
         # BoardGenerator.print_grid(raw_grid)
     
         # 3. Convert raw grid into Grid objects
-        self.grid = [[Grid(x, y, "b" if raw_grid[y][x] == 'b' else int(raw_grid[y][x]), self.gameDisplay, border+grid_offset_x, top_border+grid_offset_y, grid_size) for x in range(grid_width)] for y in range(grid_height)]
-        self.mines = [(x, y) for y in range(grid_height) for x in range(grid_width) if raw_grid[y][x] == 'b']
+        self.grid = [[Grid(x, y, "b" if raw_grid[y][x] == 'b' else int(raw_grid[y][x]), self.gameDisplay, border+grid_offset_x, top_border+grid_offset_y, grid_size, self.changes) for x in range(self.cols)] for y in range(self.rows)]
+        self.mines = [(x, y) for y in range(self.rows) for x in range(self.cols) if raw_grid[y][x] == 'b']
+        self.vals = [[cell.val for cell in row] for row in self.grid]  # Never change, shared with the AI
+        self.flags_placed = 0
+
+        # New board, redraw the whole minimap
+        self.changes.clear()
+        if self.minimap:
+            self.minimap.reset(self.grid)
 
         # Game state tracking
         self.game_win = False
         self.game_over = False
+
+        # For the statistics, the clock starts with the first click
+        self.clicks = 0
+        self.start_time = None
+        self.start_cell = (safe_col, safe_row)
+        self.recorded = False
+
+        # Undo starts over, spectators start over from the new board
+        codes = bytes(cell.stateCode() for row in self.grid for cell in row)
+        self.state = CowCells(codes)
+        self.state_synced = 0
+        self.history.clear()
+        if spectators.running:
+            spectators.share(SPECTATE_GAME_ID, self.cols, self.rows, codes)
         
         self.initialized = True
     
@@ -236,21 +342,23 @@ class MineSweeper:
             self.game_over = True
             self.game_win = False
             self.game_status = "Loss"
-            self._play(self._s_lose)  # SFX (added)
+            self._play("lose")  # SFX (added)
             # Reveal all mines
             for mx, my in self.mines:
                 self.grid[my][mx].clicked = True
+                self.grid[my][mx].logChange()
                     
         # If the cell is empty, recursively reveal neighbors
         if result == "empty":
-            self.reveal_neighbors(cell.xGrid, cell.yGrid)
+            with profiler.scope("flood fill"):
+                self.reveal_neighbors(cell.xGrid, cell.yGrid)
 
         # Check for win
         if self.check_win():
             self.game_over = True
             self.game_win = True
             self.game_status = "Win"
-            self._play(self._s_win)  # SFX (added)
+            self._play("win")  # SFX (added)
 
     # Main game loop
     def run(self):
@@ -264,151 +372,325 @@ class MineSweeper:
 
             while not self.game_over:
                 # Handle events
-                for event in pygame.event.get():
-
-                    # For debug purposes
-                    if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_w:  # Press 'W' to trigger a win
-                            self.game_over = True
-                            self.game_win = True
-                            self.game_status = "Win"
-                            # Optionally reveal all cells
-                            for row in self.grid:
-                                for cell in row:
-                                    cell.clicked = True
-
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
-
-                    elif event.type == pygame.MOUSEBUTTONDOWN:
-                        mouse_pos = pygame.mouse.get_pos()
-
-                        # HUD interactions first
-                        if self.retry_rect.collidepoint(mouse_pos):
-                            self.initialized = False  # Reset
-                            self.first_click = True
-                            self.run()  # Restart game
-                            return
-                        elif self.quit_rect.collidepoint(mouse_pos):
-                            self.gameStateManager.setState("main_menu")
-                            return
+                with profiler.scope("events"):
+                    for event in pygame.event.get():
+
+                        # For debug purposes
+                        if event.type == pygame.KEYDOWN:
+                            if event.key == pygame.K_w:  # Press 'W' to trigger a win
+                                self.recorded = True  # Not a real win, keep it out of the statistics
+                                self.game_over = True
+                                self.game_win = True
+                                self.game_status = "Win"
+                                # Optionally reveal all cells
+                                for row in self.grid:
+                                    for cell in row:
+                                        cell.clicked = True
+                                        cell.logChange()
+
+                        if event.type == pygame.QUIT:
+                            pygame.quit()
+                            sys.exit()
+
+                        elif (self.handle_camera_event(event) or self.toggle_debug_overlay(event)
+                              or self.handle_history_event(event)):
+                            continue
+
+                        elif event.type == pygame.MOUSEBUTTONDOWN:
+                            mouse_pos = pygame.mouse.get_pos()
+
+                            # HUD interactions first
+                            if self.retry_rect.collidepoint(mouse_pos):
+                                latency.begin(event, "retry")
+                                ai_worker.cancel()
+                                self.initialized = False  # Reset
+                                self.first_click = True
+                                self.run()  # Restart game
+                                return
+                            elif self.quit_rect.collidepoint(mouse_pos):
+                                latency.begin(event, "quit")
+                                ai_worker.cancel()
+                                self.gameStateManager.setState("main_menu")
+                                return
                             
-                        for row in self.grid:
-                            for cell in row:
-                                if cell.rect.collidepoint(mouse_pos): # If mouse click is within cell
-                                    if event.button == 1:  # Left click
-                                        if self.first_click:
-                                            self.first_click = False
-                                            # Regenerate board guaranteeing this cell is safe
-                                            self.initialize_minesweeper(cell.yGrid, cell.xGrid)
-
-                                            # Now reveal the chosen cell safely
-                                            result = self.grid[cell.yGrid][cell.xGrid].reveal()
-                                            self._play(self._s_click)
-
-                                            if result == "empty":
+                            # Map the click straight to a cell instead of testing every cell's rect.
+                            # The board is locked while the AI is taking its turn
+                            cell_pos = self.camera.screen_to_cell(mouse_pos)
+                            if cell_pos is not None and not ai_worker.busy and event.button in (1, 3):
+                                # Start timing the click, closed by the next display flip
+                                latency.begin(event)
+                                cell = self.grid[cell_pos[1]][cell_pos[0]]
+                                if event.button == 1:  # Left click
+                                    if self.first_click:
+                                        self.first_click = False
+                                        # Regenerate board guaranteeing this cell is safe
+                                        self.initialize_minesweeper(cell.yGrid, cell.xGrid)
+                                        self.start_time = time.perf_counter()
+                                        self.clicks = 1
+
+                                        # Now reveal the chosen cell safely
+                                        result = self.grid[cell.yGrid][cell.xGrid].reveal()
+                                        self._play("click")
+                                        latency.tag("first reveal")
+
+                                        if result == "empty":
+                                            with profiler.scope("flood fill"):
                                                 self.reveal_neighbors(cell.xGrid, cell.yGrid)
 
-                                            self.check_state(result, self.grid[cell.yGrid][cell.xGrid])
-
-                                        else:
-                                            result = cell.reveal()
-                                            self._play(self._s_click)  # SFX (added)
-
-                                            self.check_state(result,cell)
-                                            
-                                            if self.difficulty == "easy" or self.difficulty == "medium" or self.difficulty == "hard":
-                                                if result == "number":       
-                                                    result, cell = self.ai_uncover() # AI takes a turn and uncovers a cell
-
-                                            self.check_state(result,cell)
-                                            
-                                    # Right click to toggle flag
-                                    elif event.button == 3:  
-                                        prev = cell.flag                     # (added) capture prior state
-                                        cell.toggleFlag()
-                                        if cell.flag and not prev:
-                                            self._play(self._s_flag)         # SFX (added)
-                                        elif (not cell.flag) and prev:
-                                            self._play(self._s_unflg or self._s_flag)  # SFX (added, fallback)
-
-                # Draw grid and create off-screen frame buffer
-                frame_surface = pygame.Surface((app_width, app_height))
-                frame_surface.fill((192, 192, 192))  # Background
-                for row in self.grid:
-                    for cell in row:
-                        cell.drawGrid(frame_surface)
-
-                # Draw labels and HUD
-                self.draw_labels(frame_surface)                
-                self.draw_hud(frame_surface)
-                
-                # Blit buffer to main display
-                self.gameDisplay.blit(frame_surface, (0,0))
-                pygame.display.flip()  # Flip once per frame
-                self.clock.tick(30)
+                                        self.check_state(result, self.grid[cell.yGrid][cell.xGrid])
+
+                                    else:
+                                        if not cell.clicked and not cell.flag:
+                                            self.save_undo()
+                                        self.clicks += 1
+                                        result = cell.reveal()
+                                        self._play("click")  # SFX (added)
+                                        latency.tag("flood reveal" if result == "empty" else "reveal")
+
+                                        self.check_state(result,cell)
+                                    
+                                        if self.difficulty == "easy" or self.difficulty == "medium" or self.difficulty == "hard":
+                                            if result == "number" and not self.game_over:
+                                                # AI takes a turn on the worker thread, its moves are applied once ready
+                                                self.start_ai_turn()
+                                    
+                                # Right click to toggle flag
+                                elif event.button == 3:  
+                                    latency.tag("flag")
+                                    prev = cell.flag                     # (added) capture prior state
+                                    if not cell.clicked:
+                                        self.save_undo()
+                                    self.clicks += 1
+                                    cell.toggleFlag()
+                                    self.flags_placed += cell.flag - prev
+                                    if cell.flag and not prev:
+                                        self._play("flag")         # SFX (added)
+                                    elif (not cell.flag) and prev:
+                                        self._play("unflag")  # SFX (added, falls back to flag sound)
+
+                # Apply the AI's moves if it finished thinking
+                self.poll_ai_turn()
+
+                # Start this frame's sounds before drawing
+                with profiler.scope("audio"):
+                    audio.flush()
+
+                self.draw_frame()
+                with profiler.scope("idle"):
+                    self.clock.tick(30)
+
+            # Game over, drop any AI turn still running
+            ai_worker.cancel()
+            self.record_game()
 
             # Wait for user input to restart or quit to menu
             waiting = True
             while waiting:
+                audio.flush()  # Win/lose sound from the last move
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
                         pygame.quit()
                         sys.exit()
+                    elif self.handle_camera_event(event) or self.toggle_debug_overlay(event):
+                        continue
+                    elif self.handle_history_event(event):
+                        # Undoing the last move takes the game out of game over
+                        if not self.game_over:
+                            self.run()
+                            waiting = False
                     elif event.type == pygame.MOUSEBUTTONDOWN:
                         mouse_pos = pygame.mouse.get_pos()
                         if self.retry_rect.collidepoint(mouse_pos):
+                            latency.begin(event, "retry")
                             self.initialized = False  # Reset
                             self.first_click = True
                             self.game_status = "Playing"
                             self.run()  # Restart game
                             waiting = False
                         elif self.quit_rect.collidepoint(mouse_pos):
+                            latency.begin(event, "quit")
                             self.gameStateManager.setState("main_menu")
                             waiting = False
-    
+
+                # Keep drawing so the finished board can still be panned and zoomed
+                if waiting:
+                    self.draw_frame()
+                with profiler.scope("idle"):
+                    self.clock.tick(30)
+
+    def record_game(self):
+        '''
+        Logs the finished game to the statistics (only buffered here, written
+        by the stats thread). A game that is undone and finished again counts once.
+        '''
+
+        if self.recorded or self.start_time is None or not stats.enabled:
+            return
+        self.recorded = True
+        stats.record(self.cols, self.rows, len(self.mines), self.seed, time.perf_counter() - self.start_time,
+                     self.clicks, "win" if self.game_win else "loss", self.difficulty, start=self.start_cell)
+
+    def draw_frame(self):
+        '''
+        Draws the visible part of the board, labels and HUD to the off-screen
+        frame buffer, then copies it to the display
+        '''
+
+        frame_surface = self.frame_surface
+        frame_surface.fill(bg_color)  # Background
+        with profiler.scope("cells"):
+            self.camera.draw(frame_surface, self.grid, SPRITES)
+
+        # Minimap over the board, only the changed cells get rewritten
+        with profiler.scope("minimap"):
+            self.flush_changes()
+            if self.minimap and self.show_minimap:
+                self.minimap.draw(frame_surface, self.camera)
+
+        # Draw labels and HUD
+        with profiler.scope("labels"):
+            self.draw_labels(frame_surface)
+        with profiler.scope("hud"):
+            self.draw_hud(frame_surface)
+        profiler.draw_overlay(frame_surface)
+        latency.draw_overlay(frame_surface)
+
+        # Blit buffer to main display
+        with profiler.scope("flip"):
+            self.gameDisplay.blit(frame_surface, (0,0))
+            pygame.display.flip()  # Flip once per frame
+        latency.presented()
+        profiler.frame_end()
+
+    def flush_changes(self):
+        '''
+        Hands the cells that changed since the last frame to the minimap and spectators
+        '''
+
+        if not self.changes:
+            return
+        self.sync_state()
+        if self.minimap:
+            self.minimap.update(self.changes, self.grid)
+        if spectators.running:
+            status = "p" if not self.game_over else "w" if self.game_win else "l"
+            spectators.publish(SPECTATE_GAME_ID, [(x, y, self.grid[y][x].stateCode()) for x, y in self.changes], status)
+        self.changes.clear()
+        self.state_synced = 0
+
+    def sync_state(self):
+        '''
+        Writes the cells changed since the last sync into self.state
+        '''
+
+        state, cols = self.state, self.cols
+        for x, y in self.changes[self.state_synced:]:
+            state[y * cols + x] = self.grid[y][x].stateCode()
+        self.state_synced = len(self.changes)
+
+    def save_undo(self):
+        '''
+        Remembers the board before a player move, O(1) thanks to the copy-on-write state
+        '''
+
+        self.sync_state()
+        self.history.push((self.state.snapshot(), (self.game_over, self.game_win, self.game_status)))
+
+    def step_history(self, redo=False):
+        '''
+        Undoes (or redoes) one player move, only the cells that differ are touched.
+        Returns True if there was something to undo/redo.
+        '''
+
+        self.sync_state()
+        current = (self.state.snapshot(), (self.game_over, self.game_win, self.game_status))
+        entry = self.history.redo(current) if redo else self.history.undo(current)
+        if entry is None:
+            return False
+
+        ai_worker.cancel()
+        snap, (self.game_over, self.game_win, self.game_status) = entry
+        for index in self.state.changed_cells(snap):
+            cell = self.grid[index // self.cols][index % self.cols]
+            flagged = cell.flag
+            cell.setStateCode(snap[index])
+            self.flags_placed += cell.flag - flagged
+        self.state.restore(snap)
+        self.state_synced = len(self.changes)  # Already matches snap
+        return True
+
+    def handle_history_event(self, event):
+        '''
+        Ctrl+Z undoes, Ctrl+Y or Ctrl+Shift+Z redoes. Returns True if the event was used.
+        '''
+
+        if event.type != pygame.KEYDOWN or not event.mod & pygame.KMOD_CTRL:
+            return False
+        if event.key == pygame.K_z:
+            redo = bool(event.mod & pygame.KMOD_SHIFT)
+        elif event.key == pygame.K_y:
+            redo = True
+        else:
+            return False
+        latency.begin(event, "redo" if redo else "undo")
+        self.step_history(redo)
+        return True
+
+    def handle_camera_event(self, event):
+        '''
+        Pans (arrow keys, middle mouse drag, minimap click) and zooms (mouse wheel) the camera.
+        Returns True if the event was used by the camera.
+        '''
+
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_m and self.minimap:
+            self.show_minimap = not self.show_minimap
+            return True
+
+        # Clicking the minimap jumps the camera there
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.minimap and self.show_minimap:
+            target = self.minimap.cell_at(event.pos)
+            if target is not None:
+                latency.begin(event, "minimap")
+                self.camera.center_on(*target)
+                return True
+
+        return self.camera.handle_event(event)
+
+    def toggle_debug_overlay(self, event):
+        '''
+        F3 (profiler) and F4 (latency) overlays. Returns True if the event was used.
+        '''
+
+        return profiler.toggle_overlay(event) or latency.toggle_overlay(event)
+
     def reveal_neighbors(self, x, y):
         '''
         Goes through the board and reveals empty
         spaces attached to a clicked empty space
         '''
         
-        queue = [(x, y)]
-        visited = set()
+        # Every cell is revealed (and queued) at most once, so no visited set is needed
+        table = neighbor_table(self.cols, self.rows)
+        offsets, indexes = table.offsets, table.indexes
+        cols = self.cols
+        queue = deque([y * cols + x])
         
         while queue:
 
             # Process current cell
-            cx, cy = queue.pop(0)  
+            index = queue.popleft()
             
-            # Skip if already processed
-            if (cx, cy) in visited:
-                continue
-            visited.add((cx, cy))
-            
-            # Check all 8 neighbors
-            for dy in [-1, 0, 1]:
-                for dx in [-1, 0, 1]:
-                    # Skip the center cell (current cell)
-                    if dx == 0 and dy == 0:
-                        continue
-                        
-                    nx, ny = cx + dx, cy + dy
+            # Check all neighbors (precomputed, already within bounds)
+            for neighbor_index in indexes[offsets[index]:offsets[index + 1]]:
+                neighbor = self.grid[neighbor_index // cols][neighbor_index % cols]
+                
+                # Only reveal unclicked, unflagged cells
+                if not neighbor.clicked and not neighbor.flag:
+                    result = neighbor.reveal()
                     
-                    # Check bounds and if already visited
-                    if (0 <= nx < grid_width and 0 <= ny < grid_height and 
-                        (nx, ny) not in visited):
-                        
-                        neighbor = self.grid[ny][nx]
-                        
-                        # Only reveal unclicked, unflagged cells
-                        if not neighbor.clicked and not neighbor.flag:
-                            result = neighbor.reveal()
-                            
-                            # If empty, add to queue for further processing
-                            if result == "empty":
-                                queue.append((nx, ny))
+                    # If empty, add to queue for further processing
+                    if result == "empty":
+                        queue.append(neighbor_index)
 
     def check_win(self):
         '''
@@ -434,188 +716,56 @@ class MineSweeper:
                     return True
         return False
     
-    # iterate over all clicked cells to find neighboring cells that can be flagged
-    def flag_cells(self,clicked_cells,unclicked_cells):
-        for x,y in clicked_cells:
-                hidden_neighbor = []
-                flagged_neighbor = []
-                # check all neighbors
-                for di in [-1, 0, 1]:
-                    for dj in [-1, 0, 1]:
-                        #skip the cell itself
-                        if di == 0 and dj == 0:
-                            continue 
-                        # Calculate adjacent cell coordinates
-                        ni, nj = x + di, y + dj
-                        # Check if coordinates are within grid bounds
-                        if 0 <= ni < len(self.grid) and 0 <= nj < len(self.grid[0]):
-                            # Check if the neighboring cell is not clicked and is not flagged and add to array
-                            if (ni,nj) in unclicked_cells and not self.grid[nj][ni].flag:
-                                hidden_neighbor.append((ni,nj))
-                            # Check if the neighboring cell is a valid flag and add to array
-                            if self.grid[nj][ni].flag and self.grid[nj][ni].val == 'b':
-                                flagged_neighbor.append((ni,nj))
-                # If the number of hidden neighbors matches the value of the cell, flag all hidden neighbors and update
-                if  self.grid[y][x].val == (len(hidden_neighbor)+len(flagged_neighbor)):
-                    for i,j in hidden_neighbor:
-                        if not self.grid[j][i].flag:
-                            self.grid[j][i].toggleFlag()
-                            hidden_neighbor.remove((i,j))
-                            flagged_neighbor.append((i,j))
-
-    # Find cells with matching value and number of flagged neighbors to reveal safe cell
-    def reveal_hidden_neighbor(self,clicked_cells,unclicked_cells):
-        
-            for x,y in clicked_cells:
-                flagged_neighbor = []
-                hidden_neighbor = []
-                # Check all neighbors
-                for di in [-1, 0, 1]:
-                    for dj in [-1, 0, 1]:
-                        #skip the cell itself
-                        if di == 0 and dj == 0:
-                            continue 
-                        # Calculate adjacent cell coordinates
-                        ni, nj = x + di, y + dj
-                        # Check if coordinates are within grid bounds
-                        if 0 <= ni < len(self.grid) and 0 <= nj < len(self.grid[0]):
-                            # Check if the neighboring cell is not clicked and is not flagged and add to array
-                            if (ni,nj) in unclicked_cells and not self.grid[nj][ni].flag:
-                                hidden_neighbor.append((ni,nj))
-                            # Check if the neighboring cell is a valid flag and add to array
-                            if self.grid[nj][ni].flag and self.grid[nj][ni].val == 'b':
-                                flagged_neighbor.append((ni,nj))
-                # If the value of the cell matches the number of flagged neighbors and there are hidden neighbors, reveal hidden neighbor                
-                if self.grid[y][x].val == len(flagged_neighbor) and len(hidden_neighbor)!=0:
-                    i,j = hidden_neighbor[0]
-                    return self.grid[j][i].reveal(), self.grid[j][i]
+    def ai_uncover(self):
+        '''
+        Runs a whole AI turn right away on this thread and applies it.
+        Returns (result, cell) of the cell the AI revealed, or (None, None).
+        '''
 
+        self.sync_state()
+        moves = ai_player.choose_moves(BoardSnapshot.from_codes(self.vals, self.state, len(self.mines)),
+                                       self.difficulty)
+        return self.apply_ai_moves(moves)
 
-    def ai_uncover(self):
-        if self.difficulty == "easy":
-            # Find all unclicked, non-flagged cells
-            unclicked_cells = [(x, y) for y in range(grid_height) for x in range(grid_width) 
-                if not self.grid[y][x].clicked and not self.grid[y][x].flag]
-            
-            if not unclicked_cells:
-                return None, None
-            
-            # Randomly choose one cell
-            x, y = random.choice(unclicked_cells)
-            return self.grid[y][x].reveal(), self.grid[y][x]  # Uncover the chosen cell
-
-        elif self.difficulty == "medium":
-            # Find all unclicked, non-flagged cells
-            unclicked_cells = [(x, y) for y in range(grid_height) for x in range(grid_width) 
-                if not self.grid[y][x].clicked and not self.grid[y][x].flag]
-            # Find all clicked, non-flagged cells that neighbor mines
-            clicked_cells = [(x, y) for y in range(grid_height) for x in range(grid_width) 
-                if self.grid[y][x].clicked and not self.grid[y][x].flag and self.grid[y][x].val != 0]
-            
-            # iterate over all clicked cells to find neighboring cells that can be flagged
-            self.flag_cells(clicked_cells,unclicked_cells)
-
-            # Find cells with matching value and number of flagged neighbors to reveal safe cell
-            self.reveal_hidden_neighbor(clicked_cells,unclicked_cells)
-
-            # If the game is not already won, choose a random unclicked cell to reveal
-            if self.game_status != 'win':
-                if not unclicked_cells:
-                    return None, None
-                x, y = random.choice(unclicked_cells)
-                return self.grid[y][x].reveal(), self.grid[y][x]
-        
-        elif self.difficulty == "hard":
-           # Find all unclicked, non-flagged cells
-            unclicked_cells = [(x, y) for y in range(grid_height) for x in range(grid_width) 
-                if not self.grid[y][x].clicked and not self.grid[y][x].flag]
-            # Find all clicked, non-flagged cells that neighbor mines
-            clicked_cells = [(x, y) for y in range(grid_height) for x in range(grid_width) 
-                if self.grid[y][x].clicked and not self.grid[y][x].flag and self.grid[y][x].val != 0]
-            
-            # iterate over all clicked cells to find neighboring cells that can be flagged
-            self.flag_cells(clicked_cells,unclicked_cells)
-            
-            # Find cells with matching value and number of flagged neighbors to reveal safe cell
-            self.reveal_hidden_neighbor(clicked_cells,unclicked_cells)
-            # 3) Hard extra: 1-2-1 pattern (horizontal & vertical)
-            #    Action priority: flag outer hidden first; if outers settled, reveal middle if hidden.
-            # --- horizontal 1-2-1 (numbers at y, x..x+2), act on row below or above ---
-            for y in range(grid_height):
-                for x in range(grid_width - 2):
-                    c1 = self.grid[y][x]
-                    c2 = self.grid[y][x+1]
-                    c3 = self.grid[y][x+2]
-                    if c1.clicked and c2.clicked and c3.clicked and c1.val == 1 and c2.val == 2 and c3.val == 1:
-                        # try row below
-                        if y + 1 < grid_height:
-                            b0 = self.grid[y+1][x]
-                            b1 = self.grid[y+1][x+1]
-                            b2 = self.grid[y+1][x+2]
-                            # prefer flagging outer unknowns
-                            if not b0.clicked and not b0.flag:
-                                b0.toggleFlag()
-                                return None, None
-                            if not b2.clicked and not b2.flag:
-                                b2.toggleFlag()
-                                return None, None
-                            # then reveal middle if still hidden & not flagged
-                            if not b1.clicked and not b1.flag:
-                                return b1.reveal(), b1
-                        # try row above
-                        if y - 1 >= 0:
-                            a0 = self.grid[y-1][x]
-                            a1 = self.grid[y-1][x+1]
-                            a2 = self.grid[y-1][x+2]
-                            if not a0.clicked and not a0.flag:
-                                a0.toggleFlag()
-                                return None, None
-                            if not a2.clicked and not a2.flag:
-                                a2.toggleFlag()
-                                return None, None
-                            if not a1.clicked and not a1.flag:
-                                return a1.reveal(), a1
-
-            # --- vertical 1-2-1 (numbers at x, y..y+2), act on column right or left ---
-            for x in range(grid_width):
-                for y in range(grid_height - 2):
-                    c1 = self.grid[y][x]
-                    c2 = self.grid[y+1][x]
-                    c3 = self.grid[y+2][x]
-                    if c1.clicked and c2.clicked and c3.clicked and c1.val == 1 and c2.val == 2 and c3.val == 1:
-                        # try column right
-                        if x + 1 < grid_width:
-                            r0 = self.grid[y][x+1]
-                            r1 = self.grid[y+1][x+1]
-                            r2 = self.grid[y+2][x+1]
-                            if not r0.clicked and not r0.flag:
-                                r0.toggleFlag()
-                                return None, None
-                            if not r2.clicked and not r2.flag:
-                                r2.toggleFlag()
-                                return None, None
-                            if not r1.clicked and not r1.flag:
-                                return r1.reveal(), r1
-                        # try column left
-                        if x - 1 >= 0:
-                            l0 = self.grid[y][x-1]
-                            l1 = self.grid[y+1][x-1]
-                            l2 = self.grid[y+2][x-1]
-                            if not l0.clicked and not l0.flag:
-                                l0.toggleFlag()
-                                return None, None
-                            if not l2.clicked and not l2.flag:
-                                l2.toggleFlag()
-                                return None, None
-                            if not l1.clicked and not l1.flag:
-                                return l1.reveal(), l1
+    def start_ai_turn(self):
+        '''
+        Hands the board to the AI worker thread, the moves are applied by poll_ai_turn()
+        once they're ready. Only the O(1) copy-on-write snapshot of the cell codes is taken
+        here, the worker builds the BoardSnapshot from it. The click that started the turn
+        is timed until the AI's moves are on screen ("reveal + ai").
+        '''
 
-            
-                
-            # If the game is not already won, choose a random unclicked cell to reveal
-            if self.game_status != 'win':
-                if not unclicked_cells:
-                    return None, None
-                x, y = random.choice(unclicked_cells)
-                return self.grid[y][x].reveal(), self.grid[y][x]
-        
\ No newline at end of file
+        self.sync_state()
+        snapshot = functools.partial(BoardSnapshot.from_codes, self.vals, self.state.snapshot(), len(self.mines))
+        self.ai_latency = latency.defer("reveal + ai")
+        ai_worker.request(snapshot, self.difficulty, self.ai_budget)
+
+    def poll_ai_turn(self):
+        '''
+        Applies the AI's moves if its turn has finished
+        '''
+
+        moves = ai_worker.poll()
+        if moves is not None:
+            with profiler.scope("ai apply"):
+                result, cell = self.apply_ai_moves(moves)
+                self.check_state(result, cell)
+            latency.resume(self.ai_latency)
+            self.ai_latency = None
+
+    def apply_ai_moves(self, moves):
+        '''
+        Applies ("flag", x, y) and ("reveal", x, y) moves to the grid.
+        Returns (result, cell) of the last reveal, or (None, None).
+        '''
+
+        result, revealed = None, None
+        for action, x, y in moves:
+            cell = self.grid[y][x]
+            if action == "flag":
+                if not cell.flag and not cell.clicked:
+                    cell.toggleFlag()
+                    self.flags_placed += 1
+            elif action == "reveal":
+                result, revealed = cell.reveal(), cell
+        return result, revealed
@@ -0,0 +1,299 @@
+'''
+Module: AI player
+Description: The AI opponent's decision making, separated from the Grid objects so it can run on a
+    copy of the board in a worker thread. choose_moves() looks at a BoardSnapshot and returns the
+    moves for one AI turn as a list of ("flag", x, y) and ("reveal", x, y) tuples; the game applies
+    them to the real board. A random guess is picked first as the best-so-far move, and better
+    moves replace it while there is time left, so a turn cut short by its time budget or by
+    cancellation still returns something playable.
+        easy   - random unclicked cell
+        medium - flags cells that must be mines, reveals a cell that must be safe, otherwise guesses
+        hard   - medium plus linear deduction over all the frontier numbers together, then the
+                 frontier solver: certain mines and safe cells first, otherwise the cell least
+                 likely to be a mine; the 1-2-1 pattern along rows and columns when the solver has
+                 nothing
+Inputs: BoardSnapshot, difficulty, stop callback (time budget / cancellation)
+Outputs: List of moves
+External Sources: None
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import random
+
+import cell_state
+import deduction
+import frontier
+from neighbors import neighbor_table
+from parallel_solver import parallel_solver
+
+# cell_state code -> 1 if that cell is revealed / flagged, for bytes.translate()
+CLICKED_CODES = bytes(code < cell_state.HIDDEN or code in (cell_state.MINE, cell_state.MINE_CLICKED)
+                      for code in range(256))
+FLAGGED_CODES = bytes(code in (cell_state.FLAG, cell_state.MINE_FALSE) for code in range(256))
+
+
+class BoardSnapshot:
+    def __init__(self, vals, clicked, flags, mine_count=None):
+        '''
+        Copy of the board as plain nested lists indexed [y][x].
+        mine_count is the total number of mines (known to the player).
+        '''
+
+        self.vals = vals
+        self.clicked = clicked
+        self.flags = flags
+        self.rows = len(vals)
+        self.cols = len(vals[0]) if vals else 0
+        self.mine_count = mine_count
+
+    @classmethod
+    def from_grid(cls, grid):
+        '''
+        Takes a snapshot of a grid of Grid objects
+        '''
+
+        vals = [[cell.val for cell in row] for row in grid]
+        return cls(vals,
+                   [[cell.clicked for cell in row] for row in grid],
+                   [[cell.flag for cell in row] for row in grid],
+                   sum(row.count("b") for row in vals))
+
+    @classmethod
+    def from_codes(cls, vals, codes, mine_count=None):
+        '''
+        Takes a snapshot from the board's values (nested lists, only read) and its
+        cell_state codes (anything with tobytes(), like a CowCells snapshot)
+        '''
+
+        data = codes.tobytes()
+        cols = len(vals[0]) if vals else 0
+        rows = [data[start:start + cols] for start in range(0, len(data), cols)]
+        return cls(vals,
+                   [list(map(bool, row.translate(CLICKED_CODES))) for row in rows],
+                   [list(map(bool, row.translate(FLAGGED_CODES))) for row in rows],
+                   mine_count)
+
+    def hidden(self, x, y):
+        return not self.clicked[y][x] and not self.flags[y][x]
+
+
+def _never_stop():
+    return False
+
+
+def unclicked_cells(snap):
+    '''
+    All unclicked, non-flagged cells
+    '''
+
+    return [(x, y) for y in range(snap.rows) for x in range(snap.cols) if snap.hidden(x, y)]
+
+
+def clicked_number_cells(snap):
+    '''
+    All clicked, non-flagged cells that neighbor mines
+    '''
+
+    return [(x, y) for y in range(snap.rows) for x in range(snap.cols)
+            if snap.clicked[y][x] and not snap.flags[y][x] and snap.vals[y][x] != 0]
+
+
+def neighbor_counts(snap, x, y):
+    '''
+    Returns (hidden neighbors, number of correctly flagged neighbors) of a cell
+    '''
+
+    hidden = []
+    flagged = 0
+    cols = snap.cols
+    for index in neighbor_table(cols, snap.rows).of(y * cols + x):
+        ni, nj = index % cols, index // cols
+        if snap.hidden(ni, nj):
+            hidden.append((ni, nj))
+        elif snap.flags[nj][ni] and snap.vals[nj][ni] == 'b':
+            flagged += 1
+    return hidden, flagged
+
+
+def flag_cells(snap, clicked_cells, moves, should_stop=_never_stop):
+    '''
+    Flags all hidden neighbors of numbers whose value matches their hidden plus flagged
+    neighbors. Flags are applied to the snapshot and added to moves.
+    '''
+
+    for x, y in clicked_cells:
+        if should_stop():
+            return
+        hidden, flagged = neighbor_counts(snap, x, y)
+        if hidden and snap.vals[y][x] == len(hidden) + flagged:
+            for i, j in hidden:
+                snap.flags[j][i] = True
+                moves.append(("flag", i, j))
+
+
+def find_safe_cell(snap, clicked_cells, should_stop=_never_stop):
+    '''
+    Finds a hidden neighbor of a number whose flagged neighbors already match its value
+    '''
+
+    for x, y in clicked_cells:
+        if should_stop():
+            return None
+        hidden, flagged = neighbor_counts(snap, x, y)
+        if hidden and snap.vals[y][x] == flagged:
+            return hidden[0]
+    return None
+
+
+def _pattern_121_move(snap, cells):
+    '''
+    Given the three cells next to a 1-2-1, flag the outer hidden ones first,
+    then reveal the middle one if it's still hidden
+    '''
+
+    (x0, y0), (x1, y1), (x2, y2) = cells
+    if snap.hidden(x0, y0):
+        return ("flag", x0, y0)
+    if snap.hidden(x2, y2):
+        return ("flag", x2, y2)
+    if snap.hidden(x1, y1):
+        return ("reveal", x1, y1)
+    return None
+
+
+def find_121_move(snap, should_stop=_never_stop):
+    '''
+    Hard extra: 1-2-1 pattern (horizontal & vertical).
+    Action priority: flag outer hidden first; if outers settled, reveal middle if hidden.
+    '''
+
+    def is_121(a, b, c):
+        return (snap.clicked[a[1]][a[0]] and snap.clicked[b[1]][b[0]] and snap.clicked[c[1]][c[0]]
+                and snap.vals[a[1]][a[0]] == 1 and snap.vals[b[1]][b[0]] == 2 and snap.vals[c[1]][c[0]] == 1)
+
+    # Horizontal 1-2-1 (numbers at y, x..x+2), act on row below or above
+    for y in range(snap.rows):
+        if should_stop():
+            return None
+        for x in range(snap.cols - 2):
+            if is_121((x, y), (x + 1, y), (x + 2, y)):
+                for ny in (y + 1, y - 1):
+                    if 0 <= ny < snap.rows:
+                        move = _pattern_121_move(snap, [(x, ny), (x + 1, ny), (x + 2, ny)])
+                        if move:
+                            return move
+
+    # Vertical 1-2-1 (numbers at x, y..y+2), act on column right or left
+    for x in range(snap.cols):
+        if should_stop():
+            return None
+        for y in range(snap.rows - 2):
+            if is_121((x, y), (x, y + 1), (x, y + 2)):
+                for nx in (x + 1, x - 1):
+                    if 0 <= nx < snap.cols:
+                        move = _pattern_121_move(snap, [(nx, y), (nx, y + 1), (nx, y + 2)])
+                        if move:
+                            return move
+    return None
+
+
+def find_deduction_moves(snap, should_stop=_never_stop):
+    '''
+    Uses the linear deduction pass: flags every forced mine and reveals
+    a forced safe cell if there is one
+    '''
+
+    known = deduction.deduce(snap, should_stop)
+    moves = [("flag", x, y) for (x, y), mine in known.items() if mine and snap.hidden(x, y)]
+    for _, x, y in moves:
+        snap.flags[y][x] = True
+    for (x, y), mine in known.items():
+        if not mine and snap.hidden(x, y):
+            return moves + [("reveal", x, y)]
+    return moves
+
+
+def find_solver_moves(snap, should_stop=_never_stop, rng=random):
+    '''
+    Uses the frontier solver's mine probabilities. Returns flags for every certain
+    mine plus a reveal of a certain safe cell, or of the frontier cell least likely
+    to be a mine, or of a random cell away from the frontier when that is safer.
+    Returns [] if the solver has nothing to say.
+    '''
+
+    if parallel_solver.enabled:
+        probabilities = parallel_solver.solve(snap, should_stop)
+    else:
+        probabilities = frontier.solve(snap, should_stop)
+    if not probabilities:
+        return []
+
+    moves = [("flag", x, y) for (x, y), p in probabilities.items() if p == 1.0]
+    for _, x, y in moves:
+        snap.flags[y][x] = True
+    best, p = min(probabilities.items(), key=lambda item: item[1])
+    if p == 0.0:
+        return moves + [("reveal",) + best]
+
+    # Chance of a mine in a hidden cell away from the frontier
+    if snap.mine_count is not None:
+        flagged = sum(map(sum, snap.flags))
+        expected = sum(p for p in probabilities.values() if p < 1.0)
+        others = [cell for cell in unclicked_cells(snap) if cell not in probabilities]
+        if others and (snap.mine_count - flagged - expected) / len(others) < p:
+            return moves + [("reveal",) + rng.choice(others)]
+    return moves + [("reveal",) + best]
+
+
+def choose_moves(snap, difficulty, should_stop=_never_stop, rng=random):
+    '''
+    Returns the moves for one AI turn. should_stop() is checked between steps;
+    when it returns True the best moves found so far are returned.
+    '''
+
+    unclicked = unclicked_cells(snap)
+    if not unclicked:
+        return []
+
+    # Best so far: a random guess
+    guess = rng.choice(unclicked)
+    if difficulty == "easy" or should_stop():
+        return [("reveal",) + guess]
+
+    moves = []
+    clicked = clicked_number_cells(snap)
+
+    # Iterate over all clicked cells to find neighboring cells that can be flagged
+    flag_cells(snap, clicked, moves, should_stop)
+
+    # Find cells with matching value and number of flagged neighbors to reveal safe cell
+    safe = find_safe_cell(snap, clicked, should_stop)
+    if safe is not None:
+        return moves + [("reveal",) + safe]
+
+    if difficulty == "hard" and not should_stop():
+        # Deduction is cheap and handles components of any size
+        deduced = find_deduction_moves(snap, should_stop)
+        if deduced and deduced[-1][0] == "reveal":
+            return moves + deduced
+        moves += deduced
+
+    if difficulty == "hard" and not should_stop():
+        # The solver is exact, the 1-2-1 pattern is the fallback for components too big to solve
+        solver_moves = find_solver_moves(snap, should_stop, rng)
+        if solver_moves and solver_moves[-1][0] == "reveal":
+            return moves + solver_moves
+        moves += solver_moves
+
+        move = find_121_move(snap, should_stop)
+        if move is not None:
+            return moves + [move]
+
+    # The guess may have just been flagged, guess again among what's left
+    if not snap.hidden(*guess):
+        unclicked = [cell for cell in unclicked if snap.hidden(*cell)]
+        if not unclicked:
+            return moves
+        guess = rng.choice(unclicked)
+    return moves + [("reveal",) + guess]
@@ -0,0 +1,100 @@
+'''
+Module: AI worker
+Description: Runs AI turns on a background thread so the game keeps drawing and handling input
+    while the AI thinks. The game sends a BoardSnapshot (or a function that builds one, so a big
+    board is copied on this thread instead of the game's) through a request queue, the worker runs
+    ai_player.choose_moves() on it within a time budget and sends the moves back through a result
+    queue that the game polls once per frame. Starting a new request or calling cancel() bumps a
+    generation counter; a running turn notices it and stops early, and results from an old
+    generation are thrown away, so retrying or quitting never applies a stale move.
+Inputs: BoardSnapshot, difficulty, time budget (seconds)
+Outputs: List of AI moves (see ai_player)
+External Sources: None
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import queue
+import threading
+import time
+import traceback
+
+import ai_player
+from profiler import profiler
+
+# Default time budget for one AI turn (seconds)
+DEFAULT_AI_BUDGET = 0.25
+
+
+class AIWorker:
+    def __init__(self):
+        '''
+        The thread is started on the first request
+        '''
+
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.generation = 0
+        self.busy = False
+        self.thread = None
+
+    def request(self, snapshot, difficulty, budget=DEFAULT_AI_BUDGET):
+        '''
+        Starts an AI turn on the snapshot, a BoardSnapshot or a function returning one
+        (called on the worker thread). Any turn still running is cancelled.
+        '''
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="ai-worker", daemon=True)
+            self.thread.start()
+
+        self.generation += 1
+        self.busy = True
+        self.requests.put((self.generation, snapshot, difficulty, budget))
+
+    def cancel(self):
+        '''
+        Drops the current AI turn (player retried or quit)
+        '''
+
+        self.generation += 1
+        self.busy = False
+
+    def poll(self):
+        '''
+        Returns the moves of the current turn once they are ready, otherwise None
+        '''
+
+        while True:
+            try:
+                generation, moves = self.results.get_nowait()
+            except queue.Empty:
+                return None
+            if generation == self.generation:
+                self.busy = False
+                return moves
+
+    def _run(self):
+        while True:
+            generation, snapshot, difficulty, budget = self.requests.get()
+            if generation != self.generation:
+                continue  # Cancelled before it started
+
+            deadline = time.perf_counter() + budget
+
+            def should_stop():
+                return generation != self.generation or time.perf_counter() > deadline
+
+            with profiler.scope("ai turn"):
+                try:
+                    if callable(snapshot):
+                        snapshot = snapshot()
+                    moves = ai_player.choose_moves(snapshot, difficulty, should_stop)
+                except Exception:
+                    traceback.print_exc()
+                    moves = []  # A broken turn shouldn't take the game down with it
+            self.results.put((generation, moves))
+
+
+# Shared by the whole process
+ai_worker = AIWorker()
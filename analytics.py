@@ -0,0 +1,317 @@
+'''
+Module: Board analytics
+Description: Difficulty metrics for large numbers of boards, for comparing generators and calibrating
+    the AI. Boards are handled as (n, rows, cols) arrays, a batch at a time, with the same NumPy
+    building blocks as batch_env (3x3 neighbourhood sums and array-based connected component
+    labelling of the zero regions). Per board:
+        3bv              - fewest clicks that clear the board: zero regions plus isolated numbers
+        zero_regions     - connected (8-way) regions of empty cells, each opened by one click
+        isolated_numbers - safe numbered cells that touch no empty cell, each needs its own click
+        guesses          - times a player who only uses one-number rules (a number that has all
+                           its mines flagged clears the rest, a number with as many hidden cells
+                           as missing mines flags them all) gets stuck after the first click.
+                           Every guess is taken to be lucky (the next safe frontier cell is
+                           opened), so this counts guesses, not the risk of losing.
+    All metrics are small integers, so the batches only add to running histograms, and the
+    summary table (mean, spread and percentiles) is worked out from those. Batches are
+    independent and can be spread over worker processes (--workers).
+
+        python analytics.py --width 30 --height 16 --mines 99 --boards 1000000 --workers 0 --out analytics
+Inputs: Board size, mine count, number of boards, generator
+Outputs: histograms.csv and summary.csv, summary table on stdout
+External Sources: 3BV - https://minesweepergame.com/statistics.php
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import argparse
+import csv
+import multiprocessing
+import os
+import random
+import time
+
+import numpy as np
+
+import BoardGenerator
+import cell_state
+from batch_env import MINE_VALUE, generate_pool, label_zero_regions, neighborhood
+
+METRICS = ("3bv", "zero_regions", "isolated_numbers", "guesses")
+
+# Percentiles in the summary table
+PERCENTILES = (10, 50, 90)
+
+# Boards analysed together
+DEFAULT_BATCH = 4096
+
+
+def board_arrays(grids):
+    '''
+    BoardGenerator grids ('b' for mines) as an (n, rows, cols) array of values
+    '''
+
+    vals = np.array(grids, dtype=object)
+    return np.where(vals == 'b', MINE_VALUE, vals).astype(np.uint8)
+
+
+def classic_boards(count, cols, rows, mines, rng):
+    '''
+    count boards from BoardGenerator with a random safe first click.
+    Returns (vals, start cell indexes).
+    '''
+
+    start = [rng.randrange(cols * rows) for _ in range(count)]
+    grids = [BoardGenerator.generate_numbering(
+                 BoardGenerator.generate_bombs(mines, cell // cols, cell % cols, cols, rows, rng=rng))
+             for cell in start]
+    return board_arrays(grids), np.array(start)
+
+
+def open_cells(vals, labels, clicked):
+    '''
+    Cells opened by revealing clicked (a boolean (n, rows, cols) array of safe
+    cells): the clicked cells, plus whole zero regions and their borders for
+    clicked empty cells
+    '''
+
+    n = len(vals)
+    empty = (clicked & (vals == 0)).reshape(n, -1)
+    flooding = np.flatnonzero(empty.any(axis=1))
+    if not len(flooding):
+        return clicked
+
+    # Only the boards with an empty cell clicked need their regions looked up
+    boards, cells = np.nonzero(empty[flooding])
+    flat_labels = labels[flooding].reshape(len(flooding), -1)
+    hit = np.zeros((len(flooding), flat_labels.shape[1] + 1), dtype=bool)
+    hit[boards, flat_labels[boards, cells]] = True
+    region = np.take_along_axis(hit, flat_labels, axis=1).reshape((len(flooding),) + vals.shape[1:])
+    region &= labels[flooding] > 0
+    opened = clicked.copy()
+    opened[flooding] |= neighborhood(region, np.logical_or)
+    return opened
+
+
+def first_click(vals, labels, start):
+    '''
+    Cells open after clicking each board's start cell index
+    '''
+
+    clicked = np.zeros(vals.shape, dtype=bool)
+    clicked.reshape(len(vals), -1)[np.arange(len(vals)), start] = True
+    return open_cells(vals, labels, clicked)
+
+
+def region_metrics(vals, labels):
+    '''
+    zero_regions, isolated_numbers and 3bv arrays of (n, rows, cols) boards
+    '''
+
+    n = len(vals)
+    flat_labels = labels.reshape(n, -1)
+    # A region's label is the largest cell id in it, so exactly one cell per region carries its own id
+    ids = np.arange(1, flat_labels.shape[1] + 1, dtype=flat_labels.dtype)
+    zero_regions = (flat_labels == ids).sum(axis=1)
+    covered = neighborhood(labels > 0, np.logical_or)
+    isolated = ((vals != MINE_VALUE) & ~covered).reshape(n, -1).sum(axis=1)
+    return {"zero_regions": zero_regions, "isolated_numbers": isolated, "3bv": zero_regions + isolated}
+
+
+def count_guesses(vals, labels, opened):
+    '''
+    Guesses a one-number-rules player needs on each board, starting from the
+    cells in opened (see the module description)
+    '''
+
+    n = len(vals)
+    guesses = np.zeros(n, dtype=np.int32)
+    safe_left = ((vals != MINE_VALUE) & ~opened).reshape(n, -1).sum(axis=1)
+
+    # Working copies of the unfinished boards, compacted as boards finish
+    active = np.flatnonzero(safe_left)
+    v, labels, revealed = vals[active], labels[active], opened[active]
+    safe_left = safe_left[active]
+    flagged = np.zeros(revealed.shape, dtype=bool)
+    while len(active):
+        count = len(active)
+        hidden = ~revealed & ~flagged
+        hidden_count = neighborhood(hidden.view(np.uint8), np.add)
+        flag_count = neighborhood(flagged.view(np.uint8), np.add)  # Revealed cells don't count themselves
+        numbers = revealed & (v > 0) & (hidden_count > 0)
+
+        clear = neighborhood(numbers & (v == flag_count), np.logical_or) & hidden
+        full = neighborhood(numbers & (v == flag_count + hidden_count), np.logical_or) & hidden
+        flagged |= full
+
+        # Stuck boards take a lucky guess: the first safe hidden cell next to an open one
+        stuck = np.flatnonzero(~(clear | full).reshape(count, -1).any(axis=1) & (safe_left > 0))
+        if len(stuck):
+            safe_hidden = (hidden[stuck] & (v[stuck] != MINE_VALUE)).reshape(len(stuck), -1)
+            near = neighborhood(revealed[stuck], np.logical_or).reshape(len(stuck), -1) & safe_hidden
+            pick = np.where(near.any(axis=1), near.argmax(axis=1), safe_hidden.argmax(axis=1))
+            clear.reshape(count, -1)[stuck, pick] = True
+            guesses[active[stuck]] += 1
+
+        new = open_cells(v, labels, clear) & hidden
+        revealed |= new
+        safe_left -= new.reshape(count, -1).sum(axis=1)
+
+        left = safe_left > 0
+        if not left.any():
+            break
+        if left.sum() < count * 3 // 4:
+            active, v, labels, revealed, flagged, safe_left = (
+                active[left], v[left], labels[left], revealed[left], flagged[left], safe_left[left])
+    return guesses
+
+
+def analyze(vals, labels=None, opened=None, start=None):
+    '''
+    Every metric for a batch of (n, rows, cols) boards, as {metric: array}.
+    The game starts from the opened cells, or from clicking the start cell indexes.
+    '''
+
+    if labels is None:
+        labels = label_zero_regions(vals)
+    if opened is None:
+        opened = first_click(vals, labels, start)
+    metrics = region_metrics(vals, labels)
+    metrics["guesses"] = count_guesses(vals, labels, opened)
+    return metrics
+
+
+class Histograms:
+    def __init__(self):
+        '''
+        Running count of boards per value, for every metric
+        '''
+
+        self.counts = {metric: np.zeros(0, dtype=np.int64) for metric in METRICS}
+        self.boards = 0
+
+    def add(self, metrics):
+        for metric in METRICS:
+            counts = np.bincount(metrics[metric])
+            total = self.counts[metric]
+            if len(counts) > len(total):
+                total = np.pad(total, (0, len(counts) - len(total)))
+            total[:len(counts)] += counts
+            self.counts[metric] = total
+        self.boards += len(metrics[METRICS[0]])
+
+    def summary(self):
+        '''
+        (metric, mean, std, min, percentiles..., max) rows
+        '''
+
+        rows = []
+        for metric in METRICS:
+            counts = self.counts[metric]
+            values = np.arange(len(counts))
+            mean = (values * counts).sum() / self.boards
+            std = np.sqrt((counts * (values - mean) ** 2).sum() / self.boards)
+            cumulative = np.cumsum(counts)
+            percentiles = [int(np.searchsorted(cumulative, self.boards * p / 100.0)) for p in PERCENTILES]
+            present = np.flatnonzero(counts)
+            rows.append((metric, mean, std, int(present[0]), *percentiles, int(present[-1])))
+        return rows
+
+    def write(self, directory):
+        '''
+        Writes histograms.csv and summary.csv to directory, returns their paths
+        '''
+
+        os.makedirs(directory, exist_ok=True)
+        histogram_path = os.path.join(directory, "histograms.csv")
+        with open(histogram_path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["metric", "value", "boards"])
+            for metric in METRICS:
+                for value in np.flatnonzero(self.counts[metric]):
+                    writer.writerow([metric, value, self.counts[metric][value]])
+
+        summary_path = os.path.join(directory, "summary.csv")
+        with open(summary_path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["metric", "mean", "std", "min"] + ["p%d" % p for p in PERCENTILES] + ["max"])
+            for row in self.summary():
+                writer.writerow([row[0], "%.3f" % row[1], "%.3f" % row[2]] + list(row[3:]))
+        return [histogram_path, summary_path]
+
+    def report(self):
+        lines = ["%d boards" % self.boards,
+                 "  %-17s %8s %8s %6s" % ("metric", "mean", "std", "min")
+                 + "".join(" %6s" % ("p%d" % p) for p in PERCENTILES) + " %6s" % "max"]
+        for metric, mean, std, *rest in self.summary():
+            lines.append("  %-17s %8.2f %8.2f" % (metric, mean, std) + "".join(" %6d" % value for value in rest))
+        no_guess = self.counts["guesses"][0] if len(self.counts["guesses"]) else 0
+        lines.append("  solved without guessing: %.1f%%" % (100.0 * no_guess / self.boards))
+        return "\n".join(lines)
+
+
+def analyze_batch(job):
+    '''
+    Generates and analyses one batch, job is (boards, cols, rows, mines, generator, seed).
+    Runs in the worker processes when there are any.
+    '''
+
+    size, cols, rows, mines, generator, seed = job
+    if generator == "pool":
+        vals, labels, start_codes, _ = generate_pool(size, cols, rows, mines, np.random.default_rng(seed))
+        shape = (size, rows, cols)
+        return analyze(vals.reshape(shape), labels.reshape(shape), start_codes.reshape(shape) != cell_state.HIDDEN)
+    vals, start = classic_boards(size, cols, rows, mines, random.Random(int(seed.generate_state(1)[0])))
+    return analyze(vals, start=start)
+
+
+def run(boards, cols, rows, mines, generator="pool", batch=DEFAULT_BATCH, seed=None, workers=1):
+    '''
+    Generates and analyses boards in batches, on workers processes (0 for one per
+    core), and returns the Histograms. Every batch has its own seed, so the
+    results don't depend on the number of workers.
+    '''
+
+    sizes = [min(batch, boards - start) for start in range(0, boards, batch)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(size, cols, rows, mines, generator, child) for size, child in zip(sizes, seeds)]
+
+    histograms = Histograms()
+    if workers == 1:
+        for job in jobs:
+            histograms.add(analyze_batch(job))
+        return histograms
+    with multiprocessing.Pool(workers or os.cpu_count() or 1) as pool:
+        for metrics in pool.imap_unordered(analyze_batch, jobs):
+            histograms.add(metrics)
+    return histograms
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Minesweeper board difficulty analytics")
+    parser.add_argument("--width", type=int, default=30, help="board width (default 30)")
+    parser.add_argument("--height", type=int, default=16, help="board height (default 16)")
+    parser.add_argument("--mines", type=int, default=99, help="mine count (default 99)")
+    parser.add_argument("--boards", type=int, default=100000, help="boards to analyse (default 100000)")
+    parser.add_argument("--generator", choices=("pool", "classic"), default="pool",
+                        help="batch_env's vectorized pool or BoardGenerator (default pool)")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH, help="boards per batch (default %d)" % DEFAULT_BATCH)
+    parser.add_argument("--seed", type=int, help="random seed")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="worker processes, 0 for one per core (default 1)")
+    parser.add_argument("--out", metavar="DIR", help="write histograms.csv and summary.csv to DIR")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    histograms = run(args.boards, args.width, args.height, args.mines, args.generator, args.batch, args.seed,
+                     args.workers)
+    seconds = time.perf_counter() - start
+    print("%dx%d with %d mines, %s generator, %.1f s (%.0f boards/s)"
+          % (args.width, args.height, args.mines, args.generator, seconds, args.boards / seconds))
+    print(histograms.report())
+    if args.out:
+        print("Written to " + ", ".join(histograms.write(args.out)))
+
+
+if __name__ == "__main__":
+    main()
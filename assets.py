@@ -0,0 +1,164 @@
+'''
+Module: Asset cache
+Description: Process-wide cache for sprites and sounds. Nothing is loaded when a module is imported;
+    each file is loaded the first time something asks for it and then shared by every screen and
+    game instance. preload() can warm the cache from a background thread while the main menu is
+    showing, and the load time of every file (plus startup milestones such as the first menu
+    frame) is recorded so startup cost can be checked with report().
+Inputs: Asset paths relative to the project folder
+Outputs: pygame Surfaces and Sounds, timing report
+External Sources: Pygame library
+    pygame.image documentation - https://www.pygame.org/docs/ref/image.html
+    pygame.mixer documentation - https://www.pygame.org/docs/ref/mixer.html
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import os
+import threading
+import time
+
+import pygame
+
+# Time the cache module was first imported, used as the start of the startup clock
+PROCESS_START = time.perf_counter()
+
+# Asset paths are relative to the project folder, not the working directory
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class AssetCache:
+    def __init__(self):
+        '''
+        Initializes empty caches. Nothing touches the disk until an asset is requested.
+        '''
+
+        self._images = {}
+        self._scaled = {}
+        self._sounds = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+        # Seconds spent loading each asset, and named startup milestones
+        self.load_times = {}
+        self.milestones = {}
+
+    def path(self, name):
+        '''
+        Full path of an asset
+        '''
+
+        return os.path.join(BASE_DIR, name)
+
+    def image(self, name):
+        '''
+        Returns the image, loading it on first use
+        '''
+
+        surface = self._images.get(name)
+        if surface is None:
+            with self._lock:
+                surface = self._images.get(name)
+                if surface is None:
+                    start = time.perf_counter()
+                    surface = pygame.image.load(self.path(name))
+                    self.load_times[name] = time.perf_counter() - start
+                    self._images[name] = surface
+        return surface
+
+    def scaled_image(self, name, size):
+        '''
+        Returns the image scaled to size, scaling it only once
+        '''
+
+        key = (name, tuple(size))
+        surface = self._scaled.get(key)
+        if surface is None:
+            surface = pygame.transform.scale(self.image(name), size)
+            self._scaled[key] = surface
+        return surface
+
+    def sound(self, name, volume=None):
+        '''
+        Returns the sound, loading it on first use. Returns None if the
+        sound can't be loaded (no audio device, missing file).
+        '''
+
+        if name in self._sounds:
+            sound = self._sounds[name]
+        else:
+            with self._lock:
+                if name in self._sounds:
+                    sound = self._sounds[name]
+                else:
+                    start = time.perf_counter()
+                    try:
+                        sound = pygame.mixer.Sound(self.path(name))
+                    except Exception:
+                        sound = None
+                    self.load_times[name] = time.perf_counter() - start
+                    self._sounds[name] = sound
+
+        if sound is not None and volume is not None:
+            sound.set_volume(volume)
+        return sound
+
+    def preload(self, images=(), sounds=(), background=True):
+        '''
+        Loads the given images and sounds ahead of time. With background=True the
+        loading happens in a daemon thread so the caller (the main menu) keeps drawing.
+        '''
+
+        images = list(images)
+        sounds = list(sounds)
+
+        def load_all():
+            start = time.perf_counter()
+            for name in images:
+                try:
+                    self.image(name)
+                except Exception:
+                    pass  # Loaded (and reported) again on first real use
+            for name in sounds:
+                self.sound(name)
+            self.load_times["preload total"] = time.perf_counter() - start
+
+        if not background:
+            load_all()
+            return None
+
+        self._thread = threading.Thread(target=load_all, name="asset-preload", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def wait(self, timeout=None):
+        '''
+        Blocks until a background preload has finished
+        '''
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def mark(self, milestone):
+        '''
+        Records the time (in seconds since startup) of a named milestone, only the first time
+        '''
+
+        self.milestones.setdefault(milestone, time.perf_counter() - PROCESS_START)
+
+    def report(self):
+        '''
+        Returns a printable summary of asset load times and startup milestones
+        '''
+
+        lines = ["Startup milestones:"]
+        for milestone, seconds in self.milestones.items():
+            lines.append("  %-28s %8.1f ms" % (milestone, seconds * 1000))
+        lines.append("Asset load times:")
+        for name, seconds in sorted(self.load_times.items(), key=lambda item: -item[1]):
+            lines.append("  %-28s %8.2f ms" % (name, seconds * 1000))
+        return "\n".join(lines)
+
+
+# Shared by the whole process
+assets = AssetCache()
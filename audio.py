@@ -0,0 +1,177 @@
+'''
+Module: Audio
+Description: Low latency sound effects. configure_mixer() must run before pygame.init() so the mixer
+    starts with a small buffer instead of pygame's default. The AudioManager reserves dedicated
+    mixer channels for each category of sound (UI clicks/flags vs. win/lose stingers) so one
+    category can never starve the other. Sounds are queued during event handling and played once
+    per frame by flush(): repeats of the same effect inside a frame are merged and a short rate
+    limit stops bursts (flood reveals, AI turns) from stacking the same sample. The delay from
+    queueing a sound to handing it to the mixer is measured, plus the mixer buffer latency.
+Inputs: Sound names queued by the game
+Outputs: Sound playback, latency report
+External Sources: Pygame library
+    pygame.mixer documentation - https://www.pygame.org/docs/ref/mixer.html
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import time
+
+import pygame
+from assets import assets
+
+# Mixer settings. A 256 sample buffer is ~6 ms at 44.1 kHz (pygame's default is 512 or more)
+MIXER_FREQUENCY = 44100
+MIXER_SIZE = -16
+MIXER_CHANNELS = 2
+MIXER_BUFFER = 256
+
+# Reserved mixer channels for each category
+CATEGORY_CHANNELS = {
+    "ui": 3,
+    "result": 1,
+}
+
+# Sound effects: name -> (file, volume, category, fallback sound name)
+SOUNDS = {
+    "click": ("audio/click.wav", 0.7, "ui", None),
+    "flag": ("audio/flag.wav", 0.7, "ui", None),
+    "unflag": ("audio/unflag.wav", 0.7, "ui", "flag"),
+    "win": ("audio/win.wav", 0.8, "result", None),
+    "lose": ("audio/lose.wav", 0.8, "result", None),
+}
+
+# The same sound isn't started again within this many seconds
+MIN_REPEAT_INTERVAL = 0.045
+
+
+def configure_mixer(buffer=MIXER_BUFFER, frequency=MIXER_FREQUENCY):
+    '''
+    Sets up the mixer parameters. Has to be called before pygame.init()
+    '''
+
+    pygame.mixer.pre_init(frequency, MIXER_SIZE, MIXER_CHANNELS, buffer)
+    audio.buffer = buffer
+
+
+class AudioManager:
+    def __init__(self):
+        '''
+        Nothing is set up until the first sound is queued, so importing
+        this module doesn't need an audio device
+        '''
+
+        self.buffer = MIXER_BUFFER
+        self.channels = None
+        self.pending = {}       # Sound name -> time it was first queued this frame
+        self.last_played = {}   # Sound name -> time it was last played
+        self.latencies = []     # Seconds from queue() to Channel.play()
+        self.coalesced = 0      # Sounds merged into one already queued this frame
+        self.rate_limited = 0   # Sounds dropped because the same one just played
+
+    def _setup(self):
+        '''
+        Reserves the channels for every category. Returns False if there is no mixer.
+        '''
+
+        if self.channels is not None:
+            return bool(self.channels)
+
+        self.channels = {}
+        if not pygame.mixer.get_init():
+            return False
+
+        total = sum(CATEGORY_CHANNELS.values())
+        if pygame.mixer.get_num_channels() < total + 2:
+            pygame.mixer.set_num_channels(total + 2)  # Leave a couple for pygame's own Sound.play()
+        pygame.mixer.set_reserved(total)
+
+        index = 0
+        for category, count in CATEGORY_CHANNELS.items():
+            self.channels[category] = [pygame.mixer.Channel(index + i) for i in range(count)]
+            index += count
+        return True
+
+    def buffer_latency(self):
+        '''
+        Seconds of audio held in the mixer buffer (0 without a mixer)
+        '''
+
+        init = pygame.mixer.get_init()
+        if not init:
+            return 0.0
+        frequency = init[0]
+        return self.buffer / float(frequency)
+
+    def queue(self, name):
+        '''
+        Asks for a sound to be played at the next flush()
+        '''
+
+        now = time.perf_counter()
+        if name in self.pending:
+            self.coalesced += 1
+            return
+        if now - self.last_played.get(name, -1.0) < MIN_REPEAT_INTERVAL:
+            self.rate_limited += 1
+            return
+        self.pending[name] = now
+
+    def flush(self):
+        '''
+        Plays everything queued since the last flush, one channel per sound
+        '''
+
+        if not self.pending:
+            return
+        pending = self.pending
+        self.pending = {}
+        if not self._setup():
+            return
+
+        for name, queued_at in pending.items():
+            sound, category = self._sound(name)
+            if sound is None:
+                continue
+
+            # Use a free channel in the category, otherwise cut off the first one
+            channels = self.channels[category]
+            channel = next((c for c in channels if not c.get_busy()), channels[0])
+            channel.play(sound)
+
+            now = time.perf_counter()
+            self.last_played[name] = now
+            self.latencies.append(now - queued_at)
+
+    def _sound(self, name):
+        '''
+        Looks up a sound (or its fallback) in the asset cache
+        '''
+
+        while name is not None:
+            path, volume, category, fallback = SOUNDS[name]
+            sound = assets.sound(path, volume)
+            if sound is not None:
+                return sound, category
+            name = fallback
+        return None, None
+
+    def report(self):
+        '''
+        Returns a printable summary of sound latency
+        '''
+
+        lines = ["Audio: buffer latency %.1f ms" % (self.buffer_latency() * 1000)]
+        if self.latencies:
+            ordered = sorted(self.latencies)
+            lines.append("  queue->play: %d sounds, mean %.2f ms, p95 %.2f ms, max %.2f ms" % (
+                len(ordered),
+                sum(ordered) / len(ordered) * 1000,
+                ordered[int(0.95 * (len(ordered) - 1))] * 1000,
+                ordered[-1] * 1000))
+        lines.append("  coalesced %d, rate limited %d" % (self.coalesced, self.rate_limited))
+        return "\n".join(lines)
+
+
+# Shared by the whole process
+audio = AudioManager()
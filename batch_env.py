@@ -0,0 +1,239 @@
+'''
+Module: Batched environment
+Description: Plays many Minesweeper boards in lockstep for training and evaluating solvers. The
+    visible state of all B boards is one (B, rows * cols) uint8 array of cell_state codes, and
+    step() applies one action per board in a handful of NumPy operations instead of a Python loop.
+    Boards come from a pool generated up front: mines, numbers and the zero regions (found with
+    array-based connected component labelling) are all computed for the whole pool at once, so a
+    flood fill during play is a label comparison plus one dilation. Every pooled board starts
+    with its opening already revealed (the batched version of the safe first click), and boards
+    that finish are reset from the pool inside step().
+
+    Actions are cell indexes (y * cols + x): a < cells reveals, a >= cells flags or unflags
+    cell a - cells. step() returns (observations, rewards, done, won) arrays.
+Inputs: Batch size, board size, mine count, actions
+Outputs: Observation, reward and done arrays
+External Sources: NumPy - https://numpy.org/doc/stable/
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import numpy as np
+
+import cell_state
+
+# Hidden value stored for a mine
+MINE_VALUE = 9
+
+# Rewards per step
+REWARD_WIN = 1.0
+REWARD_LOSS = -1.0
+REWARD_REVEAL = 0.1     # Revealed at least one safe cell
+REWARD_NOOP = 0.0       # Flag or a click on a cell that is already open
+
+
+def neighborhood(boards, combine):
+    '''
+    Combines every cell of (n, rows, cols) boards with its 8 neighbours
+    (and itself) using combine, e.g. np.add or np.logical_or. The 3x3 box
+    is done as a row pass then a column pass, 4 operations instead of 8.
+    '''
+
+    out = boards.copy()
+    combine(out[:, :, 1:], boards[:, :, :-1], out=out[:, :, 1:])
+    combine(out[:, :, :-1], boards[:, :, 1:], out=out[:, :, :-1])
+    rowwise = out.copy()
+    combine(out[:, 1:], rowwise[:, :-1], out=out[:, 1:])
+    combine(out[:, :-1], rowwise[:, 1:], out=out[:, :-1])
+    return out
+
+
+def label_zero_regions(vals):
+    '''
+    Labels the connected (8-way) regions of empty cells in (n, rows, cols) boards.
+    Cells that aren't empty get label 0. Labels are spread by repeated 3x3 max
+    filtering (a row pass then a column pass) until nothing changes, which takes
+    about as many passes as the longest region is wide. Boards drop out of the
+    loop as soon as their labels settle.
+    '''
+
+    n, rows, cols = vals.shape
+    zero = vals == 0
+    labels = np.where(zero, np.arange(1, rows * cols + 1, dtype=np.int32).reshape(1, rows, cols), 0)
+    active = np.arange(n)
+    while len(active):
+        current = labels[active]
+        spread = current.copy()
+        np.maximum(spread[:, :, 1:], current[:, :, :-1], out=spread[:, :, 1:])
+        np.maximum(spread[:, :, :-1], current[:, :, 1:], out=spread[:, :, :-1])
+        rowwise = spread.copy()
+        np.maximum(spread[:, 1:], rowwise[:, :-1], out=spread[:, 1:])
+        np.maximum(spread[:, :-1], rowwise[:, 1:], out=spread[:, :-1])
+        spread *= zero[active]
+        changed = (spread != current).any(axis=(1, 2))
+        labels[active] = spread
+        active = active[changed]
+    return labels
+
+
+def generate_pool(size, cols, rows, mines, rng):
+    '''
+    Generates size boards at once. Returns (vals, labels, start, hidden_safe):
+    hidden values (MINE_VALUE for mines), zero region labels, the starting
+    visible codes with the opening revealed, and the safe cells still hidden.
+    '''
+
+    cells = cols * rows
+    mines = min(mines, cells - 9)
+
+    # Random start cell, mines go anywhere outside the 3x3 area around it
+    start = rng.integers(0, cells, size)
+    ys, xs = np.divmod(np.arange(cells), cols)
+    sy, sx = np.divmod(start, cols)
+    safe = (np.abs(ys[None, :] - sy[:, None]) <= 1) & (np.abs(xs[None, :] - sx[:, None]) <= 1)
+    keys = rng.random((size, cells))
+    keys[safe] = 2.0
+    mine_cells = np.argpartition(keys, mines, axis=1)[:, :mines]
+    is_mine = np.zeros((size, cells), dtype=bool)
+    np.put_along_axis(is_mine, mine_cells, True, axis=1)
+
+    # Numbers are the mine counts of the 3x3 neighbourhoods
+    grid = is_mine.reshape(size, rows, cols)
+    counts = neighborhood(grid.astype(np.uint8), np.add)
+    vals = np.where(grid, MINE_VALUE, counts).astype(np.uint8)
+    labels = label_zero_regions(vals).reshape(size, cells)
+    vals = vals.reshape(size, cells)
+
+    # Open the start cell's region like a first click would
+    region = labels == labels[np.arange(size), start][:, None]
+    opened = neighborhood(region.reshape(size, rows, cols), np.logical_or).reshape(size, cells)
+    start_codes = np.where(opened, vals, cell_state.HIDDEN).astype(np.uint8)
+    hidden_safe = (cells - mines - opened.sum(axis=1)).astype(np.int32)
+    return vals, labels, start_codes, hidden_safe
+
+
+class BatchEnv:
+    def __init__(self, batch, cols=10, rows=10, mines=10, pool_size=None, seed=None):
+        '''
+        Creates batch boards of cols x rows with the given mine count.
+        pool_size boards are generated up front (default 4 * batch) and
+        handed out in turn as boards finish.
+        '''
+
+        self.batch = batch
+        self.cols = cols
+        self.rows = rows
+        self.cells = cols * rows
+        self.rng = np.random.default_rng(seed)
+        self.pool_vals, self.pool_labels, self.pool_start, self.pool_hidden = generate_pool(
+            pool_size or 4 * batch, cols, rows, mines, self.rng)
+        self.next_pool = 0
+
+        self.boards = np.arange(batch)
+        self.pool_index = np.zeros(batch, dtype=np.int64)
+        self.codes = np.empty((batch, self.cells), dtype=np.uint8)
+        self.hidden_safe = np.zeros(batch, dtype=np.int32)
+        self.episodes = 0
+        self.wins = 0
+        self.reset()
+
+    @property
+    def obs(self):
+        '''
+        Visible boards as a (batch, rows, cols) view of cell_state codes
+        '''
+
+        return self.codes.reshape(self.batch, self.rows, self.cols)
+
+    def reset(self):
+        self._reset(self.boards)
+        return self.obs
+
+    def _reset(self, boards):
+        '''
+        Gives the boards fresh games from the pool
+        '''
+
+        count = len(boards)
+        if not count:
+            return
+        pool = (self.next_pool + np.arange(count)) % len(self.pool_vals)
+        self.next_pool = (self.next_pool + count) % len(self.pool_vals)
+        self.pool_index[boards] = pool
+        self.codes[boards] = self.pool_start[pool]
+        self.hidden_safe[boards] = self.pool_hidden[pool]
+
+    def step(self, actions):
+        '''
+        Applies one action per board. Returns (obs, rewards, done, won); boards that
+        are done have already been reset, so obs shows their new game.
+        '''
+
+        actions = np.asarray(actions)
+        boards = self.boards
+        flagging = actions >= self.cells
+        cell = np.where(flagging, actions - self.cells, actions)
+        codes = self.codes[boards, cell]
+        vals = self.pool_vals[self.pool_index, cell]
+        rewards = np.full(self.batch, REWARD_NOOP, dtype=np.float32)
+
+        # Flags only toggle hidden cells
+        toggle = flagging & ((codes == cell_state.HIDDEN) | (codes == cell_state.FLAG))
+        self.codes[boards[toggle], cell[toggle]] = np.where(
+            codes[toggle] == cell_state.HIDDEN, cell_state.FLAG, cell_state.HIDDEN)
+
+        # Reveals
+        revealing = ~flagging & (codes == cell_state.HIDDEN)
+        lost = revealing & (vals == MINE_VALUE)
+        opened = revealing & ~lost
+        self.codes[boards[opened], cell[opened]] = vals[opened]
+        self.hidden_safe[opened] -= 1
+        rewards[opened] = REWARD_REVEAL
+
+        empty = opened & (vals == 0)
+        if empty.any():
+            self._flood(boards[empty], cell[empty])
+
+        won = self.hidden_safe == 0
+        rewards[won] = REWARD_WIN
+        rewards[lost] = REWARD_LOSS
+        done = won | lost
+        finished = np.flatnonzero(done)
+        self.episodes += len(finished)
+        self.wins += int(won.sum())
+        self._reset(finished)
+        return self.obs, rewards, done, won
+
+    def _flood(self, boards, cell):
+        '''
+        Reveals the zero regions containing each board's cell and their borders.
+        Flagged cells are left alone and, like in the game, the fill doesn't
+        pass through them.
+        '''
+
+        count = len(boards)
+        shape = (count, self.rows, self.cols)
+        pool = self.pool_index[boards]
+        vals = self.pool_vals[pool]
+        codes = self.codes[boards]
+        labels = self.pool_labels[pool]
+        region = labels == labels[np.arange(count), cell][:, None]
+
+        # A flag inside the region can cut it, grow those few from the clicked cell instead
+        blocked = np.flatnonzero((region & (codes == cell_state.FLAG)).any(axis=1))
+        if len(blocked):
+            passable = ((vals[blocked] == 0) & (codes[blocked] != cell_state.FLAG)).reshape(-1, self.rows, self.cols)
+            reach = np.zeros(passable.shape, dtype=bool)
+            reach.reshape(len(blocked), -1)[np.arange(len(blocked)), cell[blocked]] = True
+            while True:
+                grown = neighborhood(reach, np.logical_or) & passable
+                if np.array_equal(grown, reach):
+                    break
+                reach = grown
+            region[blocked] = reach.reshape(len(blocked), -1)
+
+        region = neighborhood(region.reshape(shape), np.logical_or).reshape(count, self.cells)
+        new = region & (codes == cell_state.HIDDEN)
+        np.copyto(codes, vals, where=new)
+        self.codes[boards] = codes
+        self.hidden_safe[boards] -= new.sum(axis=1, dtype=np.int32)
@@ -0,0 +1,558 @@
+'''
+Module: Benchmarks
+Description: Headless performance benchmarks for the parts of the game that don't need a window.
+    Each benchmark is a function registered with @benchmark that returns (metric, value, unit)
+    rows. Run every benchmark, or only the named ones:
+
+        python benchmarks.py
+        python benchmarks.py batch_env --quick
+
+    --quick uses smaller sizes so the whole suite finishes in a few seconds.
+Inputs: Benchmark names
+Outputs: Table of results
+External Sources: None
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import argparse
+import random
+import time
+
+BENCHMARKS = {}
+
+
+def benchmark(function):
+    '''
+    Registers a benchmark under its function name
+    '''
+
+    BENCHMARKS[function.__name__] = function
+    return function
+
+
+def timed(function, *args):
+    '''
+    Returns (seconds, result) of one call
+    '''
+
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+@benchmark
+def board(quick):
+    '''
+    Baseline: one headless Board at a time, random reveals
+    '''
+
+    from board import Board, PLAYING
+
+    rng = random.Random(0)
+    steps = 20000 if quick else 200000
+
+    def play():
+        game = Board(16, 16, 40)
+        for _ in range(steps):
+            if game.status != PLAYING:
+                game = Board(16, 16, 40)
+            game.reveal(rng.randrange(16), rng.randrange(16))
+
+    seconds, _ = timed(play)
+    return [("random reveals, 16x16/40", steps / seconds, "steps/s")]
+
+
+@benchmark
+def batch_env(quick):
+    '''
+    BatchEnv with random reveals at several batch sizes
+    '''
+
+    import numpy as np
+    from batch_env import BatchEnv
+
+    rows = []
+    rng = np.random.default_rng(0)
+    for batch in ((256, 4096) if quick else (256, 4096, 16384)):
+        seconds, env = timed(BatchEnv, batch, 16, 16, 40, None, 0)
+        rows.append(("pool of %d boards" % (4 * batch), seconds * 1000, "ms"))
+
+        actions = [rng.integers(0, env.cells, batch) for _ in range(50)]
+        seconds, _ = timed(lambda: [env.step(action) for action in actions])
+        rows.append(("batch %d, 16x16/40" % batch, batch * len(actions) / seconds, "steps/s"))
+    return rows
+
+
+@benchmark
+def snapshots(quick):
+    '''
+    Copy-on-write snapshots of a big board: one snapshot per move of a few cells,
+    compared with copying the whole board each time
+    '''
+
+    import tracemalloc
+    from snapshots import CowCells
+
+    size = 300 if quick else 1000
+    moves = 1000 if quick else 5000
+    rng = random.Random(0)
+    cells = CowCells(bytes(size * size))
+    writes = [[rng.randrange(size * size) for _ in range(8)] for _ in range(moves)]
+
+    def play():
+        history = []
+        for move in writes:
+            history.append(cells.snapshot())
+            for index in move:
+                cells[index] = 1
+        return history
+
+    seconds, history = timed(play)
+
+    # Second run under tracemalloc (which slows it down) for the memory figure
+    cells = CowCells(bytes(size * size))
+    tracemalloc.start()
+    kept = play()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+
+    def restore_all():
+        for snap in reversed(history):
+            cells.restore(snap)
+
+    restore_seconds, _ = timed(restore_all)
+    plain = bytearray(size * size)
+    copy_seconds, _ = timed(lambda: [bytes(plain) for _ in range(200)])
+    return [
+        ("board %dx%d, chunk %d bytes" % (size, size, 1 << cells.bits), len(cells.chunks), "chunks"),
+        ("snapshot + 8 writes", moves / seconds, "moves/s"),
+        ("memory per snapshot", memory / moves, "bytes"),
+        ("restore", moves / restore_seconds, "restores/s"),
+        ("full copy (for comparison)", 200 / copy_seconds, "copies/s"),
+        ("full copy memory", size * size, "bytes"),
+    ]
+
+
+@benchmark
+def neighbors(quick):
+    '''
+    Building the neighbour tables of a big board, and what uses them:
+    numbering a board and one flood fill across it
+    '''
+
+    import BoardGenerator
+    from board import Board
+    from neighbors import NeighborTable, neighbor_table, TOPOLOGIES
+
+    size = 300 if quick else 1000
+    rows = []
+    for topology in TOPOLOGIES:
+        seconds, _ = timed(NeighborTable, size, size, topology)
+        rows.append(("%s table %dx%d" % (topology, size, size), seconds * 1000, "ms"))
+
+    neighbor_table(size, size)
+    random.seed(0)
+    grid = BoardGenerator.generate_bombs(size * size // 5, None, None, size, size)
+    seconds, _ = timed(BoardGenerator.generate_numbering, grid)
+    rows.append(("numbering, 20% mines", size * size / seconds, "cells/s"))
+
+    game = Board(size, size, size * size // 50)
+    game.start(0, 0)
+    seconds, changes = timed(game.reveal, 0, 0)
+    rows.append(("flood fill, 2% mines", len(changes) / seconds, "cells/s"))
+    return rows
+
+
+def board_snapshot(game):
+    '''
+    ai_player.BoardSnapshot of a headless Board
+    '''
+
+    import cell_state
+    from ai_player import BoardSnapshot
+    from board import MINE_VALUE
+
+    cols = game.cols
+    rows = range(game.rows)
+    vals = [["b" if value == MINE_VALUE else value for value in game.vals[y * cols:(y + 1) * cols]] for y in rows]
+    clicked = [[code < cell_state.HIDDEN for code in game.codes[y * cols:(y + 1) * cols]] for y in rows]
+    flags = [[code == cell_state.FLAG for code in game.codes[y * cols:(y + 1) * cols]] for y in rows]
+    return BoardSnapshot(vals, clicked, flags, game.mine_count)
+
+
+def play_ai_games(count, seed, cols=16, rows=16, mines=40, difficulty="hard", store=None):
+    '''
+    Lets the AI play count headless games. Returns the number of wins.
+    Each game is logged to store (a stats.StatsStore) if one is given.
+    '''
+
+    import ai_player
+    import cell_state
+    from board import Board, PLAYING, WIN
+
+    random.seed(seed)
+    rng = random.Random(seed)
+    wins = 0
+    for _ in range(count):
+        game = Board(cols, rows, mines, seed=rng.getrandbits(32))
+        start = time.perf_counter()
+        game.reveal(cols // 2, rows // 2)
+        clicks = 1
+        while game.status == PLAYING:
+            changes = []
+            for action, x, y in ai_player.choose_moves(board_snapshot(game), difficulty, rng=rng):
+                clicks += 1
+                if action == "flag":
+                    if game.code(x, y) == cell_state.HIDDEN:
+                        changes += game.toggle_flag(x, y)
+                else:
+                    changes += game.reveal(x, y)
+            if not changes:
+                break  # Stuck behind a wrong flag, counts as a loss
+        wins += game.status == WIN
+        if store is not None:
+            store.record(cols, rows, game.mine_count, game.seed, time.perf_counter() - start, clicks,
+                         "win" if game.status == WIN else "loss", difficulty, "selfplay", (cols // 2, rows // 2))
+    return wins
+
+
+@benchmark
+def solver_cache(quick):
+    '''
+    The AI's frontier solver with a cold cache, then the same games again warm
+    '''
+
+    import frontier
+
+    games = 20 if quick else 100
+    rows = []
+    cache = frontier.solver_cache
+    for label in ("cold", "warm"):
+        cache.hits = cache.misses = 0
+        cache.solve_time = cache.time_saved = 0.0
+        seconds, wins = timed(play_ai_games, games, 1)
+        lookups = cache.hits + cache.misses
+        rows.append(("%s: %d games, %d wins" % (label, games, wins), seconds * 1000, "ms"))
+        rows.append(("%s: hit rate of %d lookups" % (label, lookups), 100.0 * cache.hits / max(1, lookups), "%"))
+        rows.append(("%s: solving / saved" % label, cache.solve_time * 1000, "ms solving"))
+        rows.append(("", cache.time_saved * 1000, "ms saved"))
+    return rows
+
+
+def wide_snapshot(size, seed):
+    '''
+    BoardSnapshot of a big, mostly solved board with many small holes left,
+    which gives a wide frontier of independent components
+    '''
+
+    from ai_player import BoardSnapshot
+    from board import Board, MINE_VALUE
+
+    rng = random.Random(seed)
+    random.seed(seed)
+    game = Board(size, size, size * size // 5)
+    game.start(0, 0)
+    hidden = set()
+    for _ in range(size * size // 60):
+        x, y = rng.randrange(size - 3), rng.randrange(size - 3)
+        hidden.update((x + dx, y + dy) for dx in range(rng.randint(2, 4)) for dy in range(rng.randint(2, 3)))
+
+    vals = [["b" if game.vals[y * size + x] == MINE_VALUE else game.vals[y * size + x] for x in range(size)]
+            for y in range(size)]
+    clicked = [[(x, y) not in hidden and vals[y][x] != "b" for x in range(size)] for y in range(size)]
+    flags = [[(x, y) not in hidden and vals[y][x] == "b" for x in range(size)] for y in range(size)]
+    return BoardSnapshot(vals, clicked, flags, game.mine_count)
+
+
+@benchmark
+def parallel_solver(quick):
+    '''
+    One solver turn on a wide frontier, in this process and on worker pools
+    of different sizes (each with a fresh cache)
+    '''
+
+    import os
+    import frontier
+    from parallel_solver import ParallelSolver
+
+    size = 150 if quick else 400
+    snap = wide_snapshot(size, 1)
+    seconds, serial = timed(frontier.solve, snap, lambda: False, frontier.SolverCache())
+    groups = len(frontier.constraint_groups(frontier.visible_codes(snap), size, size))
+    rows = [("board %dx%d, %d components" % (size, size, groups), seconds * 1000, "ms serial")]
+    for workers in (1, 2, 4):
+        solver = ParallelSolver()
+        solver.start(workers)
+        try:
+            seconds, result = timed(solver.solve, snap, lambda: False, frontier.SolverCache())
+        finally:
+            solver.close()
+        if result != serial:
+            raise AssertionError("parallel solve differs from serial")
+        rows.append(("%d workers (%d cores)" % (workers, os.cpu_count() or 1), seconds * 1000, "ms"))
+    return rows
+
+
+@benchmark
+def stats(quick):
+    '''
+    Statistics store: cost of record() in the game loop, bulk inserts of
+    simulated games, and the leaderboard and per-difficulty queries
+    '''
+
+    import os
+    import tempfile
+    from stats import StatsStore, game_row
+
+    count = 200000 if quick else 1000000
+    rng = random.Random(0)
+    rows = [game_row(16, 16, 40, rng.getrandbits(32), rng.uniform(5, 300), rng.randrange(30, 300),
+                     rng.choice(("win", "loss")), rng.choice((None, "easy", "medium", "hard")), "selfplay")
+            for _ in range(count)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = StatsStore()
+        store.open(os.path.join(directory, "stats.db"))
+        record_seconds, _ = timed(lambda: [store.record(16, 16, 40, 1, 60.0, 100, "win") for _ in range(10000)])
+        store.flush()
+
+        def bulk():
+            for start in range(0, count, 10000):
+                store.record_many(rows[start:start + 10000])
+            store.flush()
+
+        bulk_seconds, _ = timed(bulk)
+        leaderboard_seconds, _ = timed(store.leaderboard, 16, 16, 40)
+        totals_seconds, _ = timed(store.by_difficulty)
+        selfplay_seconds, _ = timed(play_ai_games, 10, 1, 16, 16, 40, "hard", store)
+        store.close()
+    return [
+        ("record() in the game loop", record_seconds / 10000 * 1e6, "us"),
+        ("bulk insert of %d games" % count, count / bulk_seconds, "rows/s"),
+        ("leaderboard (top 10 wins on 16x16/40)", leaderboard_seconds * 1000, "ms"),
+        ("totals per difficulty", totals_seconds * 1000, "ms"),
+        ("10 self-play games, logged", selfplay_seconds * 1000, "ms"),
+    ]
+
+
+def midgame(cols, rows, mines, opens, seed):
+    '''
+    Headless Board part way through a game: the opening plus opens random safe reveals
+    '''
+
+    from board import Board, MINE_VALUE
+
+    random.seed(seed)
+    rng = random.Random(seed)
+    game = Board(cols, rows, mines)
+    game.reveal(cols // 2, rows // 2)
+    safe = [index for index, value in enumerate(game.vals) if value != MINE_VALUE]
+    for index in rng.sample(safe, opens):
+        game.reveal(index % cols, index // cols)
+    return game
+
+
+@benchmark
+def deduction(quick):
+    '''
+    Forced cells found and time per position: the one-number rules the medium AI
+    uses, enumeration (frontier solver) and linear deduction, from scratch and
+    updated after one more reveal
+    '''
+
+    import ai_player
+    import frontier
+    from board import PLAYING
+    from deduction import Deducer, deduce
+
+    def pattern(snap):
+        forced = set()
+        for x, y in ai_player.clicked_number_cells(snap):
+            hidden, flagged = ai_player.neighbor_counts(snap, x, y)
+            if hidden and snap.vals[y][x] in (flagged, len(hidden) + flagged):
+                forced.update(hidden)
+        return forced
+
+    def enumeration(snap):
+        probabilities = frontier.solve(snap, cache=frontier.SolverCache())
+        return [cell for cell, p in probabilities.items() if p in (0.0, 1.0)]
+
+    rows = []
+    sizes = [(30, 16, 99, 6, 40 if quick else 200), (200, 200, 8000, 400, 2 if quick else 10)]
+    for cols, board_rows, mines, opens, count in sizes:
+        games = [midgame(cols, board_rows, mines, opens, seed) for seed in range(count)]
+        games = [game for game in games if game.status == PLAYING]
+        label = "%dx%d/%d" % (cols, board_rows, mines)
+        for name, method in (("one-number rules", pattern), ("enumeration", enumeration),
+                             ("linear deduction", lambda snap: deduce(snap, deducer=Deducer()))):
+            found = 0
+            seconds = 0.0
+            for game in games:
+                snap = board_snapshot(game)
+                elapsed, forced = timed(method, snap)
+                seconds += elapsed
+                found += len(forced)
+            rows.append(("%s %s: cells per position" % (label, name), found / len(games), "forced"))
+            rows.append(("", seconds * 1000 / len(games), "ms"))
+
+        # The next turn after one more reveal, rows kept from the last one
+        seconds = 0.0
+        for game in games:
+            deducer = Deducer()
+            known = deduce(board_snapshot(game), deducer=deducer)
+            safe = [cell for cell, mine in known.items() if not mine] or [(cols // 2, board_rows // 2)]
+            game.reveal(*safe[0])
+            snap = board_snapshot(game)
+            seconds += timed(deduce, snap, lambda: False, deducer)[0]
+        rows.append(("%s incremental update" % label, seconds * 1000 / len(games), "ms"))
+    return rows
+
+
+@benchmark
+def endless(quick):
+    '''
+    Endless board: startup, the first reveal, chunk numbering, drawing a
+    window's codes, and memory while the camera sweeps far away
+    '''
+
+    from endless import EndlessBoard, CHUNK
+
+    startup, game = timed(EndlessBoard, 1)
+    first, changes = timed(game.reveal, 0, 0)
+    window, _ = timed(game.codes_in, -15, -10, 15, 10)
+
+    count = 200 if quick else 1000
+    fresh = EndlessBoard(2)
+    numbering, _ = timed(lambda: [fresh.chunk(cx, 0) for cx in range(count)])
+
+    # A 30x20 window walking one cell per step, always onto new ground
+    steps = 2000 if quick else 20000
+    walker = EndlessBoard(3)
+
+    def sweep():
+        for step in range(steps):
+            walker.codes_in(step, step // 4, step + 30, step // 4 + 20)
+
+    sweep_seconds, _ = timed(sweep)
+    loaded, _, layers = walker.memory()
+    kib = (loaded * 2 * CHUNK * CHUNK + layers * walker.mines_per_chunk * 2) / 1024
+    return [
+        ("new board", startup * 1e6, "us"),
+        ("first reveal (%d cells)" % len(changes), first * 1000, "ms"),
+        ("30x20 window of codes", window * 1e6, "us"),
+        ("chunks numbered", count / numbering, "chunks/s"),
+        ("%d step camera sweep" % steps, sweep_seconds * 1000 / steps, "ms/step"),
+        ("chunks loaded after the sweep", loaded, "chunks"),
+        ("chunks evicted", walker.evictions, "chunks"),
+        ("cell and mine data kept", kib, "KiB"),
+    ]
+
+
+@benchmark
+def analytics(quick):
+    '''
+    Board analytics on Expert boards (30x16/99): pool generation, 3BV and zero
+    regions, the guess count, and the classic generator for comparison
+    '''
+
+    import numpy as np
+    import cell_state
+    from analytics import analyze, classic_boards, count_guesses, region_metrics
+    from batch_env import generate_pool
+
+    size = 1024 if quick else 4096
+    shape = (size, 16, 30)
+    generate_seconds, (vals, labels, start_codes, _) = timed(generate_pool, size, 30, 16, 99, np.random.default_rng(0))
+    vals, labels, opened = vals.reshape(shape), labels.reshape(shape), start_codes.reshape(shape) != cell_state.HIDDEN
+    region_seconds, _ = timed(region_metrics, vals, labels)
+    guess_seconds, _ = timed(count_guesses, vals, labels, opened)
+
+    classic = 200 if quick else 1000
+
+    def classic_run():
+        boards, start = classic_boards(classic, 30, 16, 99, random.Random(0))
+        return analyze(boards, start=start)
+
+    classic_seconds, _ = timed(classic_run)
+    return [
+        ("pool generation + labelling", size / generate_seconds, "boards/s"),
+        ("3bv, zero regions, isolated numbers", size / region_seconds, "boards/s"),
+        ("guess count", size / guess_seconds, "boards/s"),
+        ("all metrics, pool boards", size / (generate_seconds + region_seconds + guess_seconds), "boards/s"),
+        ("all metrics, BoardGenerator boards", classic / classic_seconds, "boards/s"),
+    ]
+
+
+@benchmark
+def sparse_board(quick):
+    '''
+    Dense Board against SparseBoard on big boards with few mines: board data
+    held after the first reveal (which opens most of a board this sparse),
+    time to the first reveal and random moves until a mine is hit. Then a
+    400 million cell board, sparse only: placing its mines and what that holds.
+    '''
+
+    import sys
+    from board import Board, PLAYING
+    from sparse_board import SparseBoard
+
+    sizes = [(500, 500, 2500), (1000, 1000, 10000)] if quick else [(1000, 1000, 10000), (2000, 2000, 40000)]
+    moves = 2000 if quick else 20000
+    rows = []
+    for cols, board_rows, mines in sizes:
+        for kind in (Board, SparseBoard):
+            rng = random.Random(0)
+            game = kind(cols, board_rows, mines, seed=1)
+            first = timed(game.reveal, cols // 2, board_rows // 2)[0]
+            if kind is Board:
+                held = sys.getsizeof(game.vals) + sys.getsizeof(game.codes)
+            else:
+                held = game.memory()
+
+            def play():
+                for done in range(moves):
+                    if game.status != PLAYING:
+                        return done
+                    x, y = rng.randrange(cols), rng.randrange(board_rows)
+                    if rng.random() < 0.2:
+                        game.toggle_flag(x, y)
+                    else:
+                        game.reveal(x, y)
+                return moves
+
+            seconds, played = timed(play)
+            label = "%s %dx%d/%d" % (kind.__name__, cols, board_rows, mines)
+            rows.append((label + ": data held", held / 1024, "KiB"))
+            rows.append(("", first * 1000, "ms first reveal"))
+            rows.append(("", played / seconds, "moves/s"))
+
+    giant = SparseBoard(20000, 20000, 400000, seed=1)
+    seconds = timed(giant.start, 10000, 10000)[0]
+    rows.append(("SparseBoard 20000x20000/400000: mines", seconds * 1000, "ms"))
+    rows.append(("", giant.memory() / 1024, "KiB held"))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Minesweeper benchmarks")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default all): " + ", ".join(BENCHMARKS))
+    parser.add_argument("--quick", action="store_true", help="smaller sizes")
+    args = parser.parse_args(argv)
+
+    for name in args.names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            parser.error("unknown benchmark %s" % name)
+        try:
+            rows = BENCHMARKS[name](args.quick)
+        except ImportError as error:
+            print("%s: skipped (%s)" % (name, error))
+            continue
+        print(name)
+        for metric, value, unit in rows:
+            print("  %-40s %14.1f %s" % (metric, value, unit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+'''
+Module: Headless board
+Description: Minesweeper rules without any Pygame objects, for servers, simulations and tools that
+    run many games at once. A Board keeps two flat bytearrays (index = y * cols + x): the hidden
+    values (0-8, or MINE_VALUE) and the cell_state code each player can see. Mines are placed with
+    BoardGenerator on the first reveal so the first click is always safe, which also means a game
+    nobody has clicked yet costs only a few hundred bytes. reveal() and toggle_flag() return the
+    list of (x, y, code) cells they changed so callers can send deltas instead of whole boards.
+    new_board() hands out a sparse_board.SparseBoard instead for big boards with few mines.
+Inputs: Board size, mine count, reveal/flag coordinates
+Outputs: Changed cells, game status
+External Sources: None
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import random
+from collections import deque
+
+import BoardGenerator
+import cell_state
+from neighbors import neighbor_table
+
+# Hidden value stored for a mine
+MINE_VALUE = 9
+
+# Game status values
+PLAYING = "playing"
+WIN = "win"
+LOSS = "loss"
+
+# new_board() uses a SparseBoard from this many cells up...
+SPARSE_MIN_CELLS = 250000
+
+# ...when at most this share of the cells are mines
+SPARSE_MAX_DENSITY = 0.05
+
+
+class Board:
+    __slots__ = ("cols", "rows", "topology", "seed", "mine_count", "vals", "codes", "status", "hidden_safe", "flags")
+
+    def __init__(self, cols, rows, mine_count, topology="square", seed=None):
+        '''
+        Creates an unstarted board, mines are placed by the first reveal.
+        topology is one of neighbors.TOPOLOGIES. The same seed and first
+        click give the same board.
+        '''
+
+        self.cols = cols
+        self.rows = rows
+        self.topology = topology
+        self.seed = seed
+        self.mine_count = min(mine_count, cols * rows - 9)
+        self.vals = None
+        self.codes = bytearray([cell_state.HIDDEN]) * (cols * rows)
+        self.status = PLAYING
+        self.hidden_safe = cols * rows - self.mine_count
+        self.flags = 0
+
+    @property
+    def started(self):
+        return self.vals is not None
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    def code(self, x, y):
+        '''
+        What a player sees at (x, y)
+        '''
+
+        return self.codes[y * self.cols + x]
+
+    def start(self, safe_x, safe_y):
+        '''
+        Places the mines, keeping the 3x3 area around (safe_x, safe_y) clear
+        '''
+
+        rng = random if self.seed is None else random.Random(self.seed)
+        raw_grid = BoardGenerator.generate_bombs(self.mine_count, safe_y, safe_x, self.cols, self.rows, self.topology, rng)
+        raw_grid = BoardGenerator.generate_numbering(raw_grid, self.topology)
+        self.vals = bytearray(MINE_VALUE if val == 'b' else val for row in raw_grid for val in row)
+
+    def reveal(self, x, y):
+        '''
+        Reveals (x, y), flood filling from empty cells.
+        Returns the list of (x, y, code) cells that changed.
+        '''
+
+        if self.status != PLAYING or not self.in_bounds(x, y):
+            return []
+        if not self.started:
+            self.start(x, y)
+
+        cols = self.cols
+        index = y * cols + x
+        if self.codes[index] != cell_state.HIDDEN:
+            return []  # Already revealed or flagged
+
+        if self.vals[index] == MINE_VALUE:
+            return self._lose(index)
+
+        changes = []
+        self._open(index, changes)
+        if self.vals[index] == 0:
+            self._flood(index, changes)
+
+        if self.hidden_safe == 0:
+            self.status = WIN
+        return changes
+
+    def _open(self, index, changes):
+        value = self.vals[index]
+        self.codes[index] = value
+        self.hidden_safe -= 1
+        changes.append((index % self.cols, index // self.cols, value))
+
+    def _flood(self, start, changes):
+        '''
+        Reveals everything connected to the empty cell at start
+        '''
+
+        table = neighbor_table(self.cols, self.rows, self.topology)
+        offsets, indexes = table.offsets, table.indexes
+        codes, vals = self.codes, self.vals
+        queue = deque([start])
+        while queue:
+            index = queue.popleft()
+            for neighbor in indexes[offsets[index]:offsets[index + 1]]:
+                if codes[neighbor] == cell_state.HIDDEN:
+                    self._open(neighbor, changes)
+                    if vals[neighbor] == 0:
+                        queue.append(neighbor)
+
+    def _lose(self, clicked):
+        '''
+        Ends the game, shows every mine and marks wrong flags
+        '''
+
+        self.status = LOSS
+        changes = []
+        for index, value in enumerate(self.vals):
+            flagged = self.codes[index] == cell_state.FLAG
+            if value == MINE_VALUE and not flagged:
+                code = cell_state.MINE_CLICKED if index == clicked else cell_state.MINE
+            elif value != MINE_VALUE and flagged:
+                code = cell_state.MINE_FALSE
+            else:
+                continue
+            self.codes[index] = code
+            changes.append((index % self.cols, index // self.cols, code))
+        return changes
+
+    def toggle_flag(self, x, y):
+        '''
+        Flags or unflags a hidden cell. Returns the changed cells.
+        '''
+
+        if self.status != PLAYING or not self.in_bounds(x, y):
+            return []
+        index = y * self.cols + x
+        code = self.codes[index]
+        if code == cell_state.HIDDEN:
+            self.codes[index] = cell_state.FLAG
+            self.flags += 1
+        elif code == cell_state.FLAG:
+            self.codes[index] = cell_state.HIDDEN
+            self.flags -= 1
+        else:
+            return []
+        return [(x, y, self.codes[index])]
+
+    def text(self):
+        '''
+        Visible board as one character per cell (row-major), see cell_state.CODE_CHARS
+        '''
+
+        return self.codes.decode("latin-1").translate(_CODE_TO_CHAR)
+
+
+def new_board(cols, rows, mine_count, topology="square", seed=None):
+    '''
+    A Board, or a sparse_board.SparseBoard (same interface) for big square boards with few mines
+    '''
+
+    cells = cols * rows
+    if topology == "square" and cells >= SPARSE_MIN_CELLS and mine_count <= cells * SPARSE_MAX_DENSITY:
+        from sparse_board import SparseBoard
+        return SparseBoard(cols, rows, mine_count, topology, seed)
+    return Board(cols, rows, mine_count, topology, seed)
+
+
+# Translation table from code bytes to CODE_CHARS
+_CODE_TO_CHAR = {code: char for code, char in enumerate(cell_state.CODE_CHARS)}
@@ -0,0 +1,41 @@
+'''
+Module: Cell state codes
+Description: Compact integer codes describing what a player can see in one cell. Codes 0-8 are
+    revealed numbers (0 = revealed empty cell), the rest cover hidden, flagged and mine states.
+    Renderers that work on whole arrays of cells (like the minimap) use these codes instead of
+    looking at Grid objects one by one.
+Inputs: Cell fields (val, clicked, flag, mineClicked, mineFalse)
+Outputs: Integer state code
+External Sources: None
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+# Codes 0-8 are revealed cells showing that number
+HIDDEN = 9
+FLAG = 10
+MINE = 11           # Revealed mine (game over)
+MINE_CLICKED = 12   # The mine that was clicked
+MINE_FALSE = 13     # Wrongly flagged mine
+
+# Number of distinct codes, useful for sizing lookup tables
+NUM_CODES = 14
+
+# One printable character per code, for text protocols and debug printing
+CODE_CHARS = "012345678.F*X!"
+
+
+def state_code(val, clicked, flag, mineClicked=False, mineFalse=False):
+    '''
+    Returns the state code for a cell with the given fields
+    '''
+
+    if mineFalse:
+        return MINE_FALSE
+    if clicked:
+        if val == "b":
+            return MINE_CLICKED if mineClicked else MINE
+        return val
+    if flag:
+        return FLAG
+    return HIDDEN
@@ -0,0 +1,286 @@
+'''
+Module: Linear deduction
+Description: Finds forced mines and safe cells by combining the frontier numbers, which catches what
+    the one-number rules in ai_player miss (e.g. a 1 whose cells are a subset of a 2's) and, unlike
+    the frontier solver's enumeration, works on components of any size. Every revealed number with
+    hidden neighbours is a row of a sparse 0/1 matrix: the sum of its hidden cells (0 or 1 each) is
+    the mines it still needs. Each independent component is reduced to row echelon form with exact
+    integer (fraction-free) Gaussian elimination, then every row, original and reduced, gets bounds
+    reasoning: if a cell's value makes the row's total unreachable, the cell must take the other
+    value. Forced cells are substituted back and the component reduced again until nothing new
+    comes out.
+
+    A Deducer keeps the rows between AI turns. Each turn it finds the cells that changed since the
+    last board (chunk by chunk, so unchanged stretches of a big board are skipped at C speed),
+    rebuilds only the rows of the numbers around them and reduces only the components those rows
+    belong to; what the untouched components gave last time is kept. Rebuilt rows stay pending
+    until their component has been reduced, so a turn cut short by its time budget leaves the
+    rest for the next one.
+Inputs: BoardSnapshot
+Outputs: {(x, y): 1 for a mine, 0 for a safe cell}
+External Sources: Gaussian elimination - https://en.wikipedia.org/wiki/Gaussian_elimination
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+from math import gcd
+
+import cell_state
+import frontier
+from neighbors import neighbor_table
+
+# Bytes compared at once when looking for changed cells
+DIFF_CHUNK = 4096
+
+
+def changed_cells(old, new):
+    '''
+    Indexes where two equally long code arrays differ
+    '''
+
+    changed = []
+    for start in range(0, len(new), DIFF_CHUNK):
+        end = start + DIFF_CHUNK
+        if old[start:end] != new[start:end]:
+            changed.extend(index for index in range(start, min(end, len(new))) if old[index] != new[index])
+    return changed
+
+
+def _eliminate(row, pivot_row, column):
+    '''
+    row minus a multiple of pivot_row that clears column, kept in lowest integer terms.
+    Rows are (coefficients {cell: int}, total).
+    '''
+
+    coefficients, total = row
+    pivot_coefficients, pivot_total = pivot_row
+    a, b = pivot_coefficients[column], coefficients[column]
+    result = {cell: a * value for cell, value in coefficients.items()}
+    for cell, value in pivot_coefficients.items():
+        result[cell] = result.get(cell, 0) - b * value
+        if not result[cell]:
+            del result[cell]
+    total = a * total - b * pivot_total
+
+    divisor = abs(total)
+    for value in result.values():
+        divisor = gcd(divisor, value)
+    if divisor > 1:
+        result = {cell: value // divisor for cell, value in result.items()}
+        total //= divisor
+    return result, total
+
+
+def row_echelon(rows):
+    '''
+    Reduced row echelon form of rows, as a list of rows. Returns None if the
+    rows contradict each other (0 = non-zero).
+    '''
+
+    pivots = {}     # pivot cell -> row
+    holders = {}    # cell -> pivot cells of the rows that contain it
+    for row in rows:
+        for column in [cell for cell in row[0] if cell in pivots]:
+            if column in row[0]:
+                row = _eliminate(row, pivots[column], column)
+        if not row[0]:
+            if row[1]:
+                return None
+            continue
+
+        column = next(iter(row[0]))
+        # Clear the new pivot's cell from the rows already reduced
+        for other in list(holders.get(column, ())):
+            old = pivots[other]
+            new = _eliminate(old, row, column)
+            for cell in old[0]:
+                holders[cell].discard(other)
+            for cell in new[0]:
+                holders.setdefault(cell, set()).add(other)
+            pivots[other] = new
+        pivots[column] = row
+        for cell in row[0]:
+            holders.setdefault(cell, set()).add(column)
+    return list(pivots.values())
+
+
+def bounds(row, forced):
+    '''
+    Adds the cells the row forces to forced ({cell: 0 or 1}). Returns False if
+    no assignment of 0s and 1s can reach the row's total.
+    '''
+
+    coefficients, total = row
+    low = sum(value for value in coefficients.values() if value < 0)
+    high = sum(value for value in coefficients.values() if value > 0)
+    if not low <= total <= high:
+        return False
+    largest = max(abs(value) for value in coefficients.values())
+    if low + largest <= total <= high - largest:
+        return True  # Every cell can still go either way
+    for cell, value in coefficients.items():
+        # Range of the other cells' sum
+        rest_low = low - min(value, 0)
+        rest_high = high - max(value, 0)
+        can_be_0 = rest_low <= total <= rest_high
+        can_be_1 = rest_low <= total - value <= rest_high
+        if can_be_0 != can_be_1:
+            forced[cell] = 1 if can_be_1 else 0
+    return True
+
+
+def reduce_component(constraints):
+    '''
+    Forced cells of one component given as [(hidden cells, mines needed)].
+    Returns {cell: 0 or 1}, or {} if the numbers contradict each other
+    (a wrong flag).
+    '''
+
+    rows = [({cell: 1 for cell in cells}, total) for cells, total in constraints]
+    known = {}
+    while True:
+        forced = {}
+        reduced = row_echelon(rows)
+        if reduced is None:
+            return {}
+        for row in rows + reduced:
+            if not bounds(row, forced):
+                return {}
+        forced = {cell: value for cell, value in forced.items() if cell not in known}
+        if not forced:
+            return known
+        known.update(forced)
+
+        # Substitute the forced cells and go again on what's left
+        substituted = []
+        for coefficients, total in rows:
+            total -= sum(value * forced[cell] for cell, value in coefficients.items() if cell in forced)
+            coefficients = {cell: value for cell, value in coefficients.items() if cell not in forced}
+            if coefficients:
+                substituted.append((coefficients, total))
+            elif total:
+                return {}
+        rows = substituted
+
+
+class Deducer:
+    def __init__(self):
+        '''
+        Nothing is known until the first update()
+        '''
+
+        self.reset()
+
+    def reset(self):
+        self.cols = self.rows = 0
+        self.codes = None
+        self.constraints = {}   # number index -> (mines needed, hidden neighbour indexes)
+        self.touching = {}      # hidden index -> number indexes around it
+        self.known = {}         # hidden index -> 1 mine / 0 safe, from earlier turns
+        self.pending = set()    # number indexes whose component hasn't been reduced since their row changed
+        self.rows_updated = 0
+        self.components_reduced = 0
+
+    def _set_row(self, index, constraint):
+        old = self.constraints.pop(index, None)
+        if old is not None:
+            for cell in old[1]:
+                numbers = self.touching[cell]
+                numbers.discard(index)
+                if not numbers:
+                    del self.touching[cell]
+        if constraint is not None:
+            self.constraints[index] = constraint
+            for cell in constraint[1]:
+                self.touching.setdefault(cell, set()).add(index)
+
+    def update(self, codes, cols, rows):
+        '''
+        Brings the rows up to date with codes (see frontier.visible_codes).
+        Returns the number indexes whose rows were rebuilt.
+        '''
+
+        table = neighbor_table(cols, rows)
+        if self.codes is None or (cols, rows) != (self.cols, self.rows):
+            self.reset()
+            self.cols, self.rows = cols, rows
+            affected = range(cols * rows)
+        else:
+            changed = changed_cells(self.codes, codes)
+            if any(codes[index] == cell_state.HIDDEN for index in changed):
+                # A new game, an undo or a removed flag: what was deduced may no longer hold
+                self.reset()
+                self.cols, self.rows = cols, rows
+                affected = range(cols * rows)
+            else:
+                affected = set(changed)
+                for index in changed:
+                    affected.update(table.of(index))
+                    self.known.pop(index, None)
+
+        dirty = []
+        for index in affected:
+            constraint = frontier.number_constraint(codes, table, index)
+            if constraint is not None or index in self.constraints:
+                if self.constraints.get(index) != constraint:
+                    self._set_row(index, constraint)
+                    if constraint is not None:
+                        dirty.append(index)
+        self.codes = bytes(codes)
+        self.rows_updated += len(dirty)
+        return dirty
+
+    def component(self, start, seen):
+        '''
+        The number indexes of the component containing the number at start
+        '''
+
+        group = [start]
+        seen.add(start)
+        for index in group:
+            for cell in self.constraints[index][1]:
+                for other in self.touching[cell]:
+                    if other not in seen:
+                        seen.add(other)
+                        group.append(other)
+        return group
+
+    def deduce(self, codes, cols, rows, should_stop=lambda: False):
+        '''
+        Updates the rows and reduces the components that changed.
+        Returns {cell index: 1 mine / 0 safe} for every hidden cell known so far.
+        '''
+
+        dirty = self.update(codes, cols, rows)  # May reset, and with it self.pending
+        left_over = list(self.pending.difference(dirty))
+        self.pending.update(dirty)
+        seen = set()
+        for start in dirty + left_over:
+            if start in seen:
+                continue
+            if start not in self.constraints:
+                self.pending.discard(start)  # No longer a number with hidden neighbours
+                continue
+            if should_stop():
+                break
+            group = self.component(start, seen)
+            self.components_reduced += 1
+            self.known.update(reduce_component([(self.constraints[index][1], self.constraints[index][0])
+                                                for index in group]))
+            self.pending.difference_update(group)
+        return self.known
+
+
+def deduce(snap, should_stop=lambda: False, deducer=None):
+    '''
+    Returns {(x, y): 1 for a mine, 0 for a safe cell} for the snapshot's frontier
+    '''
+
+    deducer = deducer or default_deducer
+    cols = snap.cols
+    known = deducer.deduce(frontier.visible_codes(snap), cols, snap.rows, should_stop)
+    return {(index % cols, index // cols): value for index, value in known.items()}
+
+
+# Shared by the whole process (the AI worker thread uses it)
+default_deducer = Deducer()
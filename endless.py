@@ -0,0 +1,295 @@
+'''
+Module: Endless board
+Description: A board with no edges. The plane is cut into CHUNK x CHUNK chunks, and the mines of a
+    chunk are a pure function of (seed, chunk coordinates): a blake2b hash of the three seeds
+    the random.Random that places the chunk's share of the mines. Nothing exists until something asks
+    for it, so creating a board is constant time. A chunk's values (numbers) are worked out the
+    first time the viewport, a flood fill or the solver reads one of its cells; numbering a chunk
+    only needs the mine layouts of the 8 chunks around it, which are cheap and kept in their own
+    small LRU. Chunks the player has never opened a cell in can always be made again, so once
+    there are more than MAX_IDLE_CHUNKS of them the least recently used are dropped, and memory
+    grows with the explored area only.
+
+    EndlessBoard works like board.Board (reveal() and toggle_flag() return the changed
+    (x, y, code) cells) with any integer coordinates, negative ones included. The first click
+    should be at (0, 0): the cells around it never hold mines. There is no win, the score is the
+    number of revealed cells; hitting a mine ends the game and shows the mines of the loaded chunks.
+Inputs: Seed, mine density, reveal/flag coordinates
+Outputs: Changed cells, visible codes of any area, AI snapshots of a window
+External Sources: hashlib.blake2b - https://docs.python.org/3/library/hashlib.html#blake2
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import hashlib
+import random
+from array import array
+from collections import OrderedDict, deque
+
+import cell_state
+from board import MINE_VALUE, PLAYING, LOSS
+from neighbors import SQUARE_OFFSETS
+
+# Chunks are 2 ** CHUNK_BITS cells wide and tall
+CHUNK_BITS = 5
+CHUNK = 1 << CHUNK_BITS
+CHUNK_MASK = CHUNK - 1
+
+# Default share of cells that are mines
+DEFAULT_DENSITY = 0.16
+
+# Below this density the empty regions stop being finite (a first click could open forever)
+MIN_DENSITY = 0.12
+
+# Never-opened chunks kept before the least recently used are dropped
+MAX_IDLE_CHUNKS = 256
+
+# Chunk mine layouts kept for numbering neighbours
+MINE_CACHE_SIZE = 1024
+
+
+def chunk_seed(seed, cx, cy):
+    '''
+    Seed of the chunk at (cx, cy), stable across runs and platforms
+    '''
+
+    digest = hashlib.blake2b(b"%d:%d:%d" % (seed, cx, cy), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class Chunk:
+    __slots__ = ("vals", "codes", "opened")
+
+    def __init__(self, vals):
+        self.vals = vals
+        self.codes = bytearray([cell_state.HIDDEN]) * (CHUNK * CHUNK)
+        self.opened = 0     # Cells that aren't hidden any more (revealed or flagged)
+
+
+class EndlessBoard:
+    def __init__(self, seed=None, density=DEFAULT_DENSITY):
+        '''
+        Creates the board, nothing is generated yet
+        '''
+
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.density = max(MIN_DENSITY, min(density, 0.9))
+        self.mines_per_chunk = round(self.density * CHUNK * CHUNK)
+        self.chunks = {}                # (cx, cy) -> Chunk
+        self.idle = OrderedDict()       # Loaded chunks nobody has opened a cell in, least recently used first
+        self.mine_layers = OrderedDict()
+        self.status = PLAYING
+        self.revealed = 0
+        self.flags = 0
+        self.chunks_generated = 0
+        self.evictions = 0
+
+    # Generation
+
+    def mine_layer(self, cx, cy):
+        '''
+        The mine offsets (local y * CHUNK + x) of a chunk, as a compact array
+        '''
+
+        key = (cx, cy)
+        layer = self.mine_layers.get(key)
+        if layer is not None:
+            self.mine_layers.move_to_end(key)
+            return layer
+
+        rng = random.Random(chunk_seed(self.seed, cx, cy))
+        layer = set(rng.sample(range(CHUNK * CHUNK), self.mines_per_chunk))
+        # The cells around (0, 0) are kept clear for the first click
+        for dx, dy in SQUARE_OFFSETS + [(0, 0)]:
+            if (dx >> CHUNK_BITS, dy >> CHUNK_BITS) == key:
+                layer.discard((dy & CHUNK_MASK) * CHUNK + (dx & CHUNK_MASK))
+
+        layer = self.mine_layers[key] = array("H", layer)
+        if len(self.mine_layers) > MINE_CACHE_SIZE:
+            self.mine_layers.popitem(last=False)
+        return layer
+
+    def _number(self, cx, cy):
+        '''
+        Values of a chunk: MINE_VALUE for mines, otherwise the mines around the cell,
+        counting the mines of neighbouring chunks along the edges
+        '''
+
+        # Mines of the chunk plus a one cell border, in a (CHUNK + 2) wide grid
+        width = CHUNK + 2
+        mines = bytearray(width * width)
+        for ny in (-1, 0, 1):
+            for nx in (-1, 0, 1):
+                for offset in self.mine_layer(cx + nx, cy + ny):
+                    x = nx * CHUNK + (offset & CHUNK_MASK) + 1
+                    y = ny * CHUNK + (offset >> CHUNK_BITS) + 1
+                    if 0 <= x < width and 0 <= y < width:
+                        mines[y * width + x] = 1
+
+        deltas = [dy * width + dx for dx, dy in SQUARE_OFFSETS]
+        vals = bytearray(CHUNK * CHUNK)
+        index = 0
+        for y in range(1, CHUNK + 1):
+            for x in range(1, CHUNK + 1):
+                cell = y * width + x
+                vals[index] = MINE_VALUE if mines[cell] else sum(mines[cell + delta] for delta in deltas)
+                index += 1
+        return vals
+
+    def chunk(self, cx, cy):
+        '''
+        The chunk at (cx, cy), generated on first use
+        '''
+
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = Chunk(self._number(cx, cy))
+            self.chunks_generated += 1
+            self.idle[key] = None
+            if len(self.idle) > MAX_IDLE_CHUNKS:
+                self.chunks.pop(self.idle.popitem(last=False)[0])
+                self.evictions += 1
+        elif key in self.idle:
+            self.idle.move_to_end(key)
+        return chunk
+
+    def _opened(self, key, chunk, count):
+        chunk.opened += count
+        if chunk.opened and key in self.idle:
+            del self.idle[key]
+        elif not chunk.opened:
+            self.idle[key] = None  # Everything in it was unflagged again
+
+    # Cell access
+
+    def value(self, x, y):
+        return self.chunk(x >> CHUNK_BITS, y >> CHUNK_BITS).vals[(y & CHUNK_MASK) * CHUNK + (x & CHUNK_MASK)]
+
+    def code(self, x, y):
+        return self.chunk(x >> CHUNK_BITS, y >> CHUNK_BITS).codes[(y & CHUNK_MASK) * CHUNK + (x & CHUNK_MASK)]
+
+    def codes_in(self, x0, y0, x1, y1):
+        '''
+        Visible codes of the area [x0, x1) x [y0, y1) as a list of rows
+        '''
+
+        rows = []
+        for y in range(y0, y1):
+            row = []
+            local_y = (y & CHUNK_MASK) * CHUNK
+            x = x0
+            while x < x1:
+                codes = self.chunk(x >> CHUNK_BITS, y >> CHUNK_BITS).codes
+                end = min(x1, (x | CHUNK_MASK) + 1)
+                start = local_y + (x & CHUNK_MASK)
+                row.extend(codes[start:start + end - x])
+                x = end
+            rows.append(row)
+        return rows
+
+    # Moves
+
+    def reveal(self, x, y):
+        '''
+        Reveals (x, y), flood filling across chunks from empty cells.
+        Returns the list of (x, y, code) cells that changed.
+        '''
+
+        if self.status != PLAYING or self.code(x, y) != cell_state.HIDDEN:
+            return []
+        if self.value(x, y) == MINE_VALUE:
+            return self._lose(x, y)
+
+        changes = []
+        self._open(x, y, changes)
+        if self.value(x, y) == 0:
+            queue = deque([(x, y)])
+            while queue:
+                cx, cy = queue.popleft()
+                for dx, dy in SQUARE_OFFSETS:
+                    nx, ny = cx + dx, cy + dy
+                    if self.code(nx, ny) == cell_state.HIDDEN:
+                        self._open(nx, ny, changes)
+                        if self.value(nx, ny) == 0:
+                            queue.append((nx, ny))
+        return changes
+
+    def _open(self, x, y, changes):
+        key = (x >> CHUNK_BITS, y >> CHUNK_BITS)
+        chunk = self.chunk(*key)
+        index = (y & CHUNK_MASK) * CHUNK + (x & CHUNK_MASK)
+        value = chunk.codes[index] = chunk.vals[index]
+        self._opened(key, chunk, 1)
+        self.revealed += 1
+        changes.append((x, y, value))
+
+    def toggle_flag(self, x, y):
+        if self.status != PLAYING:
+            return []
+        key = (x >> CHUNK_BITS, y >> CHUNK_BITS)
+        chunk = self.chunk(*key)
+        index = (y & CHUNK_MASK) * CHUNK + (x & CHUNK_MASK)
+        code = chunk.codes[index]
+        if code == cell_state.HIDDEN:
+            chunk.codes[index] = cell_state.FLAG
+            self.flags += 1
+            self._opened(key, chunk, 1)
+        elif code == cell_state.FLAG:
+            chunk.codes[index] = cell_state.HIDDEN
+            self.flags -= 1
+            self._opened(key, chunk, -1)
+        else:
+            return []
+        return [(x, y, chunk.codes[index])]
+
+    def _lose(self, x, y):
+        '''
+        Ends the game, shows the mines and wrong flags of every loaded chunk
+        '''
+
+        self.status = LOSS
+        changes = []
+        for (cx, cy), chunk in self.chunks.items():
+            for index, value in enumerate(chunk.vals):
+                flagged = chunk.codes[index] == cell_state.FLAG
+                if value == MINE_VALUE and not flagged:
+                    code = cell_state.MINE
+                elif value != MINE_VALUE and flagged:
+                    code = cell_state.MINE_FALSE
+                else:
+                    continue
+                chunk.codes[index] = code
+                changes.append((cx * CHUNK + (index & CHUNK_MASK), cy * CHUNK + (index >> CHUNK_BITS), code))
+
+        key = (x >> CHUNK_BITS, y >> CHUNK_BITS)
+        index = (y & CHUNK_MASK) * CHUNK + (x & CHUNK_MASK)
+        self.chunks[key].codes[index] = cell_state.MINE_CLICKED
+        changes.append((x, y, cell_state.MINE_CLICKED))
+        return changes
+
+    # AI
+
+    def snapshot(self, x0, y0, cols, rows):
+        '''
+        ai_player.BoardSnapshot of the window at (x0, y0). Numbers on the window's edge
+        have neighbours outside it, so the AI sees them as revealed empty cells (safe,
+        but telling nothing). Hidden values stay unknown, flags count as mines.
+        '''
+
+        from ai_player import BoardSnapshot
+
+        codes = self.codes_in(x0, y0, x0 + cols, y0 + rows)
+        vals = [[code if code < cell_state.HIDDEN and 0 < x < cols - 1 and 0 < y < rows - 1
+                 else "b" if code == cell_state.FLAG else 0
+                 for x, code in enumerate(row)] for y, row in enumerate(codes)]
+        clicked = [[code < cell_state.HIDDEN for code in row] for row in codes]
+        flags = [[code == cell_state.FLAG for code in row] for row in codes]
+        return BoardSnapshot(vals, clicked, flags)
+
+    def memory(self):
+        '''
+        (chunks loaded, chunks explored, mine layouts cached)
+        '''
+
+        return len(self.chunks), len(self.chunks) - len(self.idle), len(self.mine_layers)
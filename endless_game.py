@@ -0,0 +1,184 @@
+'''
+Module: Endless game
+Description: The pygame mode for endless boards (python main.py --endless). The window is a camera
+    over an EndlessBoard with no edges: arrow keys, middle mouse drag and the wheel pan and zoom
+    anywhere, and each frame only the visible cells' codes are read, so only the chunks on screen
+    (and the ones a flood fill runs into) are ever generated. Left click reveals, right click
+    flags, H asks the linear deduction for the forced moves inside the view. The game starts at
+    the cell in the middle of the screen, which is always safe; the first click opens it wherever
+    it lands. The score is the number of revealed cells.
+Inputs: User mouse clicks and keys, seed and mine density from the state manager
+Outputs: Endless board drawn to the window
+External Sources: Pygame library
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import sys
+
+import pygame
+
+import cell_state
+import deduction
+from assets import assets
+from audio import audio
+from board import LOSS
+from endless import EndlessBoard, DEFAULT_DENSITY
+from grid import CODE_SPRITE_KEYS, SPRITES
+from latency import latency
+from profiler import profiler
+from viewport import Camera
+from Minesweeper import (black, blue, bg_color, border, top_border, grid_offset_x, grid_offset_y,
+                         grid_size, max_view_width, max_view_height, icon_size)
+
+# Size of the board area (in pixels)
+VIEW_WIDTH = max_view_width
+VIEW_HEIGHT = max_view_height
+
+
+class EndlessGame:
+    def __init__(self, gameStateManager):
+        '''
+        Takes in a gameStateManager object and creates the window and the board
+        (seed and density come from the state manager's params)
+        '''
+
+        pygame.init()
+        params = gameStateManager.getParams()
+        self.gameStateManager = gameStateManager
+        self.seed = params.get("seed")
+        self.density = params.get("endless", DEFAULT_DENSITY)
+
+        self.app_width = VIEW_WIDTH + border * 2
+        self.app_height = VIEW_HEIGHT + border + top_border
+        self.gameDisplay = pygame.display.set_mode((self.app_width, self.app_height))
+        pygame.display.set_caption("Minesweeper - Endless")
+        self.frame_surface = pygame.Surface((self.app_width, self.app_height))
+        self.hud_font = pygame.font.SysFont("Calibri", 24, True)
+        self.small_font = pygame.font.SysFont("Calibri", 18, True)
+        self.clock = pygame.time.Clock()
+
+        self.retry_icon = assets.scaled_image("Sprites/retry.png", (icon_size, icon_size))
+        self.quit_icon = assets.scaled_image("Sprites/quit.png", (icon_size, icon_size))
+        self.retry_rect = self.retry_icon.get_rect(topleft=(border + 120, border - 20))
+        self.quit_rect = self.quit_icon.get_rect(topleft=(border + 180, border - 20))
+
+        self.new_game()
+
+    def new_game(self):
+        '''
+        Starts a new board (the same one again when a seed was given) with (0, 0) in the middle
+        '''
+
+        self.board = EndlessBoard(self.seed, self.density)
+        self.deducer = deduction.Deducer()
+        self.camera = Camera(None, None, (border + grid_offset_x, top_border + grid_offset_y,
+                                          VIEW_WIDTH, VIEW_HEIGHT), grid_size)
+        self.camera.center_on(0, 0)
+
+    def run(self):
+        '''
+        Handles input and draws the visible part of the board until the player quits to the menu
+        '''
+
+        while self.gameStateManager.getState() == "endless":
+            with profiler.scope("events"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        pygame.quit()
+                        sys.exit()
+                    elif self.camera.handle_event(event):
+                        continue
+                    elif event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+                        latency.begin(event, "hint")
+                        self.hint()
+                    elif event.type == pygame.MOUSEBUTTONDOWN:
+                        self.click(event)
+
+            with profiler.scope("audio"):
+                audio.flush()
+            self.draw_frame()
+            with profiler.scope("idle"):
+                self.clock.tick(30)
+
+    def click(self, event):
+        if self.retry_rect.collidepoint(event.pos):
+            latency.begin(event, "retry")
+            self.new_game()
+            return
+        if self.quit_rect.collidepoint(event.pos):
+            latency.begin(event, "quit")
+            self.gameStateManager.setState("main_menu")
+            return
+
+        cell = self.camera.screen_to_cell(event.pos)
+        if cell is None or event.button not in (1, 3):
+            return
+        latency.begin(event)  # Only clicks on a cell are timed as board actions
+        if event.button == 1:
+            if not self.board.revealed:
+                cell = (0, 0)  # The first click opens the safe start cell
+            changes = self.board.reveal(*cell)
+            latency.tag("flood reveal" if len(changes) > 1 else "reveal")
+            if changes:
+                audio.queue("lose" if self.board.status == LOSS else "click")
+        elif event.button == 3:
+            latency.tag("flag")
+            changes = self.board.toggle_flag(*cell)
+            if changes:
+                audio.queue("flag" if changes[0][2] == cell_state.FLAG else "unflag")
+
+    def hint(self):
+        '''
+        Flags the mines and reveals one safe cell the numbers in view force
+        '''
+
+        if self.board.status == LOSS:
+            return
+        x0, y0, x1, y1 = self.camera.visible_cells()
+        snap = self.board.snapshot(x0, y0, x1 - x0, y1 - y0)
+        known = deduction.deduce(snap, deducer=self.deducer)
+        for (x, y), mine in sorted(known.items(), key=lambda item: -item[1]):
+            if not snap.hidden(x, y):
+                continue
+            if mine:
+                self.board.toggle_flag(x0 + x, y0 + y)
+            else:
+                self.board.reveal(x0 + x, y0 + y)
+                audio.queue("click")
+                return
+
+    def draw_frame(self):
+        frame_surface = self.frame_surface
+        frame_surface.fill(bg_color)
+        with profiler.scope("cells"):
+            x0, y0, x1, y1 = self.camera.visible_cells()
+            self.camera.draw_codes(frame_surface, self.board.codes_in(x0, y0, x1, y1), CODE_SPRITE_KEYS, SPRITES)
+        with profiler.scope("hud"):
+            self.draw_hud(frame_surface)
+        profiler.draw_overlay(frame_surface)
+        latency.draw_overlay(frame_surface)
+
+        with profiler.scope("flip"):
+            self.gameDisplay.blit(frame_surface, (0, 0))
+            pygame.display.flip()
+        latency.presented()
+        profiler.frame_end()
+
+    def draw_hud(self, surface):
+        '''
+        Draws the score, retry and quit buttons, the game status and the board's seed and chunk counts
+        '''
+
+        board = self.board
+        surface.blit(self.hud_font.render(str(board.revealed), True, black), (border, border - 5))
+        surface.blit(self.retry_icon, self.retry_rect.topleft)
+        surface.blit(self.quit_icon, self.quit_rect.topleft)
+
+        status, color = ("Loss", (255, 0, 0)) if board.status == LOSS else ("Endless", blue)
+        status_text = self.hud_font.render(status, True, color)
+        surface.blit(status_text, (self.app_width - status_text.get_width() - border, border - 10))
+
+        loaded, explored, _ = board.memory()
+        info = "seed %d   flags %d   chunks %d loaded, %d explored" % (board.seed, board.flags, loaded, explored)
+        surface.blit(self.small_font.render(info, True, black), (border, top_border - 25))
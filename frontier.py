@@ -0,0 +1,402 @@
+'''
+Module: Frontier solver
+Description: Exact mine probabilities for the AI. The frontier (hidden cells next to revealed
+    numbers) is split into independent components: numbers that share hidden neighbours end up
+    in the same component. Each component is solved by enumerating every mine layout that fits
+    its numbers, giving each hidden cell's mine probability (0 and 1 are certainties). Only what
+    a player can see is used, flags count as mines.
+
+    The same small configurations come up again and again, within a game and across games, so
+    solved components go into a SolverCache. Its key is a canonical form of the component: the
+    numbers and hidden cells as coordinates, taken under all 8 rotations/reflections, moved to
+    the origin, and the smallest of the 8 wins. The cache is a bounded LRU and can be saved to a
+    JSON file so later runs start warm; it counts hits, misses and the solve time the hits saved.
+Inputs: BoardSnapshot
+Outputs: Mine probability per frontier cell
+External Sources: None
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import cell_state
+from neighbors import neighbor_table
+
+# Components with more hidden cells than this aren't enumerated
+MAX_COMPONENT_CELLS = 22
+
+# Entries kept in the solver cache
+CACHE_SIZE = 50000
+
+# The 8 rotations/reflections of the square
+SYMMETRIES = [
+    lambda x, y: (x, y), lambda x, y: (-x, y), lambda x, y: (x, -y), lambda x, y: (-x, -y),
+    lambda x, y: (y, x), lambda x, y: (-y, x), lambda x, y: (y, -x), lambda x, y: (-y, -x),
+]
+
+
+class Component:
+    __slots__ = ("constraints", "cells")
+
+    def __init__(self, constraints, cells):
+        '''
+        constraints is a list of (x, y, mines still to find around (x, y)),
+        cells the hidden cells around them
+        '''
+
+        self.constraints = constraints
+        self.cells = cells
+
+
+# cell_state code -> 1 for the revealed numbers 1-8, for bytes.translate()
+_NUMBER_CODES = bytes(1 <= code <= 8 for code in range(256))
+
+
+def visible_codes(snap):
+    '''
+    What the player sees as a flat bytearray of cell_state codes (index = y * cols + x)
+    '''
+
+    codes = bytearray(snap.cols * snap.rows)
+    index = 0
+    for vals, clicked, flags in zip(snap.vals, snap.clicked, snap.flags):
+        for val, shown, flag in zip(vals, clicked, flags):
+            if flag:
+                codes[index] = cell_state.FLAG
+            elif not shown:
+                codes[index] = cell_state.HIDDEN
+            else:
+                codes[index] = cell_state.MINE if val == "b" else val
+            index += 1
+    return codes
+
+
+def number_constraint(codes, table, index):
+    '''
+    Returns (mines still to find, hidden neighbour indexes) of a revealed number,
+    or None if it has no hidden neighbours
+    '''
+
+    value = codes[index]
+    if not 1 <= value <= 8:
+        return None
+    hidden = []
+    for neighbor in table.indexes[table.offsets[index]:table.offsets[index + 1]]:
+        code = codes[neighbor]
+        if code == cell_state.FLAG:
+            value -= 1
+        elif code == cell_state.HIDDEN:
+            hidden.append(neighbor)
+    return (value, hidden) if hidden else None
+
+
+def _indexes_of(data, value):
+    '''
+    Every index of the byte value in data, skipping the rest at C speed
+    '''
+
+    indexes = []
+    index = data.find(value)
+    while index != -1:
+        indexes.append(index)
+        index = data.find(value, index + 1)
+    return indexes
+
+
+def frontier_candidates(codes, table):
+    '''
+    Indexes (in order) of the revealed numbers that may have hidden neighbours: all of
+    them, or only those around the hidden cells when there are fewer hidden cells
+    '''
+
+    numbers = codes.translate(_NUMBER_CODES)
+    if codes.count(cell_state.HIDDEN) < numbers.count(1):
+        candidates = set()
+        for hidden in _indexes_of(codes, cell_state.HIDDEN):
+            candidates.update(index for index in table.of(hidden) if numbers[index])
+        return sorted(candidates)
+    return _indexes_of(numbers, 1)
+
+
+def constraint_groups(codes, cols, rows, should_stop=lambda: False):
+    '''
+    Splits the frontier into independent components, each given as the list of its
+    number cells (indexes) in the order a flood through shared hidden cells reaches them.
+    Returns None if should_stop() said so before it was done.
+    '''
+
+    table = neighbor_table(cols, rows)
+    constraints = {}
+    touching = {}
+    for count, index in enumerate(frontier_candidates(codes, table)):
+        if count & 1023 == 0 and should_stop():
+            return None
+        constraint = number_constraint(codes, table, index)
+        if constraint is not None:
+            constraints[index] = constraint
+            for cell in constraint[1]:
+                touching.setdefault(cell, []).append(index)
+
+    groups = []
+    seen = set()
+    for start in constraints:
+        if start in seen:
+            continue
+        if should_stop():
+            return None
+        seen.add(start)
+        group = [start]
+        for index in group:
+            for cell in constraints[index][1]:
+                for other in touching[cell]:
+                    if other not in seen:
+                        seen.add(other)
+                        group.append(other)
+        groups.append(group)
+    return groups
+
+
+def build_component(codes, cols, rows, group):
+    '''
+    Builds the Component of a constraint group. Cells are listed in the order they're
+    reached, which keeps the enumeration pruning early.
+    '''
+
+    table = neighbor_table(cols, rows)
+    constraints, cells, cell_seen = [], [], set()
+    for index in group:
+        remaining, hidden = number_constraint(codes, table, index)
+        constraints.append((index % cols, index // cols, remaining))
+        for cell in hidden:
+            if cell not in cell_seen:
+                cell_seen.add(cell)
+                cells.append((cell % cols, cell // cols))
+    return Component(constraints, cells)
+
+
+def components(snap):
+    '''
+    Splits the frontier of the snapshot into independent components
+    '''
+
+    codes = visible_codes(snap)
+    return [build_component(codes, snap.cols, snap.rows, group) for group in constraint_groups(codes, snap.cols, snap.rows)]
+
+
+def enumerate_component(component):
+    '''
+    Mine probability of each cell (in component.cells order) over all layouts that
+    fit the constraints. None if the component is too big or has no valid layout.
+    '''
+
+    cells = component.cells
+    if len(cells) > MAX_COMPONENT_CELLS:
+        return None
+    index = {cell: i for i, cell in enumerate(cells)}
+
+    # Per constraint: mines still needed and cells still unassigned
+    need = []
+    left = []
+    cell_constraints = [[] for _ in cells]
+    for number, (x, y, remaining) in enumerate(component.constraints):
+        members = [index[(nx, ny)] for nx in (x - 1, x, x + 1) for ny in (y - 1, y, y + 1) if (nx, ny) in index]
+        need.append(remaining)
+        left.append(len(members))
+        for member in members:
+            cell_constraints[member].append(number)
+        if remaining < 0 or remaining > len(members):
+            return None  # A wrong flag, nothing fits
+
+    mine_counts = [0] * len(cells)
+    assignment = [0] * len(cells)
+    total = 0
+
+    def place(depth):
+        nonlocal total
+        if depth == len(cells):
+            total += 1
+            for i, mine in enumerate(assignment):
+                mine_counts[i] += mine
+            return
+        touched = cell_constraints[depth]
+        for mine in (0, 1):
+            ok = True
+            for number in touched:
+                need[number] -= mine
+                left[number] -= 1
+                if need[number] < 0 or need[number] > left[number]:
+                    ok = False
+            if ok:
+                assignment[depth] = mine
+                place(depth + 1)
+            for number in touched:
+                need[number] += mine
+                left[number] += 1
+
+    place(0)
+    if not total:
+        return None
+    return [count / total for count in mine_counts]
+
+
+def canonical(component):
+    '''
+    Returns (key, cells in canonical order). Components that are rotations,
+    reflections or translations of each other get the same key.
+    '''
+
+    best = None
+    for transform in SYMMETRIES:
+        constraints = [transform(x, y) + (remaining,) for x, y, remaining in component.constraints]
+        cells = [transform(x, y) + (i,) for i, (x, y) in enumerate(component.cells)]
+        min_x = min(point[0] for point in constraints + cells)
+        min_y = min(point[1] for point in constraints + cells)
+        constraints = sorted((x - min_x, y - min_y, remaining) for x, y, remaining in constraints)
+        cells = sorted((x - min_x, y - min_y, i) for x, y, i in cells)
+        key = "%s|%s" % (";".join("%d,%d,%d" % point for point in constraints),
+                         ";".join("%d,%d" % point[:2] for point in cells))
+        if best is None or key < best[0]:
+            best = (key, [i for _, _, i in cells])
+    return best
+
+
+class SolverCache:
+    def __init__(self, size=CACHE_SIZE):
+        '''
+        LRU of canonical component key -> (solve seconds, probabilities)
+        '''
+
+        self.size = size
+        self.entries = OrderedDict()
+        self.path = None
+        self.hits = 0
+        self.misses = 0
+        self.time_saved = 0.0
+        self.solve_time = 0.0
+        self.loaded = 0
+        self.lock = threading.Lock()  # The AI thread fills the cache while the game may save it
+
+    def lookup(self, component):
+        '''
+        Returns (found, probabilities, key, order). On a miss, key and order are
+        what remember() needs once the component has been solved.
+        '''
+
+        key, order = canonical(component)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None, key, order
+            self.entries.move_to_end(key)
+            self.hits += 1
+            self.time_saved += entry[0]
+        probabilities = entry[1]
+        if probabilities is None:
+            return True, None, key, order
+        result = [0.0] * len(order)
+        for canonical_index, cell_index in enumerate(order):
+            result[cell_index] = probabilities[canonical_index]
+        return True, result, key, order
+
+    def remember(self, key, order, result, seconds):
+        '''
+        Stores a solved component (result in component.cells order, or None)
+        '''
+
+        entry = (seconds, None if result is None else [result[i] for i in order])
+        with self.lock:
+            self.solve_time += seconds
+            self.entries[key] = entry
+            if len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def merge(self, key, order, result, seconds, hit):
+        '''
+        Takes in a component solved (or found in its own cache) by another process
+        '''
+
+        with self.lock:
+            if hit:
+                self.hits += 1
+                self.time_saved += seconds
+                self.solve_time -= seconds  # remember() adds it back
+            else:
+                self.misses += 1
+        self.remember(key, order, result, seconds)
+
+    def solve(self, component):
+        '''
+        Mine probabilities for component.cells, from the cache when possible
+        '''
+
+        found, result, key, order = self.lookup(component)
+        if not found:
+            start = time.perf_counter()
+            result = enumerate_component(component)
+            self.remember(key, order, result, time.perf_counter() - start)
+        return result
+
+    def load(self, path):
+        '''
+        Loads entries saved by save() (missing file: starts empty) and remembers the path
+        '''
+
+        self.path = path
+        if not os.path.exists(path):
+            return
+        with open(path) as file:
+            data = json.load(file)
+        for key, (seconds, probabilities) in data.get("entries", {}).items():
+            self.entries[key] = (seconds, probabilities)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        self.loaded = len(self.entries)
+
+    def save(self, path=None):
+        '''
+        Writes the entries to path (default: the loaded file). A copy is taken under the
+        lock and written to a temporary file first, so an AI turn still running or a crash
+        halfway through never leaves a broken file behind.
+        '''
+
+        path = path or self.path
+        if path is None:
+            return
+        with self.lock:
+            entries = OrderedDict(self.entries)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump({"version": 1, "entries": entries}, file)
+        os.replace(temp_path, path)
+
+    def report(self):
+        lookups = self.hits + self.misses
+        rate = 100.0 * self.hits / lookups if lookups else 0.0
+        return ("Solver cache: %d lookups, %.1f%% hits, %.3f s solving, %.3f s saved, %d entries (%d loaded)"
+                % (lookups, rate, self.solve_time, self.time_saved, len(self.entries), self.loaded))
+
+
+def solve(snap, should_stop=lambda: False, cache=None):
+    '''
+    Returns {(x, y): mine probability} for every frontier cell of solvable components
+    '''
+
+    cache = cache or solver_cache
+    probabilities = {}
+    for component in components(snap):
+        if should_stop():
+            break
+        result = cache.solve(component)
+        if result is not None:
+            probabilities.update(zip(component.cells, result))
+    return probabilities
+
+
+# Shared by the whole process (the AI worker thread uses it)
+solver_cache = SolverCache()
@@ -14,27 +14,49 @@ Creation Date: 9/7/2025
 '''
 
 import pygame
+from assets import assets
+import cell_state
+from cell_state import state_code
 
-# Loads sprite images for game
-sprite_emptyGrid = pygame.image.load("Sprites/Grid_ClickedOn.png")  # Revealed empty grid
-sprite_flag = pygame.image.load("Sprites/flag.png")                 # Flag marker
-sprite_grid = pygame.image.load("Sprites/Grid.png")                 # Hidden grid square
-sprite_grid1 = pygame.image.load("Sprites/gridnum1.png")            # Grid with number 1
-sprite_grid2 = pygame.image.load("Sprites/gridnum2.png")            # Grid with number 2
-sprite_grid3 = pygame.image.load("Sprites/gridnum3.png")            # Grid with number 3
-sprite_grid4 = pygame.image.load("Sprites/gridnum4.png")            # Grid with number 4
-sprite_grid5 = pygame.image.load("Sprites/gridnum5.png")            # Grid with number 5
-sprite_grid6 = pygame.image.load("Sprites/gridnum6.png")            # Grid with number 6
-sprite_grid7 = pygame.image.load("Sprites/gridnum7.png")            # Grid with number 7
-sprite_grid8 = pygame.image.load("Sprites/gridnum8.png")            # Grid with number 8
-sprite_mine = pygame.image.load("Sprites/mineNeutral.png")          # Untriggered mine
-sprite_mineClicked = pygame.image.load("Sprites/mineClickedOn.png") # Mine that was clicked
-sprite_mineFalse = pygame.image.load("Sprites/mineFalse.png")       # Wrongly flagged mine
+# Sprite files by key. Nothing is loaded at import time, the shared asset cache
+# loads each sprite the first time it's drawn
+SPRITE_FILES = {
+    "empty": "Sprites/Grid_ClickedOn.png",      # Revealed empty grid
+    "flag": "Sprites/flag.png",                 # Flag marker
+    "grid": "Sprites/Grid.png",                 # Hidden grid square
+    "grid1": "Sprites/gridnum1.png",            # Grid with number 1
+    "grid2": "Sprites/gridnum2.png",            # Grid with number 2
+    "grid3": "Sprites/gridnum3.png",            # Grid with number 3
+    "grid4": "Sprites/gridnum4.png",            # Grid with number 4
+    "grid5": "Sprites/gridnum5.png",            # Grid with number 5
+    "grid6": "Sprites/gridnum6.png",            # Grid with number 6
+    "grid7": "Sprites/gridnum7.png",            # Grid with number 7
+    "grid8": "Sprites/gridnum8.png",            # Grid with number 8
+    "mine": "Sprites/mineNeutral.png",          # Untriggered mine
+    "mineClicked": "Sprites/mineClickedOn.png", # Mine that was clicked
+    "mineFalse": "Sprites/mineFalse.png",       # Wrongly flagged mine
+}
+
+# Sprite key of each cell_state code
+CODE_SPRITE_KEYS = ["empty"] + ["grid%d" % number for number in range(1, 9)] + ["grid", "flag", "mine", "mineClicked", "mineFalse"]
+
+class _Sprites:
+    '''
+    Looks sprites up by key (like a dict) through the shared asset cache,
+    so renderers (like the viewport camera) can find them by cell state
+    '''
+
+    def __getitem__(self, key):
+        return assets.image(SPRITE_FILES[key])
+
+SPRITES = _Sprites()
 
 class Grid:
-    def __init__(self, xGrid, yGrid, type, gameDisplay, border, top_border, grid_size,):
+    def __init__(self, xGrid, yGrid, type, gameDisplay, border, top_border, grid_size, changeLog=None):
         '''
-        Initialize the grid with provided parameters
+        Initialize the grid with provided parameters. changeLog (optional) is a
+        list shared by the whole board that gets (x, y) appended whenever this
+        cell's state changes.
         '''
 
         self.xGrid = xGrid
@@ -49,52 +71,71 @@ class Grid:
                                 grid_size, grid_size)
         self.val = type
         self.gameDisplay = gameDisplay
+        self.changeLog = changeLog
 
     # Draws the sprites onto grid after every click/interaction update
     def drawGrid(self, surface):
         '''
-        Assignes each value in the grid to its appropriate sprite
-        and draws them on the provided surface.
+        Draws the sprite matching this cell's state on the provided surface.
+        '''
+
+        key = self.spriteKey()
+        if key is not None:
+            surface.blit(SPRITES[key], self.rect)
+
+    def spriteKey(self):
+        '''
+        Assigns this cell's state to the key of its sprite in SPRITES.
+        Returns None for a revealed cell with a value that has no sprite.
         '''
 
         if self.mineFalse:
-            surface.blit(sprite_mineFalse, self.rect)
-        else:
-            if self.clicked:
-                if self.val == "b":
-                    if self.mineClicked:
-                        surface.blit(sprite_mineClicked, self.rect)
-                    else:
-                        surface.blit(sprite_mine, self.rect)
-                else:
-                    if self.val == 0:
-                        surface.blit(sprite_emptyGrid, self.rect)
-                    elif self.val == 1:
-                        surface.blit(sprite_grid1, self.rect)
-                    elif self.val == 2:
-                        surface.blit(sprite_grid2, self.rect)
-                    elif self.val == 3:
-                        surface.blit(sprite_grid3, self.rect)
-                    elif self.val == 4:
-                        surface.blit(sprite_grid4, self.rect)
-                    elif self.val == 5:
-                        surface.blit(sprite_grid5, self.rect)
-                    elif self.val == 6:
-                        surface.blit(sprite_grid6, self.rect)
-                    elif self.val == 7:
-                        surface.blit(sprite_grid7, self.rect)
-                    elif self.val == 8:
-                        surface.blit(sprite_grid8, self.rect)
-            else:
-                if self.flag:
-                    surface.blit(sprite_flag, self.rect)
-                else:
-                    surface.blit(sprite_grid, self.rect)
+            return "mineFalse"
+        if self.clicked:
+            if self.val == "b":
+                if self.mineClicked:
+                    return "mineClicked"
+                return "mine"
+            if self.val == 0:
+                return "empty"
+            if 1 <= self.val <= 8:
+                return "grid%d" % self.val
+            return None
+        if self.flag:
+            return "flag"
+        return "grid"
+
+    def stateCode(self):
+        '''
+        Returns the cell_state code for this cell
+        '''
+
+        return state_code(self.val, self.clicked, self.flag, self.mineClicked, self.mineFalse)
+
+    def setStateCode(self, code):
+        '''
+        Puts the cell back into the state a cell_state code describes (undo/redo)
+        '''
+
+        self.clicked = code < cell_state.HIDDEN or code == cell_state.MINE or code == cell_state.MINE_CLICKED
+        self.flag = code == cell_state.FLAG or code == cell_state.MINE_FALSE
+        self.mineClicked = code == cell_state.MINE_CLICKED
+        self.mineFalse = code == cell_state.MINE_FALSE
+        self.logChange()
+
+    def logChange(self):
+        '''
+        Records that this cell changed so incremental renderers can update it
+        '''
+
+        if self.changeLog is not None:
+            self.changeLog.append((self.xGrid, self.yGrid))
 
     # Add flag toggle method           
     def toggleFlag(self): 
        if not self.clicked:
            self.flag = not self.flag
+           self.logChange()
 
     def reveal(self):
         '''
@@ -105,6 +146,7 @@ class Grid:
             return None  # Do nothing if already clicked or flagged
 
         self.clicked = True
+        self.logChange()
 
         if self.val == "b":
             self.mineClicked = True
@@ -0,0 +1,209 @@
+'''
+Module: Input latency tracker
+Description: Measures how long a click takes to show up on screen. Each left or right click on a
+    board cell (and each menu, HUD button, minimap or undo/redo input, under its own action) is stamped
+    when it is handled (with the SDL event timestamp when pygame exposes one, otherwise the
+    pygame tick count at dequeue), tagged with what it turned into while it is handled (reveal,
+    flood reveal, flag, ...) and closed by the next display flip. A click that starts an AI turn
+    also gets a deferred "reveal + ai" sample, closed by the flip after the AI's moves are applied.
+    Latencies are kept as a histogram per action type, shown on a debug overlay (F4 toggles it),
+    checked against a latency budget and dumped on exit.
+Inputs: pygame events, action tags, display flips
+Outputs: Latency histograms, overlay, budget warnings, JSON dump
+External Sources: Pygame library
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import collections
+import json
+import sys
+
+import pygame
+
+# Upper edges (ms) of the histogram buckets, the last bucket is everything above
+BUCKETS_MS = [8, 16, 33, 50, 66, 100, 150, 250, 500, 1000]
+
+# Default click-to-display budget (ms)
+DEFAULT_BUDGET_MS = 50
+
+# Recent samples kept per action for percentiles
+MAX_SAMPLES = 5000
+
+
+class LatencyTracker:
+    def __init__(self):
+        '''
+        Starts disabled, enable() turns tracking on
+        '''
+
+        self.enabled = False
+        self.show_overlay = True
+        self.budget_ms = DEFAULT_BUDGET_MS
+        self.pending = []      # [timestamp ms, action] for inputs not shown yet
+        self.histograms = {}   # action -> bucket counts
+        self.samples = {}      # action -> recent latencies (ms)
+        self.violations = 0
+        self.last = None       # (action, ms) of the last presented input
+        self._font = None
+
+    def enable(self, budget_ms=DEFAULT_BUDGET_MS):
+        self.enabled = True
+        self.budget_ms = budget_ms
+
+    def begin(self, event, action="click"):
+        '''
+        Starts tracking an input event
+        '''
+
+        if not self.enabled:
+            return
+        timestamp = getattr(event, "timestamp", None)
+        if timestamp is None:
+            timestamp = pygame.time.get_ticks()
+        self.pending.append([timestamp, action])
+
+    def tag(self, action):
+        '''
+        Names what the most recent input turned into (the last tag wins)
+        '''
+
+        if self.enabled and self.pending:
+            self.pending[-1][1] = action
+
+    def defer(self, action):
+        '''
+        Starts a second sample for the most recent input, for a result that shows up
+        frames later (the AI's moves). It isn't closed by a flip until it is handed
+        back to resume(). Returns the sample, or None when not tracking.
+        '''
+
+        if not (self.enabled and self.pending):
+            return None
+        return [self.pending[-1][0], action]
+
+    def resume(self, sample):
+        '''
+        Puts a deferred sample back, the next display flip closes it
+        '''
+
+        if sample is not None:
+            self.pending.append(sample)
+
+    def presented(self):
+        '''
+        Call right after the display flip, closes every pending input
+        '''
+
+        if not (self.enabled and self.pending):
+            return
+        now = pygame.time.get_ticks()
+        for timestamp, action in self.pending:
+            self.add(action, now - timestamp)
+        self.pending = []
+
+    def add(self, action, ms):
+        '''
+        Stores one latency sample and checks it against the budget
+        '''
+
+        counts = self.histograms.get(action)
+        if counts is None:
+            counts = self.histograms[action] = [0] * (len(BUCKETS_MS) + 1)
+            self.samples[action] = collections.deque(maxlen=MAX_SAMPLES)
+        index = 0
+        while index < len(BUCKETS_MS) and ms > BUCKETS_MS[index]:
+            index += 1
+        counts[index] += 1
+        self.samples[action].append(ms)
+        self.last = (action, ms)
+
+        if ms > self.budget_ms:
+            self.violations += 1
+            print("Latency budget exceeded: %s took %d ms (budget %d ms)" % (action, ms, self.budget_ms),
+                  file=sys.stderr)
+
+    def stats(self, action):
+        '''
+        Returns (count, p50, p95, max) in ms for an action
+        '''
+
+        ordered = sorted(self.samples[action])
+        count = sum(self.histograms[action])
+        return (count,
+                ordered[(len(ordered) - 1) // 2],
+                ordered[int(0.95 * (len(ordered) - 1))],
+                ordered[-1])
+
+    def toggle_overlay(self, event):
+        '''
+        F4 shows/hides the overlay. Returns True if the event was used.
+        '''
+
+        if self.enabled and event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+            self.show_overlay = not self.show_overlay
+            return True
+        return False
+
+    def draw_overlay(self, surface):
+        '''
+        Draws per-action p50/p95/max in the bottom left corner, red if over budget
+        '''
+
+        if not (self.enabled and self.show_overlay and self.histograms):
+            return
+        if self._font is None:
+            self._font = pygame.font.SysFont(None, 18)
+
+        lines = []
+        for action in sorted(self.histograms):
+            count, p50, p95, longest = self.stats(action)
+            line = "%-12s n=%-4d p50 %3d  p95 %3d  max %3d ms" % (action, count, p50, p95, longest)
+            lines.append((line, p95 > self.budget_ms))
+
+        texts = [self._font.render(line, True, (255, 80, 80) if over else (255, 255, 255))
+                 for line, over in lines]
+        width = max(text.get_width() for text in texts) + 8
+        height = sum(text.get_height() for text in texts) + 8
+        top = surface.get_height() - height
+        panel = pygame.Surface((width, height))
+        panel.set_alpha(180)
+        panel.fill((0, 0, 0))
+        surface.blit(panel, (0, top))
+        y = top + 4
+        for text in texts:
+            surface.blit(text, (4, y))
+            y += text.get_height()
+
+    def report(self):
+        '''
+        Returns a printable summary
+        '''
+
+        lines = ["Click-to-display latency (budget %d ms, %d over budget):" % (self.budget_ms, self.violations)]
+        for action in sorted(self.histograms):
+            count, p50, p95, longest = self.stats(action)
+            lines.append("  %-14s n=%-5d p50 %4d ms  p95 %4d ms  max %4d ms" % (action, count, p50, p95, longest))
+        return "\n".join(lines)
+
+    def dump(self, path):
+        '''
+        Writes the histograms and summary statistics as JSON
+        '''
+
+        data = {
+            "budget_ms": self.budget_ms,
+            "violations": self.violations,
+            "bucket_upper_ms": BUCKETS_MS + [None],
+            "actions": {},
+        }
+        for action, counts in self.histograms.items():
+            count, p50, p95, longest = self.stats(action)
+            data["actions"][action] = {"histogram": counts, "count": count,
+                                       "p50_ms": p50, "p95_ms": p95, "max_ms": longest}
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+# Shared by the whole process
+latency = LatencyTracker()
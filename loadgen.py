@@ -0,0 +1,134 @@
+'''
+Module: Server load generator
+Description: Load test client for server.py. Opens a number of connections, each playing several
+    games at once with random reveals and flags (finished games are replaced with new ones), and
+    measures requests per second and latency percentiles from sending a request to reading its
+    response. Requests can be pipelined per connection. --idle-games creates that many untouched
+    games first and reads the server's memory use, to check how cheap idle sessions are.
+Inputs: Server address, connection/game counts, duration
+Outputs: Throughput and latency report
+External Sources: asyncio streams - https://docs.python.org/3/library/asyncio-stream.html
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import argparse
+import asyncio
+import random
+import time
+
+from server import DEFAULT_HOST, DEFAULT_PORT
+
+
+async def request(reader, writer, lines):
+    '''
+    Sends the request lines in one write and returns the response lines
+    '''
+
+    writer.write("".join(line + "\n" for line in lines).encode("ascii"))
+    responses = []
+    for _ in lines:
+        responses.append((await reader.readline()).decode("ascii").rstrip("\n"))
+    return responses
+
+
+async def new_game(reader, writer, cols, rows, mines):
+    response = (await request(reader, writer, ["N %d %d %d" % (cols, rows, mines)]))[0]
+    return int(response.split()[1])
+
+
+async def player(args, deadline, latencies, rng):
+    '''
+    One connection playing args.games games until the deadline
+    '''
+
+    reader, writer = await asyncio.open_connection(args.host, args.port, limit=1024 * 1024)
+    games = [await new_game(reader, writer, args.cols, args.rows, args.mines) for _ in range(args.games)]
+
+    while time.perf_counter() < deadline:
+        # Pick a batch of random moves on random games
+        batch = []
+        for _ in range(args.pipeline):
+            command = "F" if rng.random() < args.flag_ratio else "R"
+            game_id = rng.choice(games)
+            batch.append("%s %d %d %d" % (command, game_id, rng.randrange(args.cols), rng.randrange(args.rows)))
+
+        start = time.perf_counter()
+        responses = await request(reader, writer, batch)
+        elapsed = time.perf_counter() - start
+        latencies.extend([elapsed] * len(batch))
+
+        # Replace finished games
+        for response in responses:
+            parts = response.split(" ", 3)
+            if parts[0] == "D" and parts[2] != "p":
+                game_id = int(parts[1])
+                if game_id in games:
+                    await request(reader, writer, ["Q %d" % game_id])
+                    games[games.index(game_id)] = await new_game(reader, writer, args.cols, args.rows, args.mines)
+
+    writer.close()
+
+
+async def idle_games(args):
+    '''
+    Creates args.idle_games untouched games on one connection and prints the server's memory use
+    '''
+
+    reader, writer = await asyncio.open_connection(args.host, args.port, limit=1024 * 1024)
+    before = (await request(reader, writer, ["I"]))[0]
+    start = time.perf_counter()
+    chunk = 1000
+    for first in range(0, args.idle_games, chunk):
+        count = min(chunk, args.idle_games - first)
+        await request(reader, writer, ["N %d %d %d" % (args.cols, args.rows, args.mines)] * count)
+    elapsed = time.perf_counter() - start
+    after = (await request(reader, writer, ["I"]))[0]
+    print("Created %d idle games in %.2f s" % (args.idle_games, elapsed))
+    print("  before: %s" % before)
+    print("  after:  %s" % after)
+    writer.close()
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def main(args):
+    if args.idle_games:
+        await idle_games(args)
+        return
+
+    rng = random.Random(args.seed)
+    latencies = []
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(player(args, deadline, latencies, random.Random(rng.random()))
+                           for _ in range(args.connections)))
+    elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    print("%d requests in %.2f s over %d connections (pipeline %d)" % (
+        len(ordered), elapsed, args.connections, args.pipeline))
+    print("  throughput: %.0f requests/s" % (len(ordered) / elapsed))
+    if ordered:
+        print("  latency ms: p50 %.2f  p90 %.2f  p99 %.2f  p99.9 %.2f  max %.2f" % tuple(
+            value * 1000 for value in (percentile(ordered, 0.5), percentile(ordered, 0.9),
+                                       percentile(ordered, 0.99), percentile(ordered, 0.999), ordered[-1])))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for the Minesweeper server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--games", type=int, default=20, help="games per connection")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--pipeline", type=int, default=1, help="requests in flight per connection")
+    parser.add_argument("--flag-ratio", type=float, default=0.1)
+    parser.add_argument("--cols", type=int, default=16)
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--mines", type=int, default=40)
+    parser.add_argument("--idle-games", type=int, default=0, help="only create this many idle games and report memory")
+    parser.add_argument("--seed", type=int, default=None)
+    asyncio.run(main(parser.parse_args()))
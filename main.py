@@ -12,23 +12,42 @@ Authors: Wesley McDougal, Abdulaziz Ali
 
 '''
 
+import argparse
+import atexit
+from assets import assets
+from audio import audio, configure_mixer, MIXER_BUFFER, SOUNDS
 import pygame
 import sys
+from profiler import profiler
+from latency import latency, DEFAULT_BUDGET_MS
+from spectate import spectators, DEFAULT_SPECTATE_PORT
+from frontier import solver_cache
+from parallel_solver import parallel_solver
+from ai_worker import ai_worker
+from stats import stats, DEFAULT_STATS_FILE
 from gamestate_manager import GameStateManager
+from grid import SPRITE_FILES
 from main_menu import MainMenu
-from Minesweeper import MineSweeper
+from Minesweeper import MineSweeper, HUD_ICONS, grid_width, grid_height
+from endless_game import EndlessGame
+from endless import DEFAULT_DENSITY
 
 WIDTH, HEIGHT = 400, 300
 
 # Start point of the game
 class Game:
-    def __init__(self):
+    def __init__(self, boardOptions=None, audioBuffer=None):
         '''
         Initialize a screen for the gameStateManager to use 
-        and set all state possibilites
+        and set all state possibilites. boardOptions (optional) are
+        extra game parameters such as the board width and height,
+        audioBuffer (optional) is the mixer buffer size in samples.
         '''
 
+        # Small mixer buffer for low click-to-sound latency, must happen before pygame.init()
+        configure_mixer(audioBuffer or MIXER_BUFFER)
         pygame.init()
+        assets.mark("pygame init")
 
         # Set screen
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
@@ -37,8 +56,12 @@ class Game:
         # Initialize gamestate manager to start at main_menu
         self.gameStateManager = GameStateManager("main_menu")
 
+        # Straight into an endless board when asked for one on the command line
+        if boardOptions and "endless" in boardOptions:
+            self.gameStateManager.setState("endless", boardOptions)
+
         # Initialize main menu
-        self.mainMenu = MainMenu(self.gameStateManager)
+        self.mainMenu = MainMenu(self.gameStateManager, boardOptions)
 
         # Store all possible states
         self.states = {"main_menu": self.mainMenu}
@@ -48,6 +71,9 @@ class Game:
             (self.mainMenu.WIDTH, self.mainMenu.HEIGHT)
         )
 
+        # Load game sprites and sounds in the background while the menu is showing
+        assets.preload(images=list(SPRITE_FILES.values()) + HUD_ICONS, sounds=[sound[0] for sound in SOUNDS.values()])
+
     def run(self):
         '''
         Gets the current state for GameStateManager and
@@ -77,12 +103,91 @@ class Game:
 
             elif state == "mine_sweeper":
                 MineSweeper(self.gameStateManager).run()  # Create new instance each time
+            elif state == "endless":
+                EndlessGame(self.gameStateManager).run()
             else:
                 self.states[self.gameStateManager.getState()].run()
 
             pygame.display.update()
             self.clock.tick(30) 
 
+def parse_args(argv=None):
+    '''
+    Reads the optional board and audio settings from the command line.
+    Returns (boardOptions, audioBuffer)
+    '''
+
+    parser = argparse.ArgumentParser(description="EECS 581 Minesweeper")
+    parser.add_argument("--width", type=int, help="board width in cells (default 10)")
+    parser.add_argument("--height", type=int, help="board height in cells (default 10)")
+    parser.add_argument("--mines", type=int, help="number of mines, overrides the menu selection")
+    parser.add_argument("--ai-budget", type=int, metavar="MS", help="time budget for one AI turn (default 250 ms)")
+    parser.add_argument("--timing", action="store_true", help="print startup, asset load and sound latency times on exit")
+    parser.add_argument("--audio-buffer", type=int, default=MIXER_BUFFER,
+                        help="mixer buffer size in samples, smaller is lower latency (default %d)" % MIXER_BUFFER)
+    parser.add_argument("--profile", nargs="?", const="profile", metavar="DIR",
+                        help="record frame timings, show the overlay (F3) and write trace.json/profile.csv to DIR on exit")
+    parser.add_argument("--latency", nargs="?", const="latency.json", metavar="FILE",
+                        help="track click-to-display latency, show the overlay (F4) and dump histograms to FILE on exit")
+    parser.add_argument("--latency-budget", type=int, default=DEFAULT_BUDGET_MS, metavar="MS",
+                        help="warn when a click takes longer than this to show up (default %d ms)" % DEFAULT_BUDGET_MS)
+    parser.add_argument("--spectate", type=int, nargs="?", const=DEFAULT_SPECTATE_PORT, metavar="PORT",
+                        help="let viewers watch the game on this port (default %d)" % DEFAULT_SPECTATE_PORT)
+    parser.add_argument("--solver-cache", metavar="FILE",
+                        help="load the AI's solved-component cache from FILE and save it back on exit")
+    parser.add_argument("--solver-workers", type=int, nargs="?", const=0, metavar="N",
+                        help="solve the AI's frontier on N worker processes (default one per core)")
+    parser.add_argument("--seed", type=int, help="board seed, the same seed and first click give the same board")
+    parser.add_argument("--stats", nargs="?", const=DEFAULT_STATS_FILE, metavar="FILE",
+                        help="record finished games in the SQLite database FILE (default %s)" % DEFAULT_STATS_FILE)
+    parser.add_argument("--endless", type=float, nargs="?", const=DEFAULT_DENSITY, metavar="DENSITY",
+                        help="play on an endless board with this share of mines (default %.2f)" % DEFAULT_DENSITY)
+    args = parser.parse_args(argv)
+
+    if args.solver_cache:
+        solver_cache.load(args.solver_cache)
+        # Stop the AI turn (if any) before saving, the cache copes with one still finishing
+        atexit.register(lambda: (ai_worker.cancel(), solver_cache.save(), print(solver_cache.report())))
+
+    # After the cache is loaded (forked workers start with a copy of it) and
+    # before anything else starts threads
+    if args.solver_workers is not None:
+        parallel_solver.start(args.solver_workers or None, (args.width or grid_width) * (args.height or grid_height))
+
+    if args.spectate:
+        spectators.start_thread(port=args.spectate)
+
+    if args.stats:
+        stats.open(args.stats)
+        atexit.register(lambda: (stats.close(), print(stats.report())))
+
+    if args.latency:
+        latency.enable(args.latency_budget)
+        atexit.register(lambda: (latency.dump(args.latency), print(latency.report())))
+
+    if args.profile:
+        profiler.enable(args.profile)
+        atexit.register(lambda: print("Profile written to " + ", ".join(profiler.export())))
+
+    if args.timing:
+        atexit.register(lambda: print(assets.report() + "\n" + audio.report() + "\n" + solver_cache.report()))
+
+    boardOptions = {}
+    if args.width:
+        boardOptions["width"] = args.width
+    if args.height:
+        boardOptions["height"] = args.height
+    if args.mines:
+        boardOptions["numMine"] = args.mines
+    if args.ai_budget:
+        boardOptions["aiBudget"] = args.ai_budget / 1000.0
+    if args.seed is not None:
+        boardOptions["seed"] = args.seed
+    if args.endless is not None:
+        boardOptions["endless"] = args.endless
+    return boardOptions, args.audio_buffer
+
 if __name__ == "__main__":
-    game = Game()
+    boardOptions, audioBuffer = parse_args()
+    game = Game(boardOptions, audioBuffer)
     game.run()
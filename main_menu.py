@@ -12,12 +12,18 @@ Creation Date: 9/2/2025
 
 import pygame
 import sys
+from assets import assets
+from profiler import profiler
+from latency import latency
 
 class MainMenu:
-    def __init__(self, gameStateManager):
+    def __init__(self, gameStateManager, boardOptions=None):
         pygame.init()
         self.gameStateManager = gameStateManager
 
+        # Extra game parameters from the command line (board width/height, mine count override)
+        self.boardOptions = boardOptions or {}
+
         # Colors
         self.WHITE = (255, 255, 255)
         self.BLACK = (0, 0, 0)
@@ -34,6 +40,7 @@ class MainMenu:
         # Fonts
         self.FONT = pygame.font.SysFont(None, 36)
         self.SMALL_FONT = pygame.font.SysFont(None, 28)
+        self.TITLE_FONT = pygame.font.SysFont("Calibri", 64, True)
        
         self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
         pygame.display.set_caption("Minesweeper - Main Menu")
@@ -58,8 +65,7 @@ class MainMenu:
         self.screen.fill(self.WHITE)
 
         # Title
-        large_font = pygame.font.SysFont("Calibri", 64, True)
-        title_text = large_font.render("Minesweeper", True, self.BLACK)
+        title_text = self.TITLE_FONT.render("Minesweeper", True, self.BLACK)
         self.screen.blit(title_text, (self.WIDTH//2 - title_text.get_width()//2, 30))
 
         # Mine count label
@@ -110,7 +116,11 @@ class MainMenu:
         start_text = self.SMALL_FONT.render("Start Game", True, self.WHITE)
         self.screen.blit(start_text, (self.start_button.centerx - start_text.get_width()//2, self.start_button.centery - start_text.get_height()//2))
         
-        pygame.display.flip()
+        profiler.draw_overlay(self.screen)
+        latency.draw_overlay(self.screen)
+        with profiler.scope("flip"):
+            pygame.display.flip()
+        latency.presented()
 
 
     # Main loop for the menu
@@ -118,44 +128,55 @@ class MainMenu:
         clock = pygame.time.Clock()
 
         while True:
-            self.draw_menu()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-                # When a button is clicked, check which one
-                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    if self.minus_button.collidepoint(event.pos):
-                        if self.mine_count > 10:
-                            self.mine_count -= 1
-
-                    elif self.plus_button.collidepoint(event.pos):
-                        if self.mine_count < 20:
-                            self.mine_count += 1
-
-                    elif self.easy_button.collidepoint(event.pos):
-                        if self.difficulty == "easy":
-                            self.difficulty = None
-                        else:
-                            self.difficulty = "easy"
+            with profiler.scope("menu draw"):
+                self.draw_menu()
+            profiler.frame_end()
+            assets.mark("first menu frame")  # Cold start ends when the menu is interactive
+            with profiler.scope("events"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        pygame.quit()
+                        sys.exit()
+
+                    elif profiler.toggle_overlay(event) or latency.toggle_overlay(event):
+                        continue
+
+                    # When a button is clicked, check which one
+                    elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                        latency.begin(event, "menu")
+                        if self.minus_button.collidepoint(event.pos):
+                            if self.mine_count > 10:
+                                self.mine_count -= 1
+
+                        elif self.plus_button.collidepoint(event.pos):
+                            if self.mine_count < 20:
+                                self.mine_count += 1
+
+                        elif self.easy_button.collidepoint(event.pos):
+                            if self.difficulty == "easy":
+                                self.difficulty = None
+                            else:
+                                self.difficulty = "easy"
                     
-                    elif self.medium_button.collidepoint(event.pos):
-                        if self.difficulty == "medium":
-                            self.difficulty = None
-                        else:
-                            self.difficulty = "medium"
-
-                    elif self.hard_button.collidepoint(event.pos):
-                        if self.difficulty == "hard":
-                            self.difficulty = None
-                        else:
-                            self.difficulty = "hard"
+                        elif self.medium_button.collidepoint(event.pos):
+                            if self.difficulty == "medium":
+                                self.difficulty = None
+                            else:
+                                self.difficulty = "medium"
+
+                        elif self.hard_button.collidepoint(event.pos):
+                            if self.difficulty == "hard":
+                                self.difficulty = None
+                            else:
+                                self.difficulty = "hard"
                     
-                    elif self.start_button.collidepoint(event.pos):
-                        # Run MineSweeper.py and pass mine_count so it can be used there
-                        self.gameStateManager.setState('mine_sweeper', {"numMine": self.mine_count, "difficulty": self.difficulty})
-                        # Return to loop in Game class
-                        return
+                        elif self.start_button.collidepoint(event.pos):
+                            # Run MineSweeper.py and pass mine_count so it can be used there
+                            params = {"numMine": self.mine_count, "difficulty": self.difficulty}
+                            params.update(self.boardOptions)
+                            self.gameStateManager.setState('mine_sweeper', params)
+                            # Return to loop in Game class
+                            return
                     
-            clock.tick(30)
+            with profiler.scope("idle"):
+                clock.tick(30)
@@ -0,0 +1,146 @@
+'''
+Module: Minimap
+Description: Small overview of the whole board for boards that don't fit in the window. Instead of
+    blitting a sprite per cell, every cell is one pixel: the cell_state codes are kept in a NumPy
+    array, turned into colours with a palette lookup and written straight into a surface with
+    pygame.surfarray. Only cells from the changed-cell list are rewritten, and the small panel is
+    only rescaled when something changed, so it stays cheap even on 1000x1000 boards.
+Inputs: Board dimensions, Grid objects, list of changed (x, y) cells, camera
+Outputs: Minimap panel drawn onto the provided surface
+External Sources: Pygame library, NumPy (optional, the minimap is disabled without it)
+    pygame.surfarray documentation - https://www.pygame.org/docs/ref/surfarray.html
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import pygame
+import cell_state
+
+try:
+    import numpy as np
+except ImportError:  # surfarray needs NumPy, the game runs without a minimap if it's missing
+    np = None
+
+# Largest side of the minimap panel (in pixels)
+MINIMAP_SIZE = 160
+
+# Space between the panel and the edge of the board view
+MINIMAP_MARGIN = 8
+
+# Colour for each cell_state code
+PALETTE = [
+    (215, 215, 215),  # 0 revealed empty
+    (170, 190, 235),  # 1
+    (130, 200, 130),  # 2
+    (235, 130, 130),  # 3
+    (110, 110, 200),  # 4
+    (190, 100, 100),  # 5
+    (90, 180, 180),   # 6
+    (60, 60, 60),     # 7
+    (120, 120, 120),  # 8
+    (140, 140, 140),  # HIDDEN
+    (230, 40, 40),    # FLAG
+    (20, 20, 20),     # MINE
+    (255, 0, 0),      # MINE_CLICKED
+    (255, 150, 0),    # MINE_FALSE
+]
+
+
+class Minimap:
+    @staticmethod
+    def available():
+        '''
+        The minimap needs NumPy for pygame.surfarray
+        '''
+
+        return np is not None
+
+    def __init__(self, cols, rows, max_size=MINIMAP_SIZE):
+        '''
+        Takes in the board dimensions (in cells) and the largest side of the panel
+        '''
+
+        self.cols = cols
+        self.rows = rows
+
+        # Panel keeps the board's aspect ratio
+        scale = max_size / max(cols, rows)
+        self.panel_size = (max(1, round(cols * scale)), max(1, round(rows * scale)))
+
+        # One pixel per cell, indexed [x, y] like surfarray
+        self.codes = np.full((cols, rows), cell_state.HIDDEN, dtype=np.uint8)
+        self.palette = np.array(PALETTE, dtype=np.uint8)
+        self.base = pygame.Surface((cols, rows), 0, 32)
+        self.panel = None
+        self.rect = pygame.Rect((0, 0), self.panel_size)
+        self.dirty = True
+
+    def reset(self, grid):
+        '''
+        Rebuilds the whole minimap from the grid (new game)
+        '''
+
+        codes = [[cell.stateCode() for cell in row] for row in grid]
+        self.codes = np.array(codes, dtype=np.uint8).T.copy()
+        pygame.surfarray.blit_array(self.base, self.palette[self.codes])
+        self.dirty = True
+
+    def update(self, changes, grid):
+        '''
+        Rewrites only the pixels of the changed (x, y) cells
+        '''
+
+        if not changes:
+            return
+
+        xs = np.fromiter((x for x, _ in changes), dtype=np.intp, count=len(changes))
+        ys = np.fromiter((y for _, y in changes), dtype=np.intp, count=len(changes))
+        self.codes[xs, ys] = [grid[y][x].stateCode() for x, y in changes]
+
+        # pixels3d is a direct view of the surface, it has to be released before blitting
+        pixels = pygame.surfarray.pixels3d(self.base)
+        pixels[xs, ys] = self.palette[self.codes[xs, ys]]
+        del pixels
+        self.dirty = True
+
+    def place(self, view):
+        '''
+        Puts the panel in the bottom right corner of the board view
+        '''
+
+        self.rect.bottomright = (view.right - MINIMAP_MARGIN, view.bottom - MINIMAP_MARGIN)
+
+    def draw(self, surface, camera):
+        '''
+        Draws the panel and the outline of the area the camera is showing
+        '''
+
+        if self.dirty or self.panel is None:
+            if self.panel_size[0] < self.cols:
+                self.panel = pygame.transform.smoothscale(self.base, self.panel_size)
+            else:
+                self.panel = pygame.transform.scale(self.base, self.panel_size)
+            self.dirty = False
+
+        surface.blit(self.panel, self.rect)
+        pygame.draw.rect(surface, (0, 0, 0), self.rect.inflate(2, 2), 1)
+
+        # Camera outline
+        x0, y0, x1, y1 = camera.visible_cells()
+        sx = self.panel_size[0] / self.cols
+        sy = self.panel_size[1] / self.rows
+        outline = pygame.Rect(self.rect.x + int(x0 * sx), self.rect.y + int(y0 * sy),
+                              max(2, int((x1 - x0) * sx)), max(2, int((y1 - y0) * sy)))
+        pygame.draw.rect(surface, (255, 255, 0), outline, 1)
+
+    def cell_at(self, pos):
+        '''
+        Converts a screen position on the panel into (x, y) board cell coordinates.
+        Returns None if the position is not on the panel.
+        '''
+
+        if not self.rect.collidepoint(pos):
+            return None
+        x = (pos[0] - self.rect.x) * self.cols // self.panel_size[0]
+        y = (pos[1] - self.rect.y) * self.rows // self.panel_size[1]
+        return min(x, self.cols - 1), min(y, self.rows - 1)
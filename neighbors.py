@@ -0,0 +1,168 @@
+'''
+Module: Neighbour tables
+Description: Precomputed neighbour lists for a board shape, shared by the generator, the flood fills,
+    the AI and the solver so none of them redo the offset and bounds checks per cell. A table is
+    stored CSR style in two flat arrays: the neighbours of cell i (index = y * cols + x) are
+    indexes[offsets[i]:offsets[i + 1]]. Tables are built once per (cols, rows, topology) and
+    cached, least recently used first out once the cached tables pass TABLE_CACHE_CELLS cells
+    (a table is about 36 bytes a cell). cell_neighbors() works out a single cell without a
+    table, for callers that only need a few cells of a board. The topology decides who is a neighbour, so another board shape is just another
+    entry in TOPOLOGIES:
+        square - the usual 8 neighbours, edges are walls
+        torus  - 8 neighbours, the edges wrap around
+        hex    - 6 neighbours, odd rows are shifted half a cell to the right
+    Big tables are built with NumPy when it's installed, cell by cell otherwise.
+Inputs: Board size, topology
+Outputs: NeighborTable
+External Sources: Compressed sparse row - https://en.wikipedia.org/wiki/Sparse_matrix#Compressed_sparse_row_(CSR,_CRS_or_Yale_format)
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import threading
+from array import array
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # Tables are built in plain Python without NumPy
+    np = None
+
+# Cells of all the tables kept in the cache together, a bigger table is built but not kept
+TABLE_CACHE_CELLS = 2 * 1000 * 1000
+
+# Smaller boards are built in plain Python even with NumPy around
+NUMPY_MIN_CELLS = 4096
+
+# Offsets (dx, dy) on the square grid, in reading order
+SQUARE_OFFSETS = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy]
+
+# Topology name -> (offsets for each row parity (even, odd), whether the edges wrap around)
+TOPOLOGIES = {
+    "square": ((SQUARE_OFFSETS, SQUARE_OFFSETS), False),
+    "torus": ((SQUARE_OFFSETS, SQUARE_OFFSETS), True),
+    "hex": (([(-1, -1), (0, -1), (-1, 0), (1, 0), (-1, 1), (0, 1)],
+             [(0, -1), (1, -1), (-1, 0), (1, 0), (0, 1), (1, 1)]), False),
+}
+
+
+def cell_neighbors(cols, rows, index, topology="square"):
+    '''
+    Neighbour indexes of one cell, in the same order as its row of a NeighborTable
+    '''
+
+    row_offsets, wrap = TOPOLOGIES[topology]
+    y, x = divmod(index, cols)
+    deltas = row_offsets[y & 1]
+    if not wrap:
+        return [(y + dy) * cols + x + dx for dx, dy in deltas if 0 <= x + dx < cols and 0 <= y + dy < rows]
+    cells = []
+    for dx, dy in deltas:
+        cell = (y + dy) % rows * cols + (x + dx) % cols
+        if cell != index and cell not in cells:  # Boards under 3 wide reach a cell twice
+            cells.append(cell)
+    return cells
+
+
+def _build_python(cols, rows, row_offsets, wrap):
+    offsets = array("i", [0])
+    indexes = array("i")
+    for y in range(rows):
+        deltas = row_offsets[y & 1]
+        for x in range(cols):
+            if wrap:
+                cells = []
+                for dx, dy in deltas:
+                    cell = (y + dy) % rows * cols + (x + dx) % cols
+                    if cell != y * cols + x and cell not in cells:  # Boards under 3 wide reach a cell twice
+                        cells.append(cell)
+                indexes.extend(cells)
+            else:
+                indexes.extend((y + dy) * cols + x + dx for dx, dy in deltas
+                               if 0 <= x + dx < cols and 0 <= y + dy < rows)
+            offsets.append(len(indexes))
+    return offsets, indexes
+
+
+def _build_numpy(cols, rows, row_offsets, wrap):
+    deltas = np.array(row_offsets, dtype=np.int64)               # (2, k, 2)
+    per_row = deltas[np.arange(rows) & 1]                        # (rows, k, 2)
+    xs = np.arange(cols).reshape(1, cols, 1) + per_row[:, None, :, 0]
+    ys = np.arange(rows).reshape(rows, 1, 1) + per_row[:, None, :, 1]
+    if wrap:
+        xs %= cols
+        ys %= rows
+        valid = np.ones(xs.shape, dtype=bool)
+    else:
+        valid = (xs >= 0) & (xs < cols) & (ys >= 0) & (ys < rows)
+    counts = valid.sum(axis=2).ravel()
+    offsets = np.zeros(rows * cols + 1, dtype=np.int32)
+    np.cumsum(counts, out=offsets[1:])
+    indexes = (ys * cols + xs)[valid].astype(np.int32)
+    return array("i", offsets.tobytes()), array("i", indexes.tobytes())
+
+
+class NeighborTable:
+    __slots__ = ("cols", "rows", "topology", "offsets", "indexes")
+
+    def __init__(self, cols, rows, topology="square"):
+        '''
+        Builds the table, use neighbor_table() to get the cached one
+        '''
+
+        if topology not in TOPOLOGIES:
+            raise ValueError("unknown topology %r (expected one of %s)" % (topology, ", ".join(TOPOLOGIES)))
+        self.cols = cols
+        self.rows = rows
+        self.topology = topology
+        row_offsets, wrap = TOPOLOGIES[topology]
+        small = cols * rows < NUMPY_MIN_CELLS or (wrap and min(cols, rows) < 3)
+        build = _build_python if np is None or small else _build_numpy
+        self.offsets, self.indexes = build(cols, rows, row_offsets, wrap)
+
+    def __len__(self):
+        return self.cols * self.rows
+
+    def of(self, index):
+        '''
+        Neighbour indexes of cell index
+        '''
+
+        return self.indexes[self.offsets[index]:self.offsets[index + 1]]
+
+    def of_cell(self, x, y):
+        '''
+        Neighbours of (x, y) as (x, y) pairs
+        '''
+
+        cols = self.cols
+        return [(index % cols, index // cols) for index in self.of(y * cols + x)]
+
+
+# (cols, rows, topology) -> NeighborTable, least recently used first
+_tables = OrderedDict()
+_tables_lock = threading.Lock()  # The server and the AI ask for tables from other threads
+
+
+def neighbor_table(cols, rows, topology="square"):
+    '''
+    The shared NeighborTable of a board shape
+    '''
+
+    key = (cols, rows, topology)
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is not None:
+            _tables.move_to_end(key)
+            return table
+
+    table = NeighborTable(cols, rows, topology)
+    if len(table) > TABLE_CACHE_CELLS:
+        return table
+    with _tables_lock:
+        _tables[key] = table
+        total = sum(len(cached) for cached in _tables.values())
+        while total > TABLE_CACHE_CELLS:
+            _, dropped = _tables.popitem(last=False)
+            total -= len(dropped)
+    return table
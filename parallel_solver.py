@@ -0,0 +1,259 @@
+'''
+Module: Parallel solver
+Description: Solves the frontier components of one AI turn on a pool of worker processes, for
+    very large boards with wide frontiers. The visible board (one cell_state code per cell) is
+    copied into a multiprocessing.shared_memory block once per turn; workers map it by name and
+    read it in place, so the board is never pickled. The block is sized for the board when the
+    pool starts; a bigger board gets a new block that the workers switch to on their next task,
+    so the pool itself is only ever started once, by start(). The constraint groups (number cell
+    indexes, see frontier.constraint_groups) are dealt into TASKS_PER_WORKER small packed tasks
+    per worker. A worker rebuilds its components from the shared board, looks them up in its own
+    copy of the solver cache (inherited when the pool forks, so load the cache file before
+    start()) or enumerates them, and sends back packed arrays of results. Tasks come back as they
+    finish and are merged into this process's cache right away, so a turn that runs out of time
+    still keeps what was solved. Every turn has a number shared with the workers; a stopped
+    turn bumps it, and its tasks that are still queued or running give up at their next
+    component instead of holding up the next turn. Small turns (fewer than
+    MIN_PARALLEL_COMPONENTS components) are solved right here.
+Inputs: BoardSnapshot, worker count
+Outputs: Mine probability per frontier cell
+External Sources: multiprocessing.shared_memory - https://docs.python.org/3/library/multiprocessing.shared_memory.html
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import atexit
+import multiprocessing
+import os
+import time
+from array import array
+from multiprocessing import shared_memory
+
+import frontier
+
+# Turns with fewer unsolved components than this are solved in this process
+MIN_PARALLEL_COMPONENTS = 8
+
+# How often a waiting turn checks whether it should stop (seconds)
+POLL_INTERVAL = 0.005
+
+# Tasks per worker in a turn, more of them means less is lost when a turn is stopped
+TASKS_PER_WORKER = 4
+
+# Cells the shared board holds when start() isn't told the board size
+DEFAULT_CELLS = 1 << 16
+
+# The board and the current turn number as seen by a worker process
+_worker_board = None
+_worker_turn = None
+
+
+def _start_worker(name, turn):
+    '''
+    Worker start-up: keeps the shared turn number and maps the shared board
+    '''
+
+    global _worker_turn
+    _worker_turn = turn
+    _attach(name)
+
+
+def _attach(name):
+    '''
+    Worker: maps the shared board called name (at start-up, and again
+    after the main process replaced it with a bigger one)
+    '''
+
+    global _worker_board
+    if _worker_board is not None:
+        if _worker_board.name == name:
+            return
+        _worker_board.close()
+    try:
+        _worker_board = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Before Python 3.13, the pool shares our resource tracker so tracking is harmless
+        _worker_board = shared_memory.SharedMemory(name=name)
+
+
+def _solve_groups(task):
+    '''
+    Worker: builds and solves the packed constraint groups of one task, using this
+    process's own copy of the solver cache. Returns packed results per group:
+    cell count, cell indexes, canonical order, probabilities (only for solvable
+    groups), solve seconds, solved and cache hit flags, plus the cache keys.
+    '''
+
+    name, turn, cols, rows, packed = task
+    empty = ("", b"", b"", b"", b"", b"", b"", b"")
+    if _worker_turn.value != turn:
+        return empty  # Left over from a stopped turn, the board may not even be there any more
+    _attach(name)
+    codes = _worker_board.buf
+    groups = array("i")
+    groups.frombytes(packed)
+    cache = frontier.solver_cache
+    counts, cells, orders = array("i"), array("i"), array("i")
+    probabilities, seconds, solved, hits = array("d"), array("d"), array("b"), array("b")
+    keys = []
+
+    position = 0
+    while position < len(groups):
+        if _worker_turn.value != turn:
+            return empty  # The turn was stopped, nobody is waiting for this any more
+        size = groups[position]
+        group = groups[position + 1:position + 1 + size]
+        position += 1 + size
+
+        component = frontier.build_component(codes, cols, rows, group)
+        found, result, key, order = cache.lookup(component)
+        if found:
+            solve_seconds = cache.entries[key][0]
+        else:
+            start = time.perf_counter()
+            result = frontier.enumerate_component(component)
+            solve_seconds = time.perf_counter() - start
+            cache.remember(key, order, result, solve_seconds)
+
+        keys.append(key)
+        seconds.append(solve_seconds)
+        hits.append(found)
+        solved.append(result is not None)
+        counts.append(len(component.cells))
+        cells.extend(y * cols + x for x, y in component.cells)
+        orders.extend(order)
+        if result is not None:
+            probabilities.extend(result)
+    return ("\n".join(keys), counts.tobytes(), cells.tobytes(), orders.tobytes(),
+            probabilities.tobytes(), seconds.tobytes(), solved.tobytes(), hits.tobytes())
+
+
+class ParallelSolver:
+    def __init__(self):
+        '''
+        Nothing runs until start() is called
+        '''
+
+        self.workers = 0
+        self.pool = None
+        self.board = None
+        self.turn = None  # Number of the running turn, shared with the workers
+
+    @property
+    def enabled(self):
+        return self.workers > 0
+
+    def start(self, workers=None, cells=DEFAULT_CELLS):
+        '''
+        Uses workers processes (default: one per core) and a shared board for boards of up to
+        cells cells. Call this early, before other threads are running, since the pool may be
+        started by forking. This is the only place the pool is started.
+        '''
+
+        self.workers = workers or os.cpu_count() or 1
+        self._ensure(cells)
+        self.turn = multiprocessing.RawValue("q", 0)
+        self.pool = multiprocessing.Pool(self.workers, initializer=_start_worker, initargs=(self.board.name, self.turn))
+        atexit.register(self.close)
+
+    def _ensure(self, size):
+        '''
+        Makes sure the shared board holds size cells. A smaller one is replaced by a new
+        block, which the running workers map on their next task.
+        '''
+
+        if self.board is not None and self.board.size >= size:
+            return
+        self._free_board()
+        self.board = shared_memory.SharedMemory(create=True, size=size)
+
+    def _free_board(self):
+        if self.board is not None:
+            self.board.close()
+            self.board.unlink()  # Workers still mapping it keep it until they switch
+            self.board = None
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+        self._free_board()
+
+    def solve(self, snap, should_stop=lambda: False, cache=None):
+        '''
+        Same as frontier.solve(), with the cache misses solved by the workers. A stopped
+        turn returns what the tasks finished so far had found.
+        '''
+
+        cache = cache or frontier.solver_cache
+        cols, rows = snap.cols, snap.rows
+        codes = frontier.visible_codes(snap)
+        if should_stop():
+            return {}
+        groups = frontier.constraint_groups(codes, cols, rows, should_stop)
+        if groups is None:
+            return {}
+
+        probabilities = {}
+        if len(groups) < MIN_PARALLEL_COMPONENTS:
+            for group in groups:
+                if should_stop():
+                    break
+                component = frontier.build_component(codes, cols, rows, group)
+                result = cache.solve(component)
+                if result is not None:
+                    probabilities.update(zip(component.cells, result))
+            return probabilities
+
+        self.turn.value += 1
+        turn = self.turn.value
+        self._ensure(len(codes))
+        self.board.buf[:len(codes)] = codes
+
+        # Deal the groups out round robin, biggest first
+        shares = [array("i") for _ in range(min(self.workers * TASKS_PER_WORKER, len(groups)))]
+        for number, group in enumerate(sorted(groups, key=len, reverse=True)):
+            share = shares[number % len(shares)]
+            share.append(len(group))
+            share.extend(group)
+
+        tasks = [(self.board.name, turn, cols, rows, share.tobytes()) for share in shares]
+        results = self.pool.imap_unordered(_solve_groups, tasks)
+        for _ in tasks:
+            while True:
+                if should_stop():
+                    self.turn.value += 1  # Tasks still queued or running give up
+                    return probabilities
+                try:
+                    packed = results.next(POLL_INTERVAL)
+                    break
+                except multiprocessing.TimeoutError:
+                    pass
+            self._merge(packed, cols, probabilities, cache)
+        return probabilities
+
+    def _merge(self, packed, cols, probabilities, cache):
+        '''
+        Adds one task's packed results to probabilities and to the cache
+        '''
+
+        keys, *packed = packed
+        arrays = [array(code) for code in ("i", "i", "i", "d", "d", "b", "b")]
+        for result_array, data in zip(arrays, packed):
+            result_array.frombytes(data)
+        counts, cells, orders, values, seconds, solved, hits = arrays
+
+        cell_position = value_position = 0
+        for key, count, solve_seconds, ok, hit in zip(keys.split("\n"), counts, seconds, solved, hits):
+            order = list(orders[cell_position:cell_position + count])
+            result = None
+            if ok:
+                result = list(values[value_position:value_position + count])
+                value_position += count
+                for index, p in zip(cells[cell_position:cell_position + count], result):
+                    probabilities[(index % cols, index // cols)] = p
+            cache.merge(key, order, result, solve_seconds, hit)
+            cell_position += count
+
+
+# Shared by the whole process (the AI worker thread uses it once started)
+parallel_solver = ParallelSolver()
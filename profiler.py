@@ -0,0 +1,235 @@
+'''
+Module: Frame profiler
+Description: Lightweight scoped timers for the game loops. Code is wrapped in
+    `with profiler.scope("name"):` blocks; while the profiler is disabled scope() hands back one
+    shared do-nothing context manager, so the hooks cost next to nothing. When enabled, every
+    scope is recorded with its start time and duration, per-frame totals feed an on-screen overlay
+    (F3 toggles it), and on exit the recording is written as a Chrome trace-event JSON file
+    (open it in chrome://tracing or https://ui.perfetto.dev) plus a CSV summary per scope, so a
+    slow frame can be looked at after the fact. Scopes may be recorded from any thread (the AI
+    worker times its turns), so recording, frame ends and exports share one lock.
+Inputs: Scope names, frame boundaries
+Outputs: On-screen overlay, trace JSON and CSV summary files
+External Sources: Pygame library
+    Trace event format - https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import collections
+import csv
+import json
+import os
+import threading
+import time
+
+import pygame
+
+# Most trace events kept in memory (oldest are dropped first)
+MAX_TRACE_EVENTS = 200000
+
+# Frames kept for the overlay and frame time statistics
+MAX_FRAMES = 600
+
+# Recent durations kept per scope for the p95 column of the CSV
+MAX_SAMPLES = 10000
+
+
+class _NullScope:
+    '''
+    Shared context manager used while profiling is off
+    '''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class Profiler:
+    def __init__(self):
+        '''
+        Starts disabled. enable() turns recording on.
+        '''
+
+        self.enabled = False
+        self.show_overlay = True
+        self.output_dir = "."
+        self.origin = time.perf_counter()
+        self.events = collections.deque(maxlen=MAX_TRACE_EVENTS)  # (name, start, end, thread id)
+        self.frames = collections.deque(maxlen=MAX_FRAMES)        # (frame seconds, {scope: seconds})
+        self.totals = {}                                          # scope -> [count, total, max, recent durations]
+        self._current = {}
+        self._frame_start = None
+        self._font = None
+        self._lock = threading.Lock()
+
+    def enable(self, output_dir="."):
+        '''
+        Turns recording on. Trace files are written to output_dir by export()
+        '''
+
+        self.enabled = True
+        self.output_dir = output_dir
+        self.origin = time.perf_counter()
+        self._frame_start = self.origin
+
+    def scope(self, name):
+        '''
+        Context manager timing the code inside it
+        '''
+
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def record(self, name, start, end):
+        '''
+        Stores one timed scope
+        '''
+
+        with self._lock:
+            self._record(name, start, end)
+
+    def _record(self, name, start, end):
+        self.events.append((name, start, end, threading.get_ident()))
+        self._current[name] = self._current.get(name, 0.0) + (end - start)
+        totals = self.totals.get(name)
+        if totals is None:
+            totals = self.totals[name] = [0, 0.0, 0.0, collections.deque(maxlen=MAX_SAMPLES)]
+        totals[0] += 1
+        totals[1] += end - start
+        totals[2] = max(totals[2], end - start)
+        totals[3].append(end - start)
+
+    def frame_end(self):
+        '''
+        Marks the end of a frame (call right after the display flip)
+        '''
+
+        if not self.enabled:
+            return
+        with self._lock:
+            now = time.perf_counter()
+            self._record("frame", self._frame_start, now)
+            self.frames.append((now - self._frame_start, self._current))
+            self._current = {}
+            self._frame_start = now
+
+    def toggle_overlay(self, event):
+        '''
+        F3 shows/hides the overlay. Returns True if the event was used.
+        '''
+
+        if self.enabled and event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.show_overlay = not self.show_overlay
+            return True
+        return False
+
+    def draw_overlay(self, surface):
+        '''
+        Draws the last frame's scope times and the average frame time in the top left corner
+        '''
+
+        if not (self.enabled and self.show_overlay and self.frames):
+            return
+        if self._font is None:
+            self._font = pygame.font.SysFont(None, 18)
+
+        frame_time, scopes = self.frames[-1]
+        recent = list(self.frames)[-60:]
+        average = sum(f for f, _ in recent) / len(recent)
+        lines = ["frame %.1f ms (avg %.1f ms)" % (frame_time * 1000, average * 1000)]
+        for name, seconds in sorted(scopes.items(), key=lambda item: -item[1]):
+            if name != "frame":
+                lines.append("%-12s %6.2f ms" % (name, seconds * 1000))
+
+        texts = [self._font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(text.get_width() for text in texts) + 8
+        height = sum(text.get_height() for text in texts) + 8
+        panel = pygame.Surface((width, height))
+        panel.set_alpha(180)
+        panel.fill((0, 0, 0))
+        surface.blit(panel, (0, 0))
+        y = 4
+        for text in texts:
+            surface.blit(text, (4, y))
+            y += text.get_height()
+
+    def export_chrome_trace(self, path):
+        '''
+        Writes every recorded scope as a Chrome trace-event JSON file
+        '''
+
+        with self._lock:
+            recorded = list(self.events)
+        events = []
+        for name, start, end, thread in recorded:
+            events.append({
+                "name": name,
+                "cat": "frame" if name == "frame" else "game",
+                "ph": "X",
+                "ts": (start - self.origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": thread,
+            })
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export_csv(self, path):
+        '''
+        Writes count, total, mean, p95 (of recent samples) and max time (ms) for every scope
+        '''
+
+        with self._lock:
+            totals = [(name, count, total, longest, sorted(recent))
+                      for name, (count, total, longest, recent) in self.totals.items()]
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["scope", "count", "total_ms", "mean_ms", "p95_ms", "max_ms"])
+            for name, count, total, longest, ordered in sorted(totals):
+                writer.writerow([
+                    name,
+                    count,
+                    "%.3f" % (total * 1000),
+                    "%.3f" % (total / count * 1000),
+                    "%.3f" % (ordered[int(0.95 * (len(ordered) - 1))] * 1000),
+                    "%.3f" % (longest * 1000),
+                ])
+
+    def export(self):
+        '''
+        Writes trace.json and profile.csv into the output folder.
+        Returns the paths written (none if profiling is off).
+        '''
+
+        if not self.enabled:
+            return []
+        os.makedirs(self.output_dir, exist_ok=True)
+        trace_path = os.path.join(self.output_dir, "trace.json")
+        csv_path = os.path.join(self.output_dir, "profile.csv")
+        self.export_chrome_trace(trace_path)
+        self.export_csv(csv_path)
+        return [trace_path, csv_path]
+
+
+# Shared by the whole process
+profiler = Profiler()
@@ -0,0 +1,252 @@
+'''
+Module: Multi-game server
+Description: asyncio TCP server that hosts many independent headless games (board.Board) in one
+    process. Clients speak a compact line protocol, one request per line and one response line
+    per request, so requests can be pipelined:
+
+        N <cols> <rows> <mines>   new game             -> G <id>
+        R <id> <x> <y>            reveal               -> D <id> <status> <index>:<char> ...
+        F <id> <x> <y>            flag / unflag        -> D <id> <status> <index>:<char> ...
+        S <id>                    full board           -> B <id> <cols> <rows> <status> <chars>
+        Q <id>                    end game             -> K <id>
+        I                         server info          -> I games=<n> connections=<n> max_rss_kb=<n>
+        anything wrong                                 -> E <message>
+
+    <status> is p (playing), w (win) or l (loss). D lines only list the cells that changed,
+    <index> is y * cols + x and <char> comes from cell_state.CODE_CHARS. Games belong to the
+    connection that created them and are dropped when it closes. An unstarted game is a Board
+    with one small bytearray, so tens of thousands of idle games fit in a few megabytes; big
+    games with few mines get a sparse_board.SparseBoard (see board.new_board). N is refused above
+    MAX_CELLS cells or MAX_DENSITY mines per cell, and reveals and full board requests on games of
+    THREAD_CELLS cells or more (placing the mines, flood fills, a loss, building the neighbour
+    table) run on a worker thread, so one client can't hold up the event loop for everyone else.
+    A request line longer than the stream limit drops the connection. With --spectate-port any
+    game can be watched through spectate.SpectatorServer; a viewer joining a game that is busy on
+    a worker thread waits for it to finish.
+Inputs: TCP connections on localhost
+Outputs: Protocol responses
+External Sources: asyncio streams - https://docs.python.org/3/library/asyncio-stream.html
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import argparse
+import asyncio
+import itertools
+import sys
+
+import cell_state
+from board import new_board, PLAYING, WIN
+from spectate import SpectatorServer, DEFAULT_SPECTATE_PORT
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Largest board a client may ask for
+MAX_CELLS = 1000 * 1000
+
+# Most mines per cell a client may ask for (Expert is about 0.21). Mines are placed by
+# rejection sampling, which slows down more and more as the board fills up
+MAX_DENSITY = 0.25
+
+# Reveals and full boards of games with at least this many cells run off the event loop
+THREAD_CELLS = 100 * 1000
+
+# Longest request line (bytes), a longer one drops the connection
+MAX_LINE = 1024 * 1024
+
+# Flush the socket once this much output is waiting
+WRITE_HIGH_WATER = 64 * 1024
+
+_STATUS_CHAR = {PLAYING: "p", WIN: "w"}
+
+
+def status_char(board):
+    return _STATUS_CHAR.get(board.status, "l")
+
+
+class GameServer:
+    def __init__(self, spectators=None):
+        '''
+        Keeps every game by id and counts open connections.
+        spectators is an optional SpectatorServer that gets every change.
+        '''
+
+        self.games = {}
+        self.ids = itertools.count(1)
+        self.connections = 0
+        self.spectators = spectators
+        self.busy = {}  # game id -> asyncio.Event set when its request on a worker thread is done
+
+    async def watch_info(self, game_id):
+        '''
+        Board for a new spectator broadcast (see SpectatorServer), once no
+        worker thread is changing it
+        '''
+
+        while game_id in self.busy:
+            await self.busy[game_id].wait()
+        board = self.games.get(game_id)
+        if board is None:
+            return None
+        return board.cols, board.rows, board.codes, status_char(board)
+
+    def dispatch(self, line, owned):
+        '''
+        Handles one request line. owned is the set of game ids of the
+        calling connection. Returns the response line (without newline).
+        '''
+
+        parts = line.split()
+        if not parts:
+            return "E empty request"
+        command = parts[0]
+        try:
+            if command == "N":
+                cols, rows, mines = int(parts[1]), int(parts[2]), int(parts[3])
+                if cols < 3 or rows < 3 or cols * rows > MAX_CELLS or mines < 1:
+                    return "E bad board size"
+                if mines > cols * rows * MAX_DENSITY:
+                    return "E too many mines"
+                game_id = next(self.ids)
+                self.games[game_id] = new_board(cols, rows, mines)
+                owned.add(game_id)
+                return "G %d" % game_id
+
+            if command == "I":
+                return "I games=%d connections=%d max_rss_kb=%d" % (
+                    len(self.games), self.connections, max_rss_kb())
+
+            game_id = int(parts[1])
+            if game_id not in owned:
+                return "E unknown game %d" % game_id
+            board = self.games[game_id]
+
+            if command == "R" or command == "F":
+                x, y = int(parts[2]), int(parts[3])
+                if command == "R":
+                    changes = board.reveal(x, y)
+                else:
+                    changes = board.toggle_flag(x, y)
+                if changes and self.spectators:
+                    self.spectators.publish(game_id, changes, status_char(board))
+                chars = cell_state.CODE_CHARS
+                cols = board.cols
+                cells = " ".join("%d:%s" % (cy * cols + cx, chars[code]) for cx, cy, code in changes)
+                return "D %d %s %s" % (game_id, status_char(board), cells)
+
+            if command == "S":
+                return "B %d %d %d %s %s" % (game_id, board.cols, board.rows, status_char(board), board.text())
+
+            if command == "Q":
+                owned.discard(game_id)
+                del self.games[game_id]
+                if self.spectators:
+                    self.spectators.close_game(game_id)
+                return "K %d" % game_id
+
+        except (IndexError, ValueError):
+            return "E bad arguments"
+        return "E unknown command %s" % command
+
+    def threaded_game(self, line, owned):
+        '''
+        Id of the game if the request is a reveal or full board of a big game,
+        which should be dispatched on a worker thread, otherwise None
+        '''
+
+        parts = line.split()
+        if len(parts) < 2 or parts[0] not in ("R", "S"):
+            return None
+        try:
+            game_id = int(parts[1])
+        except ValueError:
+            return None
+        board = self.games.get(game_id) if game_id in owned else None
+        if board is None or board.cols * board.rows < THREAD_CELLS:
+            return None
+        return game_id
+
+    async def handle(self, reader, writer):
+        '''
+        Serves one connection until it closes
+        '''
+
+        self.connections += 1
+        owned = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    break  # Longer than MAX_LINE, the rest of the stream can't be trusted
+                if not line:
+                    break
+                request = line.decode("ascii", "replace")
+                game_id = self.threaded_game(request, owned)
+                if game_id is None:
+                    response = self.dispatch(request, owned)
+                else:
+                    # Requests of one connection are handled in order and viewers wait
+                    # on busy, so nothing else touches this game meanwhile
+                    done = self.busy[game_id] = asyncio.Event()
+                    try:
+                        response = await asyncio.to_thread(self.dispatch, request, owned)
+                    finally:
+                        del self.busy[game_id]
+                        done.set()
+                writer.write(response.encode("ascii") + b"\n")
+
+                # The transport sends right away, only wait on the socket when a lot of output is queued
+                if writer.transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for game_id in owned:
+                self.games.pop(game_id, None)
+                if self.spectators:
+                    self.spectators.close_game(game_id)
+            self.connections -= 1
+            writer.close()
+
+
+def max_rss_kb():
+    '''
+    Peak memory of this process in KB (0 if unknown)
+    '''
+
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, spectate_port=None):
+    game_server = GameServer()
+    if spectate_port:
+        game_server.spectators = SpectatorServer(game_server.watch_info)
+        await game_server.spectators.start(host, spectate_port)
+        print("Spectators on %s:%d" % (host, spectate_port))
+    server = await asyncio.start_server(game_server.handle, host, port, limit=MAX_LINE)
+    print("Minesweeper server listening on %s:%d" % (host, port))
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host many headless Minesweeper games over TCP")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--spectate-port", type=int, nargs="?", const=DEFAULT_SPECTATE_PORT,
+                        help="let viewers watch games on this port (default %d)" % DEFAULT_SPECTATE_PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.spectate_port))
+    except KeyboardInterrupt:
+        pass
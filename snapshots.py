@@ -0,0 +1,178 @@
+'''
+Module: Copy-on-write snapshots
+Description: Persistent board state for undo/redo and "what if" look-ahead. CowCells is a byte
+    array (one cell_state code per cell) split into chunks of about sqrt(cells) bytes. snapshot()
+    is O(1): the snapshot shares the chunk list, and the live array copies the list and a chunk
+    only the first time it writes to them afterwards. Branches made with fork() work the same
+    way, so any number of snapshots of a big board cost only the chunks that really changed.
+    restore() is O(1) as well, and changed_cells() finds what differs between two versions by
+    comparing chunk identity first, so redrawing after an undo only touches changed chunks.
+
+    UndoHistory keeps the undo and redo stacks of (snapshot, extra) pairs for the game.
+Inputs: Cell codes
+Outputs: Snapshots, changed cells
+External Sources: Persistent data structure - https://en.wikipedia.org/wiki/Persistent_data_structure
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+# Chunks are at least this many bytes (as a power of two)
+MIN_CHUNK_BITS = 6
+
+# Undo steps kept by default
+UNDO_LIMIT = 500
+
+
+def chunk_bits(length):
+    '''
+    Chunk size (as a power of two) of about sqrt(length) bytes
+    '''
+
+    return max(MIN_CHUNK_BITS, (length.bit_length() + 1) // 2)
+
+
+class CowCells:
+    __slots__ = ("length", "bits", "chunks", "owned", "list_shared", "frozen")
+
+    def __init__(self, data, bits=None):
+        '''
+        Copies data (bytes-like, one code per cell) into chunks
+        '''
+
+        self.length = len(data)
+        self.bits = chunk_bits(self.length) if bits is None else bits
+        size = 1 << self.bits
+        self.chunks = [bytearray(data[start:start + size]) for start in range(0, self.length, size)]
+        self.owned = set(range(len(self.chunks)))
+        self.list_shared = False
+        self.frozen = False
+
+    @classmethod
+    def _sharing(cls, other, frozen):
+        '''
+        New CowCells on other's chunks without copying anything
+        '''
+
+        cells = cls.__new__(cls)
+        cells.length = other.length
+        cells.bits = other.bits
+        cells.chunks = other.chunks
+        cells.owned = set()
+        cells.list_shared = True
+        cells.frozen = frozen
+        return cells
+
+    def snapshot(self):
+        '''
+        Read-only copy of the current state, O(1)
+        '''
+
+        if self.frozen:
+            return self
+        snap = CowCells._sharing(self, True)
+        self.owned = set()
+        self.list_shared = True
+        return snap
+
+    def fork(self):
+        '''
+        Writable copy (a branch for look-ahead), O(1)
+        '''
+
+        if not self.frozen:
+            self.owned = set()
+            self.list_shared = True
+        return CowCells._sharing(self, False)
+
+    def restore(self, snap):
+        '''
+        Makes this array equal to snap again, O(1)
+        '''
+
+        self.chunks = snap.chunks
+        self.owned = set()
+        self.list_shared = True
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        return self.chunks[index >> self.bits][index & ((1 << self.bits) - 1)]
+
+    def __setitem__(self, index, value):
+        if self.frozen:
+            raise TypeError("snapshots are read-only, fork() one to change it")
+        chunk = index >> self.bits
+        if chunk not in self.owned:
+            if self.list_shared:
+                self.chunks = list(self.chunks)
+                self.list_shared = False
+            self.chunks[chunk] = bytearray(self.chunks[chunk])
+            self.owned.add(chunk)
+        self.chunks[chunk][index & ((1 << self.bits) - 1)] = value
+
+    def tobytes(self):
+        return b"".join(self.chunks)
+
+    def changed_cells(self, other):
+        '''
+        Indexes of the cells that differ from other (another version of the same board).
+        Chunks that are still shared are skipped without looking at their contents.
+        '''
+
+        changed = []
+        for number, (mine, theirs) in enumerate(zip(self.chunks, other.chunks)):
+            if mine is theirs or mine == theirs:
+                continue
+            base = number << self.bits
+            changed.extend(base + offset for offset, (a, b) in enumerate(zip(mine, theirs)) if a != b)
+        return changed
+
+    def shared_chunks(self, other):
+        '''
+        How many chunks this version shares with other (memory not duplicated)
+        '''
+
+        return sum(mine is theirs for mine, theirs in zip(self.chunks, other.chunks))
+
+
+class UndoHistory:
+    def __init__(self, limit=UNDO_LIMIT):
+        '''
+        Undo and redo stacks of (snapshot, extra) entries, extra is anything
+        the caller needs next to the cells (e.g. the game status)
+        '''
+
+        self.limit = limit
+        self.undo_stack = []
+        self.redo_stack = []
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def push(self, entry):
+        '''
+        Saves the state before a move, a new move drops everything that could be redone
+        '''
+
+        self.undo_stack.append(entry)
+        self.redo_stack.clear()
+        if len(self.undo_stack) > self.limit:
+            del self.undo_stack[0]
+
+    def undo(self, current):
+        '''
+        Returns the entry to go back to (current goes onto the redo stack), or None
+        '''
+
+        if not self.undo_stack:
+            return None
+        self.redo_stack.append(current)
+        return self.undo_stack.pop()
+
+    def redo(self, current):
+        if not self.redo_stack:
+            return None
+        self.undo_stack.append(current)
+        return self.redo_stack.pop()
@@ -0,0 +1,447 @@
+'''
+Module: Sparse board
+Description: A headless board for giant, low-density boards that stores nothing per cell. board.Board
+    keeps two bytes for every cell, which is almost all hidden empty space on a big board with
+    few mines. A SparseBoard keeps:
+        mines    - the mine indexes (y * cols + x) in one sorted array, 8 bytes a mine
+        numbers  - worked out when asked for, BLOCK cells of a row at a time, from the mines of
+                   the 3 rows around them (two binary searches per row), and kept in a small
+                   cache that drops the oldest block first
+        revealed - per row, the sorted [start, end) runs of revealed cells
+        flagged  - the same for flags
+    so its memory grows with the mines and the edges of the revealed area, not with the board.
+    A lost game isn't written out either: code() works out mines and wrong flags from the
+    mine array. It has the interface of board.Board (reveal() and toggle_flag() return the
+    changed (x, y, code) cells, codes, vals and text() build the whole board on request, in bulk
+    from the mine array and the runs, and codes is kept until the next move) and,
+    because mines are placed with the same random draws as BoardGenerator, the same seed and
+    first click give the same board on both. board.new_board() picks it by size and density.
+Inputs: Board size, mine count, reveal/flag coordinates
+Outputs: Changed cells, game status
+External Sources: Run-length encoding - https://en.wikipedia.org/wiki/Run-length_encoding
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+
+import cell_state
+from board import MINE_VALUE, PLAYING, WIN, LOSS
+from neighbors import SQUARE_OFFSETS
+
+try:
+    import numpy as np
+except ImportError:  # vals is counted in plain Python without NumPy
+    np = None
+
+# Numbers are worked out and cached for BLOCK cells of a row at a time
+BLOCK_BITS = 6
+BLOCK = 1 << BLOCK_BITS
+BLOCK_MASK = BLOCK - 1
+
+# Blocks of numbers kept in the cache
+BLOCK_CACHE_SIZE = 1024
+
+
+class RowIntervals:
+    __slots__ = ("rows", "cells")
+
+    def __init__(self):
+        '''
+        Set of cells stored per row as flat [start, end, start, end, ...] runs
+        '''
+
+        self.rows = {}
+        self.cells = 0
+
+    def __contains__(self, cell):
+        runs = self.rows.get(cell[1])
+        return runs is not None and bisect_right(runs, cell[0]) & 1 == 1
+
+    def runs(self, y):
+        '''
+        (start, end) runs of row y, end exclusive
+        '''
+
+        runs = self.rows.get(y, ())
+        return list(zip(runs[::2], runs[1::2]))
+
+    def add(self, y, xs):
+        '''
+        Adds the cells xs (sorted, none of them in the set yet) of row y
+        '''
+
+        new = []
+        for x in xs:
+            if new and new[-1] == x:
+                new[-1] = x + 1
+            else:
+                new += [x, x + 1]
+        merged = []
+        for start, end in sorted(list(zip(new[::2], new[1::2])) + self.runs(y)):
+            if merged and start <= merged[-1]:
+                merged[-1] = max(merged[-1], end)
+            else:
+                merged += [start, end]
+        self.rows[y] = array("i", merged)
+        self.cells += len(xs)
+
+    def remove(self, x, y):
+        '''
+        Removes the cell (x, y), which must be in the set
+        '''
+
+        runs = self.rows[y]
+        i = bisect_right(runs, x) - 1
+        start, end = runs[i], runs[i + 1]
+        runs[i:i + 2] = array("i", ([start, x] if start < x else []) + ([x + 1, end] if x + 1 < end else []))
+        if not runs:
+            del self.rows[y]
+        self.cells -= 1
+
+    def size(self):
+        '''
+        Stored run ends, a measure of memory use
+        '''
+
+        return sum(len(runs) for runs in self.rows.values())
+
+
+class SparseBoard:
+    __slots__ = ("cols", "rows", "topology", "seed", "mine_count", "mines", "numbers", "revealed", "flagged",
+                 "status", "hidden_safe", "flags", "lost_at", "dump")
+
+    def __init__(self, cols, rows, mine_count, topology="square", seed=None):
+        '''
+        Creates an unstarted board, mines are placed by the first reveal.
+        Only the square topology is supported.
+        '''
+
+        if topology != "square":
+            raise ValueError("sparse boards only support the square topology")
+        self.cols = cols
+        self.rows = rows
+        self.topology = topology
+        self.seed = seed
+        self.mine_count = min(mine_count, cols * rows - 9)
+        self.mines = None
+        self.numbers = OrderedDict()
+        self.revealed = RowIntervals()
+        self.flagged = RowIntervals()
+        self.status = PLAYING
+        self.hidden_safe = cols * rows - self.mine_count
+        self.flags = 0
+        self.lost_at = None
+        self.dump = None    # codes of the whole board, until the next move changes it
+
+    @property
+    def started(self):
+        return self.mines is not None
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    def start(self, safe_x, safe_y):
+        '''
+        Places the mines, keeping the 3x3 area around (safe_x, safe_y) clear.
+        Draws the same random numbers as BoardGenerator.generate_bombs.
+        '''
+
+        rng = random if self.seed is None else random.Random(self.seed)
+        cells = self.cols * self.rows
+        safe = {(safe_y + dy) * self.cols + safe_x + dx for dx, dy in SQUARE_OFFSETS + [(0, 0)]
+                if self.in_bounds(safe_x + dx, safe_y + dy)}
+        mines = set()
+        while len(mines) < self.mine_count:
+            placement = rng.randint(0, cells - 1)
+            if placement not in safe:
+                mines.add(placement)
+        self.mines = array("q", sorted(mines))
+
+    def is_mine(self, index):
+        mines = self.mines
+        i = bisect_left(mines, index)
+        return i < len(mines) and mines[i] == index
+
+    def block(self, y, bx):
+        '''
+        Hidden values of the BLOCK cells of row y starting at x = bx * BLOCK,
+        from the mines of the 3 rows around them. Cached, oldest dropped first.
+        '''
+
+        key = y * self.cols + bx
+        values = self.numbers.get(key)
+        if values is not None:
+            return values
+
+        cols, mines = self.cols, self.mines
+        x0 = bx << BLOCK_BITS
+        width = min(BLOCK, cols - x0)
+        left = 1 if x0 > 0 else 0                   # Mines just outside the block count too,
+        right = 1 if x0 + width < cols else 0       # but not from the next or previous row
+        counts = [0] * (width + 3)                  # counts[i + 1] is cell x0 + i
+        for ny in (y - 1, y, y + 1):
+            if 0 <= ny < self.rows:
+                base = ny * cols + x0
+                for i in range(bisect_left(mines, base - left), bisect_left(mines, base + width + right)):
+                    offset = mines[i] - base + 1
+                    counts[offset - 1] += 1
+                    counts[offset] += 1
+                    counts[offset + 1] += 1
+        values = bytearray(counts[1:width + 1])
+        base = y * cols + x0
+        for i in range(bisect_left(mines, base), bisect_left(mines, base + width)):
+            values[mines[i] - base] = MINE_VALUE
+
+        numbers = self.numbers
+        numbers[key] = values
+        if len(numbers) > BLOCK_CACHE_SIZE:
+            numbers.popitem(last=False)
+        return values
+
+    def value(self, x, y):
+        '''
+        Hidden value of (x, y): MINE_VALUE or the mines around it
+        '''
+
+        return self.block(y, x >> BLOCK_BITS)[x & BLOCK_MASK]
+
+    def code(self, x, y):
+        '''
+        What a player sees at (x, y)
+        '''
+
+        if (x, y) in self.revealed:
+            return self.value(x, y)
+        flagged = (x, y) in self.flagged
+        if self.status == LOSS:
+            index = y * self.cols + x
+            mine = self.is_mine(index)
+            if mine and not flagged:
+                return cell_state.MINE_CLICKED if index == self.lost_at else cell_state.MINE
+            if flagged and not mine:
+                return cell_state.MINE_FALSE
+        return cell_state.FLAG if flagged else cell_state.HIDDEN
+
+    def reveal(self, x, y):
+        '''
+        Reveals (x, y), flood filling from empty cells.
+        Returns the list of (x, y, code) cells that changed.
+        '''
+
+        if self.status != PLAYING or not self.in_bounds(x, y):
+            return []
+        if not self.started:
+            self.start(x, y)
+        if (x, y) in self.revealed or (x, y) in self.flagged:
+            return []
+
+        self.dump = None
+        value = self.value(x, y)
+        if value == MINE_VALUE:
+            return self._lose(y * self.cols + x)
+
+        changes = [(x, y, value)]
+        if value == 0:
+            self._flood(x, y, changes)
+        else:
+            self.revealed.add(y, [x])
+
+        self.hidden_safe -= len(changes)
+        if self.hidden_safe == 0:
+            self.status = WIN
+        return changes
+
+    def _flood(self, x, y, changes):
+        '''
+        Reveals everything connected to the empty cell at (x, y), then stores
+        the opened cells as runs, one merge per row
+        '''
+
+        cols, rows = self.cols, self.rows
+        revealed, flagged = self.revealed.rows, self.flagged.rows
+        blocks_per_row = (cols + BLOCK_MASK) >> BLOCK_BITS
+        blocks = {}     # The blocks this flood has used, a big flood would churn the cache
+        deltas = [(dx, dy, dy * cols + dx) for dx, dy in SQUARE_OFFSETS]
+        start = y * cols + x
+        opened = {start}
+        queue = deque([start])
+        while queue:
+            index = queue.popleft()
+            cy, cx = divmod(index, cols)
+            for dx, dy, delta in deltas:
+                neighbor = index + delta
+                if neighbor in opened:
+                    continue
+                nx, ny = cx + dx, cy + dy
+                if not (0 <= nx < cols and 0 <= ny < rows):
+                    continue
+                runs = revealed.get(ny)
+                if runs is not None and bisect_right(runs, nx) & 1:
+                    continue
+                runs = flagged.get(ny)
+                if runs is not None and bisect_right(runs, nx) & 1:
+                    continue
+                opened.add(neighbor)
+                key = ny * blocks_per_row + (nx >> BLOCK_BITS)
+                values = blocks.get(key)
+                if values is None:
+                    values = blocks[key] = self.block(ny, nx >> BLOCK_BITS)
+                value = values[nx & BLOCK_MASK]
+                changes.append((nx, ny, value))
+                if value == 0:
+                    queue.append(neighbor)
+
+        by_row = {}
+        for index in opened:
+            cy, cx = divmod(index, cols)
+            by_row.setdefault(cy, []).append(cx)
+        for cy, xs in by_row.items():
+            xs.sort()
+            self.revealed.add(cy, xs)
+
+    def _lose(self, clicked):
+        '''
+        Ends the game. Returns every mine and wrong flag, code() works them out from now on.
+        '''
+
+        self.status = LOSS
+        self.lost_at = clicked
+        cols = self.cols
+        changes = []
+        for index in self.mines:
+            x, y = index % cols, index // cols
+            if (x, y) not in self.flagged:
+                changes.append((x, y, cell_state.MINE_CLICKED if index == clicked else cell_state.MINE))
+        for y in list(self.flagged.rows):
+            for start, end in self.flagged.runs(y):
+                for x in range(start, end):
+                    if not self.is_mine(y * cols + x):
+                        changes.append((x, y, cell_state.MINE_FALSE))
+        return changes
+
+    def toggle_flag(self, x, y):
+        '''
+        Flags or unflags a hidden cell. Returns the changed cells.
+        '''
+
+        if self.status != PLAYING or not self.in_bounds(x, y) or (x, y) in self.revealed:
+            return []
+        self.dump = None
+        if (x, y) in self.flagged:
+            self.flagged.remove(x, y)
+            self.flags -= 1
+            return [(x, y, cell_state.HIDDEN)]
+        self.flagged.add(y, [x])
+        self.flags += 1
+        return [(x, y, cell_state.FLAG)]
+
+    def row_codes(self, y):
+        '''
+        Visible codes of row y as a bytearray
+        '''
+
+        row = bytearray([cell_state.HIDDEN]) * self.cols
+        for start, end in self.revealed.runs(y):
+            for x in range(start, end):
+                row[x] = self.value(x, y)
+        for start, end in self.flagged.runs(y):
+            row[start:end] = bytes([cell_state.FLAG]) * (end - start)
+        if self.status == LOSS:
+            base = y * self.cols
+            mines = self.mines
+            for i in range(bisect_left(mines, base), bisect_left(mines, base + self.cols)):
+                x = mines[i] - base
+                if row[x] != cell_state.FLAG:
+                    row[x] = cell_state.MINE_CLICKED if mines[i] == self.lost_at else cell_state.MINE
+            for start, end in self.flagged.runs(y):
+                for x in range(start, end):
+                    if not self.is_mine(base + x):
+                        row[x] = cell_state.MINE_FALSE
+        return row
+
+    @property
+    def codes(self):
+        '''
+        Visible codes of the whole board (one byte per cell), built from the runs
+        and the mines and kept until the next move
+        '''
+
+        if self.dump is not None:
+            return self.dump
+
+        cols = self.cols
+        codes = bytearray([cell_state.HIDDEN]) * (cols * self.rows)
+        if self.revealed.rows:
+            vals = self.vals
+            for y, runs in self.revealed.rows.items():
+                base = y * cols
+                for i in range(0, len(runs), 2):
+                    codes[base + runs[i]:base + runs[i + 1]] = vals[base + runs[i]:base + runs[i + 1]]
+        flag = bytes([cell_state.FLAG])
+        for y, runs in self.flagged.rows.items():
+            base = y * cols
+            for i in range(0, len(runs), 2):
+                codes[base + runs[i]:base + runs[i + 1]] = flag * (runs[i + 1] - runs[i])
+        if self.status == LOSS:
+            for index in self.mines:
+                if codes[index] != cell_state.FLAG:
+                    codes[index] = cell_state.MINE_CLICKED if index == self.lost_at else cell_state.MINE
+            for y, runs in self.flagged.rows.items():
+                for i in range(0, len(runs), 2):
+                    for index in range(y * cols + runs[i], y * cols + runs[i + 1]):
+                        if not self.is_mine(index):
+                            codes[index] = cell_state.MINE_FALSE
+        self.dump = bytes(codes)
+        return self.dump
+
+    @property
+    def vals(self):
+        '''
+        Hidden values of the whole board (one byte per cell, built on every call):
+        every mine adds one to the 3x3 square around it
+        '''
+
+        cols, rows = self.cols, self.rows
+        if not self.started:
+            return bytearray(cols * rows)
+        if np is not None:
+            mines = np.frombuffer(self.mines, dtype=np.int64)
+            padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+            padded[mines // cols + 1, mines % cols + 1] = 1
+            counts = sum(padded[dy:dy + rows, dx:dx + cols] for dy in range(3) for dx in range(3))
+            counts.ravel()[mines] = MINE_VALUE
+            return bytearray(counts.tobytes())
+
+        vals = bytearray(cols * rows)
+        for index in self.mines:
+            y, x = divmod(index, cols)
+            left, right = max(x - 1, 0), min(x + 2, cols)
+            for ny in range(max(y - 1, 0), min(y + 2, rows)):
+                for neighbor in range(ny * cols + left, ny * cols + right):
+                    vals[neighbor] += 1
+        for index in self.mines:
+            vals[index] = MINE_VALUE
+        return vals
+
+    def text(self):
+        '''
+        Visible board as one character per cell (row-major), see cell_state.CODE_CHARS
+        '''
+
+        return self.codes.decode("latin-1").translate(_CODE_TO_CHAR)
+
+    def memory(self):
+        '''
+        Rough bytes held: the mine array, the run ends and the number cache
+        '''
+
+        mines = len(self.mines) * self.mines.itemsize if self.started else 0
+        return mines + 4 * (self.revealed.size() + self.flagged.size()) + (BLOCK + 100) * len(self.numbers)
+
+
+# Translation table from code bytes to CODE_CHARS
+_CODE_TO_CHAR = {code: char for code, char in enumerate(cell_state.CODE_CHARS)}
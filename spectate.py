@@ -0,0 +1,457 @@
+'''
+Module: Spectator broadcast
+Description: Lets many viewers watch a game without each of them costing a full board transfer.
+    A Broadcaster keeps a copy of the visible board (cell_state codes) and turns each batch of
+    changed cells into one small delta packet, encoded once and written as the same bytes to
+    every viewer, so the cost per viewer is a single socket write. Every KEYFRAME_EVERY deltas it
+    also builds a keyframe (the whole board, run-length encoded). Keyframes aren't sent to viewers
+    that are keeping up; they are for late joiners, who get the last keyframe plus the deltas since
+    then, and for slow viewers, who stop getting deltas once their socket backs up and pick up
+    again from the next keyframe.
+
+    Packets (integers are LEB128 varints):
+        K <seq> <cols> <rows> <status> then (<count> <code byte>) runs covering the whole board
+        D <seq> <status> then (<gap> <count> <codes, two per byte>) runs of consecutive cells,
+          <gap> is the distance from the end of the previous run (index = y * cols + x)
+    <status> is one byte: p (playing), w (win) or l (loss). On the wire each packet is preceded
+    by its length as 4 big-endian bytes. A viewer connects to the spectator port and sends the
+    game id followed by a newline.
+
+    Running this file starts viewers that watch one game and report what they received.
+Inputs: Changed cells (x, y, code), game status
+Outputs: Keyframe and delta packets sent to viewers
+External Sources: LEB128 - https://en.wikipedia.org/wiki/LEB128
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import argparse
+import asyncio
+import inspect
+import itertools
+import struct
+import threading
+import time
+
+import cell_state
+
+DEFAULT_SPECTATE_HOST = "127.0.0.1"
+DEFAULT_SPECTATE_PORT = 8766
+
+# Deltas between two keyframes
+KEYFRAME_EVERY = 32
+
+# A viewer with more than this much unsent output skips deltas until the next keyframe
+MAX_VIEWER_BUFFER = 256 * 1024
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    '''
+    Returns (value, position after it)
+    '''
+
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_keyframe(seq, cols, rows, status, codes):
+    out = bytearray(b"K")
+    write_varint(out, seq)
+    write_varint(out, cols)
+    write_varint(out, rows)
+    out += status.encode("ascii")
+    for code, run in itertools.groupby(codes):
+        write_varint(out, sum(1 for _ in run))
+        out.append(code)
+    return bytes(out)
+
+
+def encode_delta(seq, status, cells):
+    '''
+    cells is a dict of index -> code
+    '''
+
+    out = bytearray(b"D")
+    write_varint(out, seq)
+    out += status.encode("ascii")
+
+    indexes = sorted(cells)
+    end = 0
+    start = 0
+    while start < len(indexes):
+        # Find the run of consecutive indexes starting here
+        stop = start + 1
+        while stop < len(indexes) and indexes[stop] == indexes[stop - 1] + 1:
+            stop += 1
+        write_varint(out, indexes[start] - end)
+        write_varint(out, stop - start)
+        codes = [cells[index] for index in indexes[start:stop]]
+        if len(codes) % 2:
+            codes.append(0)
+        out += bytes(codes[i] << 4 | codes[i + 1] for i in range(0, len(codes), 2))
+        end = indexes[stop - 1] + 1
+        start = stop
+    return bytes(out)
+
+
+def frame(packet):
+    return struct.pack(">I", len(packet)) + packet
+
+
+class BoardView:
+    def __init__(self):
+        '''
+        A viewer's copy of the board, built from received packets
+        '''
+
+        self.cols = self.rows = 0
+        self.codes = None
+        self.status = "p"
+        self.seq = None
+
+    def apply(self, packet):
+        '''
+        Applies one packet. Returns False if it was a delta that can't be applied
+        (no keyframe yet or packets were skipped), the view then waits for a keyframe.
+        '''
+
+        kind = packet[:1]
+        seq, pos = read_varint(packet, 1)
+
+        if kind == b"K":
+            self.cols, pos = read_varint(packet, pos)
+            self.rows, pos = read_varint(packet, pos)
+            self.status = chr(packet[pos])
+            pos += 1
+            codes = bytearray()
+            while pos < len(packet):
+                count, pos = read_varint(packet, pos)
+                codes += bytes([packet[pos]]) * count
+                pos += 1
+            self.codes = codes
+            self.seq = seq
+            return True
+
+        if self.seq is None or seq != self.seq + 1:
+            self.seq = None
+            return False
+        self.seq = seq
+        self.status = chr(packet[pos])
+        pos += 1
+        index = 0
+        codes = self.codes
+        while pos < len(packet):
+            gap, pos = read_varint(packet, pos)
+            count, pos = read_varint(packet, pos)
+            index += gap
+            for i in range(count):
+                byte = packet[pos + i // 2]
+                codes[index + i] = byte & 0x0F if i % 2 else byte >> 4
+            pos += (count + 1) // 2
+            index += count
+        return True
+
+    def text(self):
+        chars = cell_state.CODE_CHARS
+        return "\n".join("".join(chars[code] for code in self.codes[y * self.cols:(y + 1) * self.cols])
+                         for y in range(self.rows))
+
+
+class Broadcaster:
+    def __init__(self, cols, rows, codes, status="p", keyframe_every=KEYFRAME_EVERY):
+        '''
+        Fan-out for one game, starting from the given visible board
+        '''
+
+        self.keyframe_every = keyframe_every
+        self.viewers = {}  # viewer -> True while it's skipping deltas
+        self.packets = 0
+        self.bytes_out = 0
+        self.seq = -1
+        self.reset(cols, rows, codes, status)
+
+    def reset(self, cols, rows, codes, status="p"):
+        '''
+        Starts over from a new board (new game), every viewer gets the keyframe
+        '''
+
+        self.cols = cols
+        self.rows = rows
+        self.codes = bytearray(codes)
+        self.status = status
+        self.seq += 1
+        self._keyframe()
+        for viewer in self.viewers:
+            self.viewers[viewer] = True
+        self._send_keyframe()
+
+    def _keyframe(self):
+        self.keyframe = frame(encode_keyframe(self.seq, self.cols, self.rows, self.status, self.codes))
+        self.backlog = []
+
+    def _send_keyframe(self):
+        '''
+        Sends the keyframe to viewers that are skipping deltas and can take it now
+        '''
+
+        for viewer, skipping in self.viewers.items():
+            if skipping and viewer.ready():
+                viewer.send(self.keyframe)
+                self.viewers[viewer] = False
+                self.packets += 1
+                self.bytes_out += len(self.keyframe)
+
+    def subscribe(self, viewer):
+        '''
+        Adds a viewer (an object with send(frame) and ready()). It gets the last
+        keyframe and the deltas since then, so it catches up right away.
+        '''
+
+        viewer.send(self.keyframe)
+        for packet in self.backlog:
+            viewer.send(packet)
+        self.viewers[viewer] = False
+
+    def unsubscribe(self, viewer):
+        self.viewers.pop(viewer, None)
+
+    def publish(self, changes, status):
+        '''
+        Sends the changed (x, y, code) cells to every viewer
+        '''
+
+        cells = {}
+        cols = self.cols
+        for x, y, code in changes:
+            index = y * cols + x
+            if self.codes[index] != code:
+                self.codes[index] = code
+                cells[index] = code
+        if not cells and status == self.status:
+            return
+
+        self.status = status
+        self.seq += 1
+        packet = frame(encode_delta(self.seq, status, cells))
+        self.backlog.append(packet)
+
+        # Same bytes for everyone, slow viewers drop out until the next keyframe
+        for viewer, skipping in self.viewers.items():
+            if skipping:
+                continue
+            if not viewer.ready():
+                self.viewers[viewer] = True
+                continue
+            viewer.send(packet)
+            self.packets += 1
+            self.bytes_out += len(packet)
+
+        if len(self.backlog) >= self.keyframe_every:
+            self._keyframe()
+            self._send_keyframe()
+
+
+class _Viewer:
+    __slots__ = ("writer",)
+
+    def __init__(self, writer):
+        self.writer = writer
+
+    def ready(self):
+        return self.writer.transport.get_write_buffer_size() < MAX_VIEWER_BUFFER
+
+    def send(self, packet):
+        self.writer.write(packet)
+
+
+class SpectatorServer:
+    def __init__(self, lookup=None):
+        '''
+        lookup(game_id) returns (cols, rows, codes, status) for a game that has no
+        broadcaster yet, or None if there is no such game. It may be a coroutine
+        function. share() and publish() can be called from other threads once the
+        server is running.
+        '''
+
+        self.lookup = lookup
+        self.broadcasters = {}
+        self.loop = None
+        self.thread = None
+        self.server = None
+
+    @property
+    def running(self):
+        return self.loop is not None
+
+    async def start(self, host=DEFAULT_SPECTATE_HOST, port=DEFAULT_SPECTATE_PORT):
+        '''
+        Starts listening on the running event loop
+        '''
+
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self.handle, host, port)
+
+    def start_thread(self, host=DEFAULT_SPECTATE_HOST, port=DEFAULT_SPECTATE_PORT):
+        '''
+        Runs the server on its own event loop in a background thread, for programs
+        that aren't built on asyncio (the Pygame game). share() and publish() can
+        then be called from any thread.
+        '''
+
+        started = threading.Event()
+
+        async def main():
+            await self.start(host, port)
+            started.set()
+            await asyncio.Event().wait()
+
+        self.thread = threading.Thread(target=asyncio.run, args=(main(),), name="spectators", daemon=True)
+        self.thread.start()
+        started.wait()
+
+    def _call(self, function, *args):
+        try:
+            on_loop = asyncio.get_running_loop() is self.loop
+        except RuntimeError:  # Called from a thread without an event loop
+            on_loop = False
+        if self.loop is not None and not on_loop:
+            self.loop.call_soon_threadsafe(function, *args)
+        else:
+            function(*args)
+
+    def share(self, game_id, cols, rows, codes, status="p"):
+        '''
+        Makes a game watchable, or starts it over from a new board
+        '''
+
+        self._call(self._share, game_id, cols, rows, bytes(codes), status)
+
+    def _share(self, game_id, cols, rows, codes, status):
+        broadcaster = self.broadcasters.get(game_id)
+        if broadcaster is None:
+            self.broadcasters[game_id] = Broadcaster(cols, rows, codes, status)
+        else:
+            broadcaster.reset(cols, rows, codes, status)
+
+    def publish(self, game_id, changes, status):
+        '''
+        Sends changed cells to the game's viewers, if it has any
+        '''
+
+        if game_id in self.broadcasters:
+            self._call(self._publish, game_id, list(changes), status)
+
+    def _publish(self, game_id, changes, status):
+        broadcaster = self.broadcasters.get(game_id)
+        if broadcaster is not None:
+            broadcaster.publish(changes, status)
+
+    def close_game(self, game_id):
+        '''
+        Disconnects everyone watching a game that ended
+        '''
+
+        broadcaster = self.broadcasters.pop(game_id, None)
+        if broadcaster is not None:
+            for viewer in broadcaster.viewers:
+                viewer.writer.close()
+
+    async def handle(self, reader, writer):
+        '''
+        Serves one viewer: reads the game id, then only writes
+        '''
+
+        try:
+            game_id = int(await reader.readline())
+        except (ValueError, ConnectionError):
+            writer.close()
+            return
+
+        broadcaster = self.broadcasters.get(game_id)
+        if broadcaster is None and self.lookup is not None:
+            board = self.lookup(game_id)
+            if inspect.isawaitable(board):
+                board = await board
+                broadcaster = self.broadcasters.get(game_id)  # Another viewer may have made it meanwhile
+            if broadcaster is None and board is not None:
+                broadcaster = self.broadcasters[game_id] = Broadcaster(*board)
+        if broadcaster is None:
+            writer.close()
+            return
+
+        viewer = _Viewer(writer)
+        broadcaster.subscribe(viewer)
+        try:
+            await reader.read()  # Until the viewer disconnects
+        except ConnectionError:
+            pass
+        finally:
+            broadcaster.unsubscribe(viewer)
+            if not broadcaster.viewers and self.lookup is not None and self.broadcasters.get(game_id) is broadcaster:
+                del self.broadcasters[game_id]  # Made on demand, can be made again
+            writer.close()
+
+
+# Used by the Pygame game (started from main.py with --spectate)
+spectators = SpectatorServer()
+
+
+async def watch(host, port, game_id, duration):
+    '''
+    One viewer. Returns (packets, bytes, keyframes, view)
+    '''
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b"%d\n" % game_id)
+    view = BoardView()
+    packets = received = keyframes = 0
+    deadline = time.perf_counter() + duration
+    try:
+        while True:
+            header = await asyncio.wait_for(reader.readexactly(4), max(0.0, deadline - time.perf_counter()))
+            packet = await reader.readexactly(struct.unpack(">I", header)[0])
+            packets += 1
+            received += 4 + len(packet)
+            keyframes += packet[:1] == b"K"
+            view.apply(packet)
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+        pass
+    writer.close()
+    return packets, received, keyframes, view
+
+
+async def main(args):
+    results = await asyncio.gather(*(watch(args.host, args.port, args.game, args.duration)
+                                     for _ in range(args.viewers)))
+    packets = sum(result[0] for result in results) / len(results)
+    received = sum(result[1] for result in results) / len(results)
+    keyframes = sum(result[2] for result in results) / len(results)
+    print("%d viewers, per viewer: %.0f packets (%.1f keyframes), %.0f bytes" % (
+        args.viewers, packets, keyframes, received))
+    view = results[0][3]
+    if args.show and view.codes is not None:
+        print("status %s\n%s" % (view.status, view.text()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch a game from the spectator port")
+    parser.add_argument("game", type=int, help="game id (the desktop game is 1)")
+    parser.add_argument("--host", default=DEFAULT_SPECTATE_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_SPECTATE_PORT)
+    parser.add_argument("--viewers", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--show", action="store_true", help="print the board at the end")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,281 @@
+'''
+Module: Game statistics
+Description: Keeps a record of every finished game (board size, mines, seed, first click, duration,
+    clicks, result, AI difficulty and where it was played) in an SQLite database in WAL mode.
+    record() only appends a tuple to an in-memory buffer, so the game loop never waits on the disk;
+    a background thread writes the buffer in batches, one transaction per batch, every
+    FLUSH_INTERVAL seconds or as soon as BATCH_SIZE rows are waiting. Simulators hand over many
+    rows at once with record_many(). Leaderboards (fastest wins per board) come from a partial
+    index over the wins only. Per-difficulty numbers come from a small totals table the writer
+    adds each batch's sums to, which keeps bulk inserts fast (one index on games instead of two
+    that every row has to go into). Queries use their own connection, so reading never blocks
+    writing.
+
+        python stats.py stats.db --width 16 --height 16 --mines 40
+Inputs: Finished games
+Outputs: SQLite database, leaderboards, per-difficulty totals
+External Sources: SQLite WAL mode - https://www.sqlite.org/wal.html
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+# Default database file
+DEFAULT_STATS_FILE = "stats.db"
+
+# Seconds between background writes
+FLUSH_INTERVAL = 1.0
+
+# Rows waiting before a write is started early
+BATCH_SIZE = 50000
+
+# Page cache of the writer's connection (KiB), keeps the leaderboard index in memory
+WRITER_CACHE_KB = 65536
+
+# Difficulty stored for games played without the AI
+NO_AI = "none"
+
+COLUMNS = ("finished", "cols", "rows", "mines", "seed", "start_x", "start_y",
+           "duration", "clicks", "result", "difficulty", "source")
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    finished REAL NOT NULL,
+    cols INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    mines INTEGER NOT NULL,
+    seed INTEGER,
+    start_x INTEGER,
+    start_y INTEGER,
+    duration REAL NOT NULL,
+    clicks INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    source TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_leaderboard ON games (cols, rows, mines, duration) WHERE result = 'win';
+CREATE TABLE IF NOT EXISTS totals (
+    difficulty TEXT NOT NULL,
+    cols INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    mines INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    clicks INTEGER NOT NULL,
+    PRIMARY KEY (difficulty, cols, rows, mines, result)
+);
+'''
+
+INSERT = "INSERT INTO games (%s) VALUES (%s)" % (", ".join(COLUMNS), ", ".join("?" * len(COLUMNS)))
+
+ADD_TOTALS = ("INSERT INTO totals VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT DO UPDATE SET"
+              " games = games + excluded.games, duration = duration + excluded.duration,"
+              " clicks = clicks + excluded.clicks")
+
+
+def game_row(cols, rows, mines, seed, duration, clicks, result, difficulty=None,
+             source="desktop", start=(None, None), finished=None):
+    '''
+    One games row as a tuple in COLUMNS order, for record_many()
+    '''
+
+    return (time.time() if finished is None else finished, cols, rows, mines, seed, start[0], start[1],
+            duration, clicks, result, difficulty or NO_AI, source)
+
+
+def batch_totals(batch):
+    '''
+    Sums of a batch of rows per (difficulty, cols, rows, mines, result), as totals rows
+    '''
+
+    totals = {}
+    for row in batch:
+        key = (row[10], row[1], row[2], row[3], row[9])
+        total = totals.get(key)
+        if total is None:
+            totals[key] = [1, row[7], row[8]]
+        else:
+            total[0] += 1
+            total[1] += row[7]
+            total[2] += row[8]
+    return [key + tuple(total) for key, total in totals.items()]
+
+
+def connect(path):
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent, only the last batches can be lost on power loss
+    return connection
+
+
+class StatsStore:
+    def __init__(self):
+        '''
+        Records nothing until open() is called
+        '''
+
+        self.path = None
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.done = threading.Condition()
+        self.queued = 0
+        self.written = 0
+        self.closing = False
+        self.thread = None
+        self.error = None
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def open(self, path=DEFAULT_STATS_FILE):
+        '''
+        Creates the database if needed and starts the writer thread
+        '''
+
+        with closing(connect(path)) as connection:
+            connection.executescript(SCHEMA)
+        self.path = path
+        self.closing = False
+        self.thread = threading.Thread(target=self._run, name="stats-writer", daemon=True)
+        self.thread.start()
+
+    def record(self, *args, **kwargs):
+        '''
+        Logs one finished game (see game_row() for the arguments). Never touches the disk.
+        '''
+
+        self.record_many([game_row(*args, **kwargs)])
+
+    def record_many(self, rows):
+        '''
+        Logs many game_row() tuples at once
+        '''
+
+        if not self.enabled:
+            return
+        with self.lock:
+            self.buffer.extend(rows)
+            self.queued += len(rows)
+            if len(self.buffer) >= BATCH_SIZE:
+                self.wake.set()
+
+    def flush(self, timeout=None):
+        '''
+        Waits until everything recorded so far is in the database. Returns False on timeout.
+        '''
+
+        if self.thread is None:
+            return True
+        with self.lock:
+            target = self.queued
+        self.wake.set()
+        with self.done:
+            return self.done.wait_for(lambda: self.written >= target or self.error is not None, timeout)
+
+    def close(self):
+        '''
+        Writes what's left and stops the writer thread
+        '''
+
+        if self.thread is None:
+            return
+        self.closing = True
+        self.wake.set()
+        self.thread.join()
+        self.thread = None
+
+    def _run(self):
+        connection = connect(self.path)
+        connection.execute("PRAGMA cache_size=-%d" % WRITER_CACHE_KB)
+        while True:
+            self.wake.wait(FLUSH_INTERVAL)
+            self.wake.clear()
+            with self.lock:
+                batch, self.buffer = self.buffer, []
+            if batch:
+                try:
+                    with connection:
+                        connection.executemany(INSERT, batch)
+                        connection.executemany(ADD_TOTALS, batch_totals(batch))
+                except sqlite3.Error as error:
+                    # Keep the game running, the rows are lost
+                    self.error = error
+                    print("Stats: could not write %d games: %s" % (len(batch), error))
+                with self.done:
+                    self.written += len(batch)
+                    self.done.notify_all()
+            elif self.closing:
+                break
+        connection.close()
+
+    def query(self, sql, parameters=()):
+        '''
+        Runs a read query on its own connection, after writing what's buffered
+        '''
+
+        self.flush()
+        with closing(connect(self.path)) as connection:
+            return connection.execute(sql, parameters).fetchall()
+
+    def leaderboard(self, cols, rows, mines, limit=10):
+        '''
+        Fastest wins on a board as (duration, clicks, difficulty, seed, finished) rows
+        '''
+
+        return self.query("SELECT duration, clicks, difficulty, seed, finished FROM games"
+                          " WHERE cols = ? AND rows = ? AND mines = ? AND result = 'win'"
+                          " ORDER BY duration LIMIT ?", (cols, rows, mines, limit))
+
+    def by_difficulty(self):
+        '''
+        Per AI difficulty: (difficulty, games, wins, average duration, average clicks)
+        '''
+
+        return self.query("SELECT difficulty, SUM(games), SUM(CASE WHEN result = 'win' THEN games ELSE 0 END),"
+                          " SUM(duration) / SUM(games), 1.0 * SUM(clicks) / SUM(games)"
+                          " FROM totals GROUP BY difficulty ORDER BY difficulty")
+
+    def report(self):
+        lines = ["Games per AI difficulty:"]
+        for difficulty, games, wins, duration, clicks in self.by_difficulty():
+            lines.append("  %-8s %8d games  %5.1f%% wins  %7.1f s  %6.1f clicks"
+                         % (difficulty, games, 100.0 * wins / games, duration, clicks))
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Minesweeper game statistics")
+    parser.add_argument("path", nargs="?", default=DEFAULT_STATS_FILE, help="database (default %s)" % DEFAULT_STATS_FILE)
+    parser.add_argument("--width", type=int, default=10, help="leaderboard board width (default 10)")
+    parser.add_argument("--height", type=int, default=10, help="leaderboard board height (default 10)")
+    parser.add_argument("--mines", type=int, default=10, help="leaderboard mine count (default 10)")
+    parser.add_argument("--top", type=int, default=10, help="leaderboard length (default 10)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        parser.error("no statistics in %s yet" % args.path)
+    store = StatsStore()
+    store.path = args.path
+    print("Fastest wins on %dx%d with %d mines" % (args.width, args.height, args.mines))
+    for rank, (duration, clicks, difficulty, seed, finished) in enumerate(
+            store.leaderboard(args.width, args.height, args.mines, args.top), 1):
+        print("  %2d. %8.2f s  %5d clicks  AI %-6s  seed %s  %s"
+              % (rank, duration, clicks, difficulty, seed, time.strftime("%Y-%m-%d %H:%M", time.localtime(finished))))
+    print(store.report())
+
+
+# Shared by the whole process
+stats = StatsStore()
+
+if __name__ == "__main__":
+    main()
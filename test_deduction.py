@@ -0,0 +1,134 @@
+'''
+Module: Deduction tests
+Description: Checks the incremental Deducer against reducing the whole frontier from scratch on
+    random mid-game positions, that a turn cut short by its time budget is finished by the next
+    one, and that an undo (a cell hidden again) starts the deducer over. Positions come from
+    headless board.Board games, so every deduced cell can be checked against the real mines.
+    Run with python -m pytest test_deduction.py (or python -m unittest test_deduction).
+Inputs: None
+Outputs: Test results
+External Sources: unittest - https://docs.python.org/3/library/unittest.html
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import random
+import unittest
+
+import cell_state
+import frontier
+from board import Board, MINE_VALUE, PLAYING
+from deduction import Deducer, reduce_component
+from neighbors import neighbor_table
+
+COLS, ROWS, MINES = 30, 16, 99
+
+
+def from_scratch(codes, cols, rows):
+    '''
+    Every number row of the board split into components and reduced, no state kept
+    '''
+
+    table = neighbor_table(cols, rows)
+    constraints = {}
+    touching = {}
+    for index in range(cols * rows):
+        constraint = frontier.number_constraint(codes, table, index)
+        if constraint is not None:
+            constraints[index] = constraint
+            for cell in constraint[1]:
+                touching.setdefault(cell, []).append(index)
+
+    known = {}
+    seen = set()
+    for start in constraints:
+        if start in seen:
+            continue
+        group = [start]
+        seen.add(start)
+        for index in group:
+            for cell in constraints[index][1]:
+                for other in touching[cell]:
+                    if other not in seen:
+                        seen.add(other)
+                        group.append(other)
+        known.update(reduce_component([(constraints[index][1], constraints[index][0]) for index in group]))
+    return known
+
+
+def play(seed, moves):
+    '''
+    Yields the codes of a game after its opening and after each of up to moves moves:
+    a reveal of a random safe cell, or half the time a flag or reveal of a deduced cell
+    '''
+
+    rng = random.Random(seed)
+    random.seed(seed)
+    game = Board(COLS, ROWS, MINES)
+    game.reveal(COLS // 2, ROWS // 2)
+    deducer = Deducer()
+    for _ in range(moves):
+        if game.status != PLAYING:
+            return
+        yield game
+        known = [(index, value) for index, value in sorted(deducer.deduce(game.codes, COLS, ROWS).items())
+                 if game.codes[index] == cell_state.HIDDEN]
+        if known and rng.random() < 0.5:
+            index, value = rng.choice(known)
+            (game.toggle_flag if value else game.reveal)(index % COLS, index // COLS)
+        else:
+            hidden = [index for index, code in enumerate(game.codes)
+                      if code == cell_state.HIDDEN and game.vals[index] != MINE_VALUE]
+            index = rng.choice(hidden)
+            game.reveal(index % COLS, index // COLS)
+
+
+class DeducerTest(unittest.TestCase):
+    def assert_correct(self, game, known):
+        for index, value in known.items():
+            self.assertEqual(game.vals[index] == MINE_VALUE, value == 1, "cell %d" % index)
+
+    def test_incremental_matches_from_scratch(self):
+        for seed in range(10):
+            deducer = Deducer()
+            for game in play(seed, 30):
+                known = deducer.deduce(game.codes, COLS, ROWS)
+                hidden = {index: value for index, value in known.items() if game.codes[index] == cell_state.HIDDEN}
+                self.assert_correct(game, hidden)
+                # Cells deduced on earlier turns stay known, so it may know more than a fresh pass
+                scratch = from_scratch(game.codes, COLS, ROWS)
+                self.assertLessEqual(scratch.items(), hidden.items(), "seed %d" % seed)
+
+    def test_stopped_turn_is_finished_by_the_next(self):
+        game = list(play(3, 12))[-1]
+        full = Deducer().deduce(game.codes, COLS, ROWS)
+
+        deducer = Deducer()
+        checks = []
+        partial = dict(deducer.deduce(game.codes, COLS, ROWS, lambda: checks.append(1) or len(checks) > 1))
+        self.assertEqual(deducer.components_reduced, 1)
+        self.assertTrue(deducer.pending)
+        self.assertLess(len(partial), len(full))
+
+        # Nothing changed on the board, the next turn reduces only what was left
+        self.assertEqual(deducer.deduce(game.codes, COLS, ROWS), full)
+        self.assertFalse(deducer.pending)
+        self.assertEqual(deducer.deduce(game.codes, COLS, ROWS), full)
+
+    def test_undo_starts_over(self):
+        games = play(5, 20)
+        before = bytes(next(games).codes)
+        for game in games:
+            after = bytes(game.codes)
+
+        deducer = Deducer()
+        deducer.deduce(before, COLS, ROWS)
+        deducer.deduce(after, COLS, ROWS)
+        undone = deducer.deduce(before, COLS, ROWS)
+        self.assertEqual(undone, Deducer().deduce(before, COLS, ROWS))
+        self.assertEqual(deducer.rows_updated, len(Deducer().update(before, COLS, ROWS)))
+        self.assertTrue(all(before[index] == cell_state.HIDDEN for index in undone))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,270 @@
+'''
+Module: Viewport / Camera
+Description: Lets the board be larger than the window. The Camera tracks which part of the board
+    is on screen (pan offset + zoom level), draws only the cells that intersect the visible
+    rectangle and converts mouse positions to cell coordinates with plain arithmetic instead of
+    testing every cell's rect. Sprites are pre-scaled once per zoom level and cached, so the
+    cost of a frame depends on the size of the window and not the size of the board. A camera
+    without cols and rows has no edges at all (endless boards).
+Inputs: Board dimensions (cols, rows), screen rectangle used for the board, grid of Grid objects
+Outputs: Board drawn onto the provided surface, cell coordinates for screen positions
+External Sources: Pygame library
+    pygame.transform documentation - https://www.pygame.org/docs/ref/transform.html
+Authors: EECS 581 Group 32
+Creation Date: 10/19/2026
+'''
+
+import pygame
+
+# Tile sizes (in pixels) the camera can zoom between. 32 is the native sprite size.
+ZOOM_LEVELS = [8, 12, 16, 24, 32, 48, 64]
+
+# Number of cells moved per arrow key press
+PAN_STEP_CELLS = 2
+
+
+class Camera:
+    def __init__(self, cols, rows, view_rect, tile_size=32):
+        '''
+        Takes in the board dimensions (in cells, None for a board without edges),
+        the screen rectangle the board is drawn into and the starting tile size.
+        '''
+
+        self.cols = cols
+        self.rows = rows
+        self.view = pygame.Rect(view_rect)
+        self.dragging = False
+
+        # Pick the zoom level closest to the requested tile size
+        self.zoom_index = min(range(len(ZOOM_LEVELS)), key=lambda i: abs(ZOOM_LEVELS[i] - tile_size))
+
+        # World pixel coordinates of the top left corner of the view
+        self.x = 0
+        self.y = 0
+
+        # Scaled sprite cache: (sprite key, tile size) -> Surface
+        self._tiles = {}
+
+    @property
+    def tile_size(self):
+        return ZOOM_LEVELS[self.zoom_index]
+
+    def clamp(self):
+        '''
+        Keeps the camera inside the board. Boards smaller than the view are pinned to the top left.
+        '''
+
+        if self.cols is None:
+            return
+        max_x = max(0, self.cols * self.tile_size - self.view.width)
+        max_y = max(0, self.rows * self.tile_size - self.view.height)
+        self.x = min(max(0, self.x), max_x)
+        self.y = min(max(0, self.y), max_y)
+
+    def pan(self, dx, dy):
+        '''
+        Moves the camera by dx, dy pixels
+        '''
+
+        self.x += dx
+        self.y += dy
+        self.clamp()
+
+    def pan_cells(self, dx, dy):
+        '''
+        Moves the camera by dx, dy cells at the current zoom
+        '''
+
+        self.pan(dx * self.tile_size, dy * self.tile_size)
+
+    def center_on(self, x, y):
+        '''
+        Moves the camera so cell (x, y) is in the middle of the view
+        '''
+
+        size = self.tile_size
+        self.x = x * size + size // 2 - self.view.width // 2
+        self.y = y * size + size // 2 - self.view.height // 2
+        self.clamp()
+
+    def zoom(self, steps, anchor=None):
+        '''
+        Zooms in (positive steps) or out (negative steps). The board point under the anchor
+        screen position stays in place, so zooming with the mouse wheel zooms towards the cursor.
+        '''
+
+        new_index = min(max(0, self.zoom_index + steps), len(ZOOM_LEVELS) - 1)
+        if new_index == self.zoom_index:
+            return
+
+        if anchor is None or not self.view.collidepoint(anchor):
+            anchor = self.view.center
+
+        # Board position (in cells) under the anchor before zooming
+        old_size = self.tile_size
+        ax = anchor[0] - self.view.x
+        ay = anchor[1] - self.view.y
+        cell_x = (self.x + ax) / old_size
+        cell_y = (self.y + ay) / old_size
+
+        self.zoom_index = new_index
+        new_size = self.tile_size
+        self.x = int(cell_x * new_size - ax)
+        self.y = int(cell_y * new_size - ay)
+        self.clamp()
+
+    def visible_cells(self):
+        '''
+        Returns (x0, y0, x1, y1), the range of cells that intersect the view.
+        x1 and y1 are exclusive.
+        '''
+
+        size = self.tile_size
+        x0 = self.x // size
+        y0 = self.y // size
+        x1 = (self.x + self.view.width + size - 1) // size
+        y1 = (self.y + self.view.height + size - 1) // size
+        if self.cols is not None:
+            x1 = min(self.cols, x1)
+            y1 = min(self.rows, y1)
+        return x0, y0, x1, y1
+
+    def screen_to_cell(self, pos):
+        '''
+        Converts a screen position into (x, y) cell coordinates.
+        Returns None if the position is not over the board.
+        '''
+
+        if not self.view.collidepoint(pos):
+            return None
+
+        size = self.tile_size
+        x = (pos[0] - self.view.x + self.x) // size
+        y = (pos[1] - self.view.y + self.y) // size
+        if self.cols is None or (0 <= x < self.cols and 0 <= y < self.rows):
+            return x, y
+        return None
+
+    def cell_to_screen(self, x, y):
+        '''
+        Converts cell coordinates into the screen position of the cell's top left corner
+        '''
+
+        size = self.tile_size
+        return self.view.x + x * size - self.x, self.view.y + y * size - self.y
+
+    def handle_event(self, event):
+        '''
+        Pans (arrow keys, middle mouse drag) and zooms (mouse wheel).
+        Returns True if the event was used.
+        '''
+
+        if event.type == pygame.MOUSEWHEEL:
+            self.zoom(event.y, pygame.mouse.get_pos())
+            return True
+
+        if event.type == pygame.KEYDOWN:
+            steps = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0),
+                     pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+            if event.key in steps:
+                dx, dy = steps[event.key]
+                self.pan_cells(dx * PAN_STEP_CELLS, dy * PAN_STEP_CELLS)
+                return True
+
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 2:
+            self.dragging = True
+            return True
+        if event.type == pygame.MOUSEBUTTONUP and event.button == 2:
+            self.dragging = False
+            return True
+        if event.type == pygame.MOUSEMOTION and self.dragging:
+            self.pan(-event.rel[0], -event.rel[1])
+            return True
+
+        # Wheel clicks also arrive as buttons 4 and 5, MOUSEWHEEL already handled them
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button in (4, 5):
+            return True
+
+        return False
+
+    def tile(self, key, sprites):
+        '''
+        Returns the sprite for the given key scaled to the current tile size.
+        Scaled sprites are cached so each one is only scaled once per zoom level.
+        '''
+
+        size = self.tile_size
+        cached = self._tiles.get((key, size))
+        if cached is None:
+            source = sprites[key]
+            if source.get_size() == (size, size):
+                cached = source
+            else:
+                cached = pygame.transform.scale(source, (size, size))
+
+            # Match the display's pixel format so blits don't convert on every frame
+            if pygame.display.get_surface() is not None:
+                if cached.get_flags() & pygame.SRCALPHA:
+                    cached = cached.convert_alpha()
+                else:
+                    cached = cached.convert()
+            self._tiles[(key, size)] = cached
+        return cached
+
+    def draw(self, surface, grid, sprites):
+        '''
+        Draws only the visible cells of the grid onto the surface
+        '''
+
+        x0, y0, x1, y1 = self.visible_cells()
+        size = self.tile_size
+        left, top = self.cell_to_screen(x0, y0)
+
+        # One tile lookup per sprite key, then a single batched blit
+        tiles = {}
+        blits = []
+        sy = top
+        for y in range(y0, y1):
+            row = grid[y]
+            sx = left
+            for x in range(x0, x1):
+                key = row[x].spriteKey()
+                tile = tiles.get(key)
+                if tile is None:
+                    tile = tiles[key] = self.tile(key, sprites)
+                blits.append((tile, (sx, sy)))
+                sx += size
+            sy += size
+
+        previous_clip = surface.get_clip()
+        surface.set_clip(self.view)
+        surface.blits(blits, False)
+        surface.set_clip(previous_clip)
+
+    def draw_codes(self, surface, codes, sprite_keys, sprites):
+        '''
+        Draws the visible cells from rows of cell_state codes covering visible_cells()
+        (sprite_keys maps a code to its sprite key)
+        '''
+
+        x0, y0, _, _ = self.visible_cells()
+        size = self.tile_size
+        left, top = self.cell_to_screen(x0, y0)
+
+        tiles = [None] * len(sprite_keys)
+        blits = []
+        sy = top
+        for row in codes:
+            sx = left
+            for code in row:
+                tile = tiles[code]
+                if tile is None:
+                    tile = tiles[code] = self.tile(sprite_keys[code], sprites)
+                blits.append((tile, (sx, sy)))
+                sx += size
+            sy += size
+
+        previous_clip = surface.get_clip()
+        surface.set_clip(self.view)
+        surface.blits(blits, False)
+        surface.set_clip(previous_clip)